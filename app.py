@@ -1,45 +1,90 @@
-from typing import List, Optional
+import argparse
+import sys
+from typing import List, Optional, Sequence, TextIO
 
 import config as settings
 from game.models import Player, Board, GameState, PlayerEnum
-from game.errors import GameOver, PositionDoesNotExist, PositionAlreadyTaken, GameError
+from game.batch import ScriptedGame, ScriptedPlayer, read_games
+from game.book import load_book
+from game.bots import BotPlayer
+from game.errors import (
+    Forfeit,
+    GameOver,
+    PositionDoesNotExist,
+    PositionAlreadyTaken,
+    GameError,
+)
+from game.history import GameRecord, HistoryStore
+from game.instrumentation import metrics, timed
+from game.parsing import parse_row_col
+from game.pool import BoardPool
+from game.profiling import add_profile_arguments, run_main
+from game.render import FrameRenderer
+from game.search import Searcher
+from game.sync import StateBroadcaster
+from game.ttable import TranspositionTable
 
 
+@timed("parse_input")
 def get_row_col_from_input(player_input: str):
-    """Parse row and column values from player input"""
-    if settings.DELIMITER not in player_input:
-        raise PositionDoesNotExist
+    """Parse row and column values from player input
 
-    values = player_input.split(settings.DELIMITER)
-    if len(values) != 2:
+    See `game.parsing.parse_moves` to parse many moves at once.
+    """
+    row_col = parse_row_col(player_input)
+    if row_col is None:
         raise PositionDoesNotExist
+    return row_col
 
-    row, col = map(lambda x: int(x) if (x.isdigit() and int(x) > 0) else None, values)
-    if (type(row) is not int) or (type(col) is not int):
-        raise PositionDoesNotExist
-    return row, col
 
+def assign_players(
+    players: list,
+    bots: Sequence[str] = (),
+    time_budget: float = settings.BOT_TIME_BUDGET,
+    ponder: bool = False,
+    table: Optional[TranspositionTable] = None,
+) -> List[Player]:
+    """Initialize players
 
-def assign_players(players: list) -> List[Player]:
-    """Initialize players"""
+    Seats named in `bots` are taken by a `BotPlayer` instead of asking for a
+    name. Bots search with `table` if given, and with a private in-memory
+    table otherwise.
+    """
     for player_enum in PlayerEnum:
-        name = input(f"Enter the {player_enum.name} player name: ")
         player_enum_dict = eval(player_enum.value)
-        player = Player(name=name, mark=player_enum_dict["mark"])
+        if player_enum.name in bots:
+            player = BotPlayer(
+                name=f"Bot {player_enum_dict['index']}",
+                mark=player_enum_dict["mark"],
+                searcher=Searcher(table) if table is not None else None,
+                time_budget=time_budget,
+                verbose=True,
+                ponder=ponder,
+            )
+        else:
+            name = input(f"Enter the {player_enum.name} player name: ")
+            player = Player(name=name, mark=player_enum_dict["mark"])
         players.append(player)
         print(f"Player {player_enum_dict['index']} is {player.name} !!!\n")
     return players
 
 
-def run_game_loop(board: Board, players: List[Player]) -> Optional[Player]:
+@timed("game_loop")
+def run_game_loop(
+    board: Board,
+    players: List[Player],
+    broadcaster: Optional[StateBroadcaster] = None,
+) -> Optional[Player]:
     """Main game loop
 
     This loop will continue as long as there are still space to mark and no
-    winners on the board.
+    winners on the board. A player raising `Forfeit` when asked for input
+    loses the game.
 
     Args:
       board: current instance of the game.
       players: list of players in this game.
+      broadcaster: state sync of spectators of the game, told about each move.
 
     Returns:
       The winner of the game, if any.
@@ -49,57 +94,239 @@ def run_game_loop(board: Board, players: List[Player]) -> Optional[Player]:
     current_player = players[0]
     previous_player = players[-1]
     board.current_player = current_player
-    # get current player input
-    player_input = current_player.ask_for_input()
-    while board.state not in [GameState.DRAW, GameState.WIN]:
-        try:
-            row, col = get_row_col_from_input(player_input)
-            # update & evaluate board
-            board.make_move(row, col)
-            board.evaluate_board()
-        except (PositionAlreadyTaken, PositionDoesNotExist) as err:
-            player_input = current_player.retry_input(
-                error=err, previous_player=previous_player
-            )
-            continue
-        except GameOver as err:
-            if board.state == GameState.WIN:
-                # only set winner if there is one
-                winner = board.current_player
-            break
-        except:
-            # exit if unexpected error is caught
-            print(err.message)
-            break
-        else:
-            # set players
-            players = Player.rotate_players(players)
-            current_player = players[0]
-            previous_player = players[-1]
-            board.current_player = current_player
-            # get current player input
-            player_input = current_player.ask_for_input()
+    try:
+        # get current player input
+        player_input = current_player.ask_for_input()
+        while board.state not in [GameState.DRAW, GameState.WIN]:
+            try:
+                row, col = get_row_col_from_input(player_input)
+                # update & evaluate board
+                board.make_move(row, col)
+                metrics.increment("moves")
+                board.evaluate_board()
+            except (PositionAlreadyTaken, PositionDoesNotExist) as err:
+                metrics.increment("retries")
+                player_input = current_player.retry_input(
+                    error=err, previous_player=previous_player
+                )
+                continue
+            except GameOver as err:
+                if broadcaster is not None:
+                    broadcaster.publish()
+                if board.state == GameState.WIN:
+                    # only set winner if there is one
+                    winner = board.current_player
+                break
+            except:
+                # exit if unexpected error is caught
+                print(err.message)
+                break
+            else:
+                if broadcaster is not None:
+                    broadcaster.publish()
+                # set players
+                players = Player.rotate_players(players)
+                current_player = players[0]
+                previous_player = players[-1]
+                board.current_player = current_player
+                # get current player input
+                player_input = current_player.ask_for_input()
+    except Forfeit as err:
+        # a player giving up hands the game to its opponent
+        print(err.message)
+        board.state = GameState.WIN
+        board.current_player = previous_player
+        winner = previous_player
     return winner
 
 
-def main():
+def main(
+    renderer: Optional[FrameRenderer] = None,
+    history: Optional[HistoryStore] = None,
+    bots: Sequence[str] = (),
+    time_budget: float = settings.BOT_TIME_BUDGET,
+    ponder: bool = False,
+    table_path: Optional[str] = None,
+):
+    if settings.INSTRUMENT:
+        metrics.enable()
+
     while True:
         try:
-            board = Board.setup_board()
+            board = Board.setup_board(renderer=renderer)
             break
         except GameError as err:
             print(err.message)
             continue
 
+    # bots share the persistent table, so later sessions start warm
+    table = TranspositionTable(table_path) if bots and table_path else None
     players: List[Player] = []
-    players = assign_players(players)
+    players = assign_players(players, bots, time_budget, ponder, table)
+    book = load_book(board.size) if bots else None
+    bot_players = [player for player in players if isinstance(player, BotPlayer)]
+    for player in bot_players:
+        player.board = board
+        player.book = book
     winner = run_game_loop(board, players)
+    for player in bot_players:
+        player.stop_pondering()
+    if book is not None:
+        book.close()
+    if table is not None:
+        table.close()
+    if history is not None:
+        history.record(GameRecord.from_board(board, players, winner))
 
     if winner is not None:
         print(settings.END_GAME_TEXT.format(winner=winner.name))
     else:
         print(settings.END_GAME_TEXT.format(winner="No one"))
 
+    if metrics.enabled:
+        print(metrics.summary())
+        if settings.INSTRUMENT_EXPORT_PATH:
+            metrics.export(settings.INSTRUMENT_EXPORT_PATH)
+
+
+def play_scripted_game(
+    game: ScriptedGame, pool: BoardPool, history: Optional[HistoryStore] = None
+) -> str:
+    """Plays a batch script game through the game loop without printing the board
+
+    Args:
+      game: game to play.
+      pool: pool the board is borrowed from.
+      history: store the finished game is recorded in, if any.
+
+    Returns:
+      The end of game text, or the reason the game could not be completed.
+    """
+    try:
+        board = pool.acquire(int(game.size))
+    except ValueError:
+        return "Board size invalid!"
+    except GameError as err:
+        return err.message
+
+    try:
+        if len(game.names) < len(PlayerEnum):
+            return "Missing player names"
+        moves = iter(game.moves)
+        players: List[Player] = [
+            ScriptedPlayer(name, mark, moves)
+            for name, mark in zip(game.names, PlayerEnum.list_marks())
+        ]
+        try:
+            winner = run_game_loop(board, players)
+        except StopIteration:
+            return "Unfinished, ran out of moves"
+        if history is not None:
+            history.record(GameRecord.from_board(board, players, winner))
+    finally:
+        pool.release(board)
+    if winner is not None:
+        return settings.END_GAME_TEXT.format(winner=winner.name)
+    return settings.END_GAME_TEXT.format(winner="No one")
+
+
+def run_batch(
+    stream: TextIO,
+    output: TextIO,
+    pool: Optional[BoardPool] = None,
+    history: Optional[HistoryStore] = None,
+) -> int:
+    """Plays every game of a batch script, writing one result line per game
+
+    Boards are borrowed from `pool`, so consecutive games of the same size
+    reuse the same board.
+
+    Returns:
+      The number of games played.
+    """
+    pool = pool or BoardPool()
+    count = 0
+    for game in read_games(stream):
+        result = play_scripted_game(game, pool, history)
+        output.write(f"Game {game.number}: {result}\n")
+        count += 1
+    return count
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe")
+    add_profile_arguments(parser)
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="play the games of a script file ('-' for stdin) and print results",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="PATH",
+        help="record finished games in the SQLite database at PATH",
+    )
+    parser.add_argument(
+        "--render",
+        choices=["lines", "buffered"],
+        default="lines",
+        help="print the board line by line, or as one buffered write per move",
+    )
+    parser.add_argument(
+        "--bot",
+        action="append",
+        choices=PlayerEnum.list_names(),
+        default=[],
+        help="let a bot take the seat of this player, may be repeated",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=settings.BOT_TIME_BUDGET,
+        metavar="SECONDS",
+        help="time each bot may search per move",
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="let bots keep searching while their opponent chooses a move",
+    )
+    parser.add_argument(
+        "--table",
+        metavar="PATH",
+        help=f"keep the bots' transposition table in a file, e.g. {settings.TT_PATH}",
+    )
+    return parser.parse_args(argv)
+
+
+def make_renderer(mode: str) -> Optional[FrameRenderer]:
+    """Returns the board renderer of a `--render` mode"""
+    if mode == "lines":
+        return None
+    return FrameRenderer()
+
 
 if __name__ == "__main__":
-    main()
+    args = parse_args(sys.argv[1:])
+    history = HistoryStore(args.history) if args.history else None
+    if args.batch:
+        stream = sys.stdin if args.batch == "-" else open(args.batch)
+        pool = BoardPool()
+        with stream:
+            run_main(args, run_batch, stream, sys.stdout, pool, history)
+        print(pool.summary(), file=sys.stderr)
+    else:
+        renderer = make_renderer(args.render)
+        run_main(
+            args,
+            main,
+            renderer,
+            history,
+            args.bot,
+            args.time_budget,
+            args.ponder,
+            args.table,
+        )
+    if history is not None:
+        history.close()
@@ -1,6 +1,79 @@
+import os
+
 BLANK = "_"
 DELIMITER = ","
 WIN_LENGTH = 3
 ALLOWED_SIZE = [3, 4, 5]
 ASK_INPUT_TEXT = '{current_player}, please enter a coordinate to put "{mark}": '
 END_GAME_TEXT = "{winner} wins the game !!!!"
+
+# opt-in per-phase latency instrumentation, see `game.instrumentation`
+INSTRUMENT = os.environ.get("TTT_INSTRUMENT", "") not in ("", "0")
+INSTRUMENT_EXPORT_PATH = os.environ.get("TTT_INSTRUMENT_EXPORT", "")
+
+# `--profile` output, see `game.profiling`
+PROFILE_OUTPUT = "profile"
+PROFILE_SORT = "cumulative"
+PROFILE_SAMPLE_INTERVAL = 0.001
+
+# idle boards kept per size by `game.pool.BoardPool`
+POOL_MAX_PER_SIZE = 64
+
+# finished games store, see `game.history`
+HISTORY_PATH = "history.sqlite3"
+HISTORY_BATCH_SIZE = 500
+
+# persistent transposition table, see `game.ttable`
+TT_PATH = "ttable.bin"
+TT_SLOTS = 1 << 18
+
+# opening books, see `game.book`
+BOOK_PATH = "book{size}.bin"
+BOOK_PLIES = 3
+BOOK_DEPTH = 7
+
+# value of a window with `n` marks of one player relative to `n - 1`, see
+# `Board.window_score`
+EVAL_WEIGHT_BASE = 8
+
+# search depth of `game.bots.BotPlayer`, and its time per move in seconds
+BOT_DEPTH = 6
+BOT_TIME_BUDGET = 1.0
+
+# positions held by the node table of `game.proof.ProofSolver`
+PN_TABLE_ENTRIES = 1_000_000
+
+# `game.analysis`: search depth per move, and worker processes (one per CPU
+# if `None`)
+ANALYSIS_DEPTH = 4
+ANALYSIS_WORKERS = None
+
+# external engines, see `game.external`: default time per move, and the extra
+# time allowed for replies to reach the controller, in seconds
+ENGINE_MOVETIME = 1.0
+ENGINE_GRACE = 1.0
+
+# `game.tournament`: worker processes (one per CPU if `None`), random moves
+# opening every game, Elo ratings, and progress file saved every N games
+TOURNAMENT_WORKERS = None
+TOURNAMENT_OPENING_PLIES = 2
+TOURNAMENT_CHECKPOINT_PATH = "tournament.json"
+TOURNAMENT_CHECKPOINT_EVERY = 50
+ELO_INITIAL = 1500
+ELO_K_FACTOR = 16
+
+# positions per `.npy` chunk file written by `game.dataset.PositionWriter`
+DATASET_CHUNK_SIZE = 1 << 16
+
+# `game.evaluator.BatchEvaluator`: positions per batch, and the longest time a
+# batch waits to fill up, in seconds
+EVAL_MAX_BATCH = 64
+EVAL_MAX_WAIT = 0.001
+
+# moves between two board snapshots of a recorded game, see
+# `game.history.GameRecord.take_snapshots`
+SNAPSHOT_INTERVAL = 16
+
+# messages a spectator may leave pending before `game.sync.StateBroadcaster`
+# replaces them with a snapshot
+SYNC_MAX_LAG = 32
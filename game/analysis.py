@@ -0,0 +1,131 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+import config as settings
+from game.arena import BoardArena
+from game.models import Board
+from game.profiling import add_profile_arguments, run_main
+from game.search import WIN_SCORE, Searcher, side_to_move
+from game.ttable import TranspositionTable
+
+# searcher, root position and board of a pool worker process, set up by
+# `_init_worker`
+_searcher: Optional[Searcher] = None
+_arena: Optional[BoardArena] = None
+_board: Optional[Board] = None
+
+
+class MoveAnalysis:
+    """Value of one candidate move of a position.
+
+    Attributes:
+        `move`: flat index of the analysed cell.
+        `score`: score of the move for the side to move, as `SearchResult.score`.
+        `pv`: principal variation starting with `move`.
+        `depth`: depth the move was searched to, counting the move itself.
+        `nodes`: number of positions visited.
+    """
+
+    __slots__ = ("move", "score", "pv", "depth", "nodes")
+
+    move: int
+    score: int
+    pv: List[int]
+    depth: int
+    nodes: int
+
+    def __init__(
+        self, move: int, score: int, pv: List[int], depth: int, nodes: int
+    ) -> None:
+        self.move = move
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+        self.nodes = nodes
+
+
+def analyze(
+    board: Board,
+    depth: int = settings.ANALYSIS_DEPTH,
+    workers: Optional[int] = settings.ANALYSIS_WORKERS,
+    table_path: Optional[str] = None,
+) -> Iterator[MoveAnalysis]:
+    """Scores every empty cell of `board` for the side to move.
+
+    Root moves are searched in a pool of worker processes, and each analysis
+    is yielded as soon as its move is done, so callers can show results
+    progressively; sort them by `score` for a ranking.
+
+    Args:
+      board: position to analyse, left unchanged.
+      depth: search depth of each move, counting the move itself.
+      workers: number of worker processes, by default one per CPU.
+      table_path: transposition table file, such as one filled by earlier
+        games, that every worker maps read-only under its own private table.
+    """
+    # workers read the position from shared memory, tasks are only a move
+    arena = BoardArena(board.size, 1)
+    arena.store(0, board)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(table_path, arena.name),
+    )
+    futures: list = []
+    try:
+        futures = [
+            pool.submit(_analyze_move, move, depth) for move in board.empty_cells()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # stop at once if the caller stops reading early
+        for future in futures:
+            future.cancel()
+        pool.shutdown()
+        arena.close()
+        arena.unlink()
+
+
+def _init_worker(table_path: Optional[str], arena_name: Optional[str] = None) -> None:
+    global _searcher, _arena, _board
+    parent = None
+    if table_path is not None and os.path.exists(table_path):
+        parent = TranspositionTable(table_path, readonly=True)
+    _searcher = Searcher(TranspositionTable(parent=parent))
+    if arena_name is not None:
+        _arena = BoardArena.attach(arena_name)
+        _board = Board(_arena.size, verbose=False)
+
+
+def _analyze_move(move: int, depth: int) -> MoveAnalysis:
+    board = _arena.load(0, _board)
+    board.place(move, side_to_move(board))
+    if board.is_winning_cell(move):
+        return MoveAnalysis(move, WIN_SCORE - board.move_count, [move], 1, 1)
+    if not board.empty_cells() or depth <= 1:
+        return MoveAnalysis(move, -_searcher.evaluate(board), [move], 1, 1)
+    result = _searcher.search(board, depth - 1)
+    return MoveAnalysis(
+        move, -result.score, [move] + result.pv, depth, result.nodes + 1
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    board = Board(args.size, verbose=False)
+    for analysis in analyze(board, args.depth, args.workers, args.table):
+        row, col = divmod(analysis.move, args.size)
+        print(f"{row + 1},{col + 1}: {analysis.score:5d}  pv {analysis.pv}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every move of an empty board")
+    parser.add_argument("--size", type=int, choices=settings.ALLOWED_SIZE, default=4)
+    parser.add_argument("--depth", type=int, default=settings.ANALYSIS_DEPTH)
+    parser.add_argument("--workers", type=int, default=settings.ANALYSIS_WORKERS)
+    parser.add_argument("--table", default=settings.TT_PATH)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_main(args, main, args)
@@ -0,0 +1,161 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Optional
+
+from game.models import BLANK_CODE, Board
+from game.tables import BoardTables
+
+MAGIC = b"TTA1"
+# magic, board size, number of slots
+HEADER = struct.Struct("<4sHI")
+# number of moves of a slot, followed by its cells and then its moves
+COUNT = struct.Struct("<H")
+
+
+class BoardArena:
+    """Fixed number of compact boards in a shared memory block.
+
+    Each slot holds the cells of one position and its moves, one byte per
+    cell index, so processes attached to the same arena read and write
+    positions in place and only need to exchange slot numbers, with nothing
+    pickled. Slots are not locked: give each slot to one writer at a time.
+
+    The process creating the arena owns the block and must `unlink` it once
+    every user is done, which leaving a `with` block does; other processes,
+    typically its workers, `attach` to it by `name` and only `close` it.
+
+    Attributes:
+        `size`: length and breadth of every board.
+        `slots`: number of boards held.
+        `slot_size`: bytes used by each board.
+    """
+
+    size: int = 3
+    slots: int = 0
+    slot_size: int = 0
+
+    def __init__(
+        self,
+        size: int,
+        slots: int,
+        name: Optional[str] = None,
+        create: bool = True,
+    ) -> None:
+        """Creates an arena, or attaches to the arena called `name`.
+
+        Args:
+          size: board size of a new arena, ignored when attaching.
+          slots: number of boards of a new arena, ignored when attaching.
+          name: name of the shared memory block, chosen by the system if
+            `None` and creating.
+          create: create a new arena, or attach to an existing one.
+        """
+        if create:
+            if size * size > 256:
+                raise ValueError(f"boards of size {size} do not fit in an arena")
+            length = HEADER.size + slots * (COUNT.size + 2 * size * size)
+            self._memory = shared_memory.SharedMemory(name, create=True, size=length)
+            HEADER.pack_into(self._memory.buf, 0, MAGIC, size, slots)
+        else:
+            self._memory = shared_memory.SharedMemory(name)
+        magic, self.size, self.slots = HEADER.unpack_from(self._memory.buf, 0)
+        if magic != MAGIC:
+            self._memory.close()
+            raise ValueError(f"{name} is not a board arena")
+        self._cell_count = self.size * self.size
+        self.slot_size = COUNT.size + 2 * self._cell_count
+        self._blank = BoardTables.for_size(self.size).blank_cells
+        self._owner = create
+        if create:
+            for slot in range(self.slots):
+                self.clear(slot)
+
+    @classmethod
+    def attach(cls, name: str) -> "BoardArena":
+        return cls(0, 0, name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def clear(self, slot: int) -> None:
+        """Empties the board of `slot`."""
+        offset = self._offset(slot)
+        COUNT.pack_into(self._memory.buf, offset, 0)
+        offset += COUNT.size
+        self._memory.buf[offset : offset + self._cell_count] = self._blank
+
+    def store(self, slot: int, board: Board) -> None:
+        """Copies the cells and moves of `board` into `slot`."""
+        buf = self._memory.buf
+        offset = self._offset(slot)
+        COUNT.pack_into(buf, offset, len(board.moves))
+        offset += COUNT.size
+        buf[offset : offset + self._cell_count] = board.cells
+        offset += self._cell_count
+        buf[offset : offset + len(board.moves)] = bytes(board.moves.tolist())
+
+    def load(self, slot: int, board: Optional[Board] = None) -> Board:
+        """Returns the position of `slot`, replayed onto `board` if given.
+
+        `board` is reset first; replaying the moves keeps its move history,
+        position hash and window counters consistent, so it can be searched
+        and undone like any board. Marks without a stored move, such as those
+        of a board set through `Board.grid`, are placed afterwards in cell
+        order.
+        """
+        if board is None:
+            board = Board(self.size, verbose=False)
+        board.reset()
+        cells = self.cells(slot)
+        for move in self.moves(slot):
+            board.place(move, cells[move])
+        if board.move_count < self._cell_count - bytes(cells).count(BLANK_CODE):
+            for index, code in enumerate(cells):
+                if code != BLANK_CODE and board.cells[index] == BLANK_CODE:
+                    board.place(index, code)
+        return board
+
+    def place(self, slot: int, index: int, code: int) -> None:
+        """Marks cell `index` of `slot` with the mark byte `code`, in place."""
+        buf = self._memory.buf
+        offset = self._offset(slot)
+        (count,) = COUNT.unpack_from(buf, offset)
+        COUNT.pack_into(buf, offset, count + 1)
+        offset += COUNT.size
+        buf[offset + index] = code
+        buf[offset + self._cell_count + count] = index
+
+    def move_count(self, slot: int) -> int:
+        return COUNT.unpack_from(self._memory.buf, self._offset(slot))[0]
+
+    def cells(self, slot: int) -> memoryview:
+        """Zero-copy view of the cells of `slot`, as in `Board.cells`."""
+        offset = self._offset(slot) + COUNT.size
+        return self._memory.buf[offset : offset + self._cell_count]
+
+    def moves(self, slot: int) -> memoryview:
+        """Zero-copy view of the moves of `slot`, in the order they were played."""
+        offset = self._offset(slot) + COUNT.size + self._cell_count
+        return self._memory.buf[offset : offset + self.move_count(slot)]
+
+    def close(self) -> None:
+        """Detaches this process from the arena; views must be released first."""
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Frees the shared memory block; attached processes keep their mapping."""
+        self._memory.unlink()
+
+    def _offset(self, slot: int) -> int:
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"slot {slot} out of range of {self.slots} slots")
+        return HEADER.size + slot * self.slot_size
+
+    def __enter__(self) -> "BoardArena":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
@@ -0,0 +1,73 @@
+from typing import Any, Iterator, List, TextIO
+
+from game.errors import GameError
+from game.models import Player, PlayerEnum
+
+
+class ScriptedGame:
+    """One game of a batch script.
+
+    Attributes:
+        `number`: 1-indexed position of the game in its script.
+        `size`: board size, as written in the script.
+        `names`: player names, in turn order.
+        `moves`: player inputs, in the order they would have been typed.
+    """
+
+    number: int = 0
+    size: str = ""
+    names: List[str] = []
+    moves: List[str] = []
+
+    def __init__(self, number: int, size: str, names: List[str], moves: List[str]):
+        self.number = number
+        self.size = size
+        self.names = names
+        self.moves = moves
+
+
+class ScriptedPlayer(Player):
+    """Player reading its inputs from the moves of a `ScriptedGame`.
+
+    Every player of a game shares the same move iterator, so inputs are
+    consumed in the order they were typed, including retries after an
+    invalid coordinate.
+    """
+
+    __slots__ = ("moves",)
+
+    moves: Iterator[str]
+
+    def __init__(self, name: str, mark: str, moves: Iterator[str]) -> None:
+        super().__init__(name, mark)
+        self.moves = moves
+
+    def ask_for_input(self) -> str:
+        return next(self.moves)
+
+    def retry_input(self, error: GameError, **kwargs: Any) -> str:
+        return next(self.moves)
+
+
+def read_games(stream: TextIO) -> Iterator[ScriptedGame]:
+    """Parses a batch script into games.
+
+    The whole script is read at once. Games are separated by blank lines, and
+    each one holds the board size, one name per player and then one
+    `row,col` move per line. Lines starting with `#` are ignored.
+    """
+    player_count = len(PlayerEnum)
+    number = 0
+    lines: List[str] = []
+    for line in stream.read().splitlines() + [""]:
+        line = line.strip()
+        if line.startswith("#"):
+            continue
+        if line:
+            lines.append(line)
+            continue
+        if lines:
+            number += 1
+            size, names = lines[0], lines[1 : player_count + 1]
+            yield ScriptedGame(number, size, names, lines[player_count + 1 :])
+            lines = []
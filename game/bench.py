@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import copy
+import io
+import timeit
+from typing import Callable, Dict, List
+
+import config as settings
+from game.models import Board
+from game.ordering import MoveOrderer
+from game.parsing import parse_moves
+from game.profiling import add_profile_arguments, run_main
+from game.search import Searcher
+from game.ttable import TranspositionTable
+
+
+def _rate(func: Callable[[], object], number: int) -> float:
+    """Returns calls per second of `func`, best of three runs."""
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return number / best
+
+
+def bench_clone(
+    sizes: List[int] = settings.ALLOWED_SIZE, number: int = 100_000
+) -> List[Dict[str, float]]:
+    """Measures `Board.clone` against `copy.deepcopy`, in copies per second."""
+    results = []
+    for size in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            board = Board(size)
+        results.append(
+            {
+                "size": size,
+                "clone": _rate(board.clone, number),
+                "deepcopy": _rate(lambda: copy.deepcopy(board), number // 10),
+            }
+        )
+    return results
+
+
+def bench_parse(
+    sizes: List[int] = settings.ALLOWED_SIZE, number: int = 20
+) -> List[Dict[str, float]]:
+    """Measures `parse_moves` against per-line parsing, in moves per second."""
+    # imported here as `app` imports this package
+    from app import get_row_col_from_input
+
+    results = []
+    for size in sizes:
+        lines = [f"{i // size + 1},{i % size + 1}" for i in range(size * size)] * 400
+        buffer = "\n".join(lines)
+
+        def per_line() -> None:
+            for line in buffer.splitlines():
+                get_row_col_from_input(line)
+
+        results.append(
+            {
+                "size": size,
+                "parse_moves": _rate(lambda: parse_moves(buffer, size), number)
+                * len(lines),
+                "per_line": _rate(per_line, number) * len(lines),
+            }
+        )
+    return results
+
+
+def bench_ordering(sizes: List[int] = [4, 5], depth: int = 5) -> List[Dict[str, float]]:
+    """Counts nodes searched from the empty board, with and without move ordering.
+
+    Each search starts with a fresh transposition table.
+    """
+    results = []
+    for size in sizes:
+        row: Dict[str, float] = {"size": size}
+        for name, orderer in [
+            ("plain", MoveOrderer(threats=False, killers=False, history=False)),
+            ("ordered", MoveOrderer()),
+        ]:
+            with TranspositionTable() as table:
+                searcher = Searcher(table, orderer)
+                row[name] = searcher.search(Board(size, verbose=False), depth).nodes
+        results.append(row)
+    return results
+
+
+def format_results(
+    title: str, results: List[Dict[str, float]], unit: str = "/s"
+) -> str:
+    columns = [key for key in results[0] if key != "size"]
+    lines = [title, f"{'board':<8}" + "".join(f"{c + unit:>14}" for c in columns)]
+    for row in results:
+        label = f"{row['size']}x{row['size']}"
+        lines.append(f"{label:<8}" + "".join(f"{row[c]:>14,.0f}" for c in columns))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    print(format_results("Board cloning", bench_clone()))
+    print(format_results("Move parsing", bench_parse()))
+    print(format_results("Search nodes, depth 5", bench_ordering(), unit=""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the micro-benchmarks")
+    add_profile_arguments(parser)
+    run_main(parser.parse_args(), main)
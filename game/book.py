@@ -0,0 +1,187 @@
+import argparse
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import config as settings
+from game.models import BLANK_CODE, Board
+from game.profiling import add_profile_arguments, run_main
+from game.search import Searcher, side_to_move
+from game.ttable import NO_MOVE
+
+MAGIC = b"TTB1"
+HEADER = struct.Struct("<4sBBI")
+RECORD = struct.Struct("<QHh")
+
+
+def canonical_key(board: Board) -> Tuple[int, Tuple[int, ...]]:
+    """Returns the canonical hash of `board` and the symmetry producing it.
+
+    The canonical hash is the smallest Zobrist hash among the 8 rotations and
+    reflections of the position, so all symmetric positions share it.
+    """
+    tables = board.tables
+    zobrist = tables.zobrist
+    marked = [(i, code) for i, code in enumerate(board.cells) if code != BLANK_CODE]
+    best_key = None
+    best_symmetry = tables.symmetries[0]
+    for symmetry in tables.symmetries:
+        key = 0
+        for index, code in marked:
+            key ^= zobrist[code][symmetry[index]]
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+class OpeningBook:
+    """Best replies of early positions of one board size, read from disk.
+
+    The book file holds a header followed by fixed-size records sorted by
+    canonical position hash, and is looked up by binary search over a
+    read-only memory map, so opening a book costs nothing up front.
+
+    Attributes:
+        `path`: path of the book file.
+        `size`: board size the book was built for.
+        `win_length`: win length the book was built for.
+        `count`: number of positions in the book.
+        `hits`: number of lookups answered by the book.
+        `misses`: number of lookups of positions missing from the book.
+    """
+
+    path: str = ""
+    size: int = 0
+    win_length: int = 0
+    count: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.win_length, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != HEADER.size + self.count * RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    @staticmethod
+    def write(
+        path: str, size: int, win_length: int, entries: Dict[int, Tuple[int, int]]
+    ) -> None:
+        """Writes `entries` mapping canonical hash to `(move, score)` to `path`."""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, size, win_length, len(entries)))
+            for key in sorted(entries):
+                move, score = entries[key]
+                f.write(RECORD.pack(key, move, score))
+
+    def probe(self, key: int) -> Optional[Tuple[int, int]]:
+        """Returns `(canonical move, score)` of canonical hash `key`, if any."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move, score = RECORD.unpack_from(
+                self._map, HEADER.size + middle * RECORD.size
+            )
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return move, score
+        return None
+
+    def lookup(self, board: Board) -> Optional[int]:
+        """Returns the book move of `board` as a flat index, if any."""
+        if board.size != self.size or board.tables.win_length != self.win_length:
+            return None
+        key, symmetry = canonical_key(board)
+        found = self.probe(key)
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # the book move is in canonical coordinates, map it back to `board`
+        return symmetry.index(found[0])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def load_book(size: int) -> Optional[OpeningBook]:
+    """Opens the book of `size` at `settings.BOOK_PATH`, if it was built."""
+    path = settings.BOOK_PATH.format(size=size)
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def early_positions(size: int, plies: int) -> List[Board]:
+    """Returns one board per canonical position with fewer than `plies` marks.
+
+    Positions where the game is already over are left out.
+    """
+    root = Board(size, verbose=False)
+    level = {canonical_key(root)[0]: root}
+    positions = list(level.values())
+    for _ in range(plies - 1):
+        next_level: Dict[int, Board] = {}
+        for board in level.values():
+            code = side_to_move(board)
+            for index in board.empty_cells():
+                child = board.clone()
+                child.place(index, code)
+                if child.is_winning_cell(index) or not child.empty_cells():
+                    continue
+                next_level.setdefault(canonical_key(child)[0], child)
+        level = next_level
+        positions.extend(level.values())
+    return positions
+
+
+def build_book(
+    size: int,
+    plies: int = settings.BOOK_PLIES,
+    depth: int = settings.BOOK_DEPTH,
+    searcher: Optional[Searcher] = None,
+) -> Dict[int, Tuple[int, int]]:
+    """Searches every canonical early position `depth` plies deep.
+
+    Returns:
+      `(canonical move, score)` of each position, keyed by canonical hash.
+    """
+    searcher = searcher or Searcher()
+    entries = {}
+    for board in early_positions(size, plies):
+        result = searcher.search(board, depth)
+        if result.move == NO_MOVE:
+            continue
+        key, symmetry = canonical_key(board)
+        entries[key] = (symmetry[result.move], result.score)
+    return entries
+
+
+def main(args: argparse.Namespace) -> None:
+    for size in args.size or settings.ALLOWED_SIZE:
+        entries = build_book(size, args.plies, args.depth)
+        path = settings.BOOK_PATH.format(size=size)
+        OpeningBook.write(path, size, settings.WIN_LENGTH, entries)
+        print(f"{path}: {len(entries)} positions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build opening books")
+    parser.add_argument(
+        "--size", type=int, action="append", choices=settings.ALLOWED_SIZE
+    )
+    parser.add_argument("--plies", type=int, default=settings.BOOK_PLIES)
+    parser.add_argument("--depth", type=int, default=settings.BOOK_DEPTH)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_main(args, main, args)
@@ -0,0 +1,238 @@
+import math
+import threading
+import time
+from typing import Any, Optional
+
+import config as settings
+from game.book import OpeningBook
+from game.errors import GameError
+from game.models import Board, Player
+from game.search import SearchResult, Searcher, side_to_move
+from game.ttable import NO_MOVE
+
+
+class Ponderer:
+    """Searches ahead in a background thread while the opponent thinks.
+
+    Once its bot has chosen a move, the ponderer searches the position
+    expected after that move and the predicted reply, deepening until it is
+    stopped. If the opponent plays the predicted reply, the bot resumes its
+    search one ply deeper than the pondered result; otherwise the entries it
+    left in the shared transposition table still speed up the real search.
+
+    Attributes:
+        `searcher`: search engine of the bot, only used while the bot waits.
+        `hits`: pondered positions that the opponent actually played into.
+        `misses`: pondered positions that the opponent avoided.
+    """
+
+    searcher: Searcher
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, searcher: Searcher) -> None:
+        self.searcher = searcher
+        self.hits = 0
+        self.misses = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._position_hash = 0
+        self._move_count = 0
+        self._result: Optional[SearchResult] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, board: Board, move: int, reply: int = NO_MOVE) -> None:
+        """Starts pondering the position after `move` and `reply` on `board`.
+
+        Without a predicted `reply`, the position after `move` is searched
+        instead, so that every reply benefits from the table entries.
+        """
+        self.stop()
+        position = board.clone()
+        for index in [move, reply]:
+            if index == NO_MOVE:
+                break
+            position.place(index, side_to_move(position))
+            if position.is_winning_cell(index) or not position.empty_cells():
+                return
+        self._position_hash = position.position_hash
+        self._move_count = position.move_count
+        self._result = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(position,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops pondering and waits for the background search to unwind."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def take(self, board: Board) -> Optional[SearchResult]:
+        """Stops pondering, returning its result if `board` is the pondered position."""
+        if not self.running:
+            return None
+        self.stop()
+        result = self._result
+        if (
+            board.position_hash != self._position_hash
+            or board.move_count != self._move_count
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        if result is None or result.move == NO_MOVE:
+            return None
+        return result
+
+    def _run(self, position: Board) -> None:
+        self._result = self.searcher.search_timed(position, math.inf, stop=self._stop)
+
+
+class BotPlayer(Player):
+    """Player choosing its moves by searching the board it plays on.
+
+    Early positions are answered from the opening book, if one is given, and
+    only positions missing from it are searched. With a time budget, the bot
+    deepens its search until the budget runs out, so it replies in about the
+    same time on every board size; otherwise it searches `depth` plies.
+    A pondering bot keeps searching while the opponent chooses its move, see
+    `Ponderer`.
+
+    Attributes:
+        `board`: board of the game being played, set before the game starts.
+        `searcher`: search engine, whose transposition table persists across moves.
+        `book`: opening book of the board size, if any.
+        `depth`: search depth, in plies, when there is no time budget.
+        `time_budget`: time allowed per move, in seconds, if any.
+        `last_result`: result of the latest search, `None` after a book move.
+        `last_source`: where the latest move came from, "book", "search" or
+            "ponder".
+        `searched_depth`: depth reached by the latest timed search run on the
+            bot's own turn, 0 before any.
+        `verbose`: whether to print each move and its search statistics.
+        `ponderer`: background search run during the opponent's turn, if any.
+    """
+
+    __slots__ = (
+        "board",
+        "searcher",
+        "book",
+        "depth",
+        "time_budget",
+        "last_result",
+        "last_source",
+        "searched_depth",
+        "verbose",
+        "ponderer",
+    )
+
+    board: Optional[Board]
+    searcher: Searcher
+    book: Optional[OpeningBook]
+    depth: int
+    time_budget: Optional[float]
+    last_result: Optional[SearchResult]
+    last_source: str
+    searched_depth: int
+    verbose: bool
+    ponderer: Optional[Ponderer]
+
+    def __init__(
+        self,
+        name: str,
+        mark: str,
+        board: Optional[Board] = None,
+        searcher: Optional[Searcher] = None,
+        book: Optional[OpeningBook] = None,
+        depth: int = settings.BOT_DEPTH,
+        time_budget: Optional[float] = None,
+        verbose: bool = False,
+        ponder: bool = False,
+    ) -> None:
+        super().__init__(name, mark)
+        self.board = board
+        self.searcher = searcher or Searcher()
+        self.book = book
+        self.depth = depth
+        self.time_budget = time_budget
+        self.last_result = None
+        self.last_source = ""
+        self.searched_depth = 0
+        self.verbose = verbose
+        self.ponderer = Ponderer(self.searcher) if ponder else None
+
+    def choose_move(self) -> int:
+        """Returns the flat index of the cell to mark next."""
+        start = time.perf_counter()
+        board = self.board
+        move = None
+        self.last_result = None
+        self.last_source = "search"
+        if self.ponderer is not None:
+            self.last_result = self.ponderer.take(board)
+            if self.last_result is not None:
+                self.last_source = "ponder"
+        if self.last_result is None and self.book is not None:
+            move = self.book.lookup(board)
+            if move is not None:
+                self.last_source = "book"
+        if move is None:
+            self.last_result = self._search(board, self.last_result, start)
+            move = self.last_result.move
+            if move == NO_MOVE:
+                # the table entry of the root was overwritten, any empty cell will do
+                move = board.empty_cells()[0]
+        if self.ponderer is not None:
+            pv = self.last_result.pv if self.last_result is not None else []
+            self.ponderer.start(board, move, pv[1] if len(pv) > 1 else NO_MOVE)
+        return move
+
+    def _search(
+        self,
+        board: Board,
+        pondered: Optional[SearchResult] = None,
+        start: Optional[float] = None,
+    ) -> SearchResult:
+        """Searches `board`, resuming from the `pondered` result if given.
+
+        A pondered result is the answer when it is at least as deep as the
+        bot's own search would go: `depth` plies, or with a time budget the
+        depth its latest timed search reached. A shallower one is deepened,
+        reusing the table entries of the pondering search, for what is left
+        of the time budget since `start`.
+        """
+        if self.time_budget is None:
+            if pondered is not None and pondered.depth >= self.depth:
+                return pondered
+            return self.searcher.search(board, self.depth)
+        if pondered is not None and pondered.depth >= self.searched_depth:
+            return pondered
+        budget = self.time_budget
+        if start is not None:
+            budget -= time.perf_counter() - start
+        result = self.searcher.search_timed(board, max(budget, 0.0), previous=pondered)
+        self.searched_depth = result.depth
+        return result
+
+    def stop_pondering(self) -> None:
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+    def ask_for_input(self) -> str:
+        index = self.choose_move()
+        size = self.board.size
+        player_input = f"{index // size + 1},{index % size + 1}"
+        if self.verbose:
+            source = self.last_source
+            if self.last_result is not None:
+                source += f", {self.last_result.summary()}"
+            print(f"{self.name} ({self.mark}) plays {player_input} [{source}]")
+        return player_input
+
+    def retry_input(self, error: GameError, **kwargs: Any) -> str:
+        return self.ask_for_input()
@@ -0,0 +1,250 @@
+import argparse
+import ast
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+import config as settings
+from game.history import GameRecord
+from game.models import BLANK_CODE, MARK_CODES, Board, GameState
+from game.profiling import add_profile_arguments, run_main
+from game.search import side_to_move
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# magic, header length and header dictionary; fixed so that the header can be
+# rewritten in place once the final number of positions is known
+NPY_HEADER_SIZE = 128
+
+# array name -> NumPy dtype of its values
+ARRAYS: Dict[str, str] = {
+    "planes": "|u1",
+    "masks": "|u1",
+    "moves": "<i2",
+    "outcomes": "|i1",
+}
+
+
+def item_shape(name: str, size: int) -> Tuple[int, ...]:
+    """Returns the shape of one position in the array `name` for a board size."""
+    if name == "planes":
+        return (len(MARK_CODES) + 1, size, size)
+    if name == "masks":
+        return (size * size,)
+    return ()
+
+
+def npy_header(dtype: str, shape: Tuple[int, ...]) -> bytes:
+    """Returns the header of a C-ordered `.npy` file, `NPY_HEADER_SIZE` long."""
+    header = repr({"descr": dtype, "fortran_order": False, "shape": shape})
+    padding = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"shape {shape} does not fit the .npy header")
+    header = header + " " * padding + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def read_npy_header(path: str) -> Tuple[str, Tuple[int, ...], int]:
+    """Returns the dtype, shape and data offset of a `.npy` file."""
+    with open(path, "rb") as npy:
+        prefix = npy.read(len(NPY_MAGIC) + 2)
+        if prefix[:6] != NPY_MAGIC[:6]:
+            raise ValueError(f"{path} is not a .npy file")
+        (length,) = struct.unpack("<H", prefix[-2:])
+        header = ast.literal_eval(npy.read(length).decode("latin1"))
+    return header["descr"], header["shape"], len(prefix) + length
+
+
+class NpyChunk:
+    """One `.npy` file of fixed capacity, written in place through `mmap`.
+
+    The file is allocated for `capacity` positions up front; `close` shrinks
+    it to the positions actually written, so every chunk on disk is a valid
+    array that NumPy can load with `numpy.load(path, mmap_mode="r")`.
+
+    Attributes:
+        `path`: path of the file.
+        `count`: number of positions written.
+        `capacity`: number of positions the file was allocated for.
+    """
+
+    path: str = ""
+    count: int = 0
+    capacity: int = 0
+
+    def __init__(
+        self, path: str, dtype: str, shape: Tuple[int, ...], capacity: int
+    ) -> None:
+        self.path = path
+        self.count = 0
+        self.capacity = capacity
+        self._dtype = dtype
+        self._shape = shape
+        # the dtypes used are all "<byte order><kind><item size>"
+        self._item_size = int(dtype[2:])
+        for dimension in shape:
+            self._item_size *= dimension
+        self._file = open(path, "w+b")
+        self._file.truncate(NPY_HEADER_SIZE + capacity * self._item_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._map[:NPY_HEADER_SIZE] = npy_header(dtype, (capacity,) + shape)
+
+    def append(self, data: bytes) -> None:
+        """Writes the raw bytes of one position."""
+        offset = NPY_HEADER_SIZE + self.count * self._item_size
+        self._map[offset : offset + self._item_size] = data
+        self.count += 1
+
+    def close(self) -> None:
+        if self._map.closed:
+            return
+        self._map[:NPY_HEADER_SIZE] = npy_header(
+            self._dtype, (self.count,) + self._shape
+        )
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(NPY_HEADER_SIZE + self.count * self._item_size)
+        self._file.close()
+
+
+class PositionWriter:
+    """Streams the positions of finished games to chunked `.npy` files.
+
+    Every position before a move becomes one sample of four arrays:
+
+    - `planes`, `uint8` of shape `(marks + 1, size, size)`: one plane per
+      mark of `PlayerEnum`, in turn order, set where that mark is, then a
+      plane set everywhere when the first player is to move.
+    - `masks`, `uint8` of shape `(size * size,)`: legal moves, the empty cells.
+    - `moves`, `int16`: flat index of the move played.
+    - `outcomes`, `int8`: 1 if the side to move went on to win, -1 if it lost,
+      0 for a draw.
+
+    Samples are written through memory maps to `<name>-<chunk>.npy` files of
+    `chunk_size` positions each, so memory use does not grow with the size
+    of the dataset.
+
+    Attributes:
+        `directory`: directory the chunks are written to.
+        `size`: board size of every game.
+        `chunk_size`: number of positions per chunk file.
+        `positions`: number of positions written.
+        `chunks`: number of chunk files started, per array.
+    """
+
+    directory: str = ""
+    size: int = 3
+    chunk_size: int = settings.DATASET_CHUNK_SIZE
+    positions: int = 0
+    chunks: int = 0
+
+    def __init__(
+        self,
+        directory: str,
+        size: int,
+        chunk_size: int = settings.DATASET_CHUNK_SIZE,
+    ) -> None:
+        self.directory = directory
+        self.size = size
+        self.chunk_size = chunk_size
+        self.positions = 0
+        self.chunks = 0
+        self._open: Dict[str, NpyChunk] = {}
+        self._board = Board(size, verbose=False)
+        os.makedirs(directory, exist_ok=True)
+
+    def add_game(self, game: GameRecord) -> None:
+        """Writes every position of `game`, which must be of the writer's size."""
+        if game.board_size != self.size:
+            raise ValueError(
+                f"game of size {game.board_size} in a dataset of size {self.size}"
+            )
+        board = self._board
+        board.reset()
+        winner = self._winning_code(game)
+        for move in game.moves:
+            code = side_to_move(board)
+            if winner is None:
+                outcome = 0
+            else:
+                outcome = 1 if winner == code else -1
+            self.add_position(board, move, outcome)
+            board.place(move, code)
+
+    def add_position(self, board: Board, move: int, outcome: int) -> None:
+        """Writes one sample: `board`, the `move` played and the `outcome`."""
+        if not self._open or self._open["planes"].count == self.chunk_size:
+            self._start_chunk()
+        cells = board.cells
+        planes = b"".join(bytes(c == code for c in cells) for code in MARK_CODES)
+        to_move = side_to_move(board) == MARK_CODES[0]
+        chunks = self._open
+        chunks["planes"].append(planes + bytes([to_move]) * len(cells))
+        chunks["masks"].append(bytes(c == BLANK_CODE for c in cells))
+        chunks["moves"].append(struct.pack("<h", move))
+        chunks["outcomes"].append(struct.pack("b", outcome))
+        self.positions += 1
+
+    def close(self) -> None:
+        for chunk in self._open.values():
+            chunk.close()
+        self._open = {}
+
+    def _start_chunk(self) -> None:
+        self.close()
+        for name, dtype in ARRAYS.items():
+            path = os.path.join(self.directory, f"{name}-{self.chunks:05d}.npy")
+            shape = item_shape(name, self.size)
+            self._open[name] = NpyChunk(path, dtype, shape, self.chunk_size)
+        self.chunks += 1
+
+    @staticmethod
+    def _winning_code(game: GameRecord) -> Optional[int]:
+        """Returns the mark byte code of the winner of `game`, if any."""
+        if game.outcome != GameState.WIN.value:
+            return None
+        for name, mark in game.players:
+            if name == game.winner:
+                return ord(mark)
+        return None
+
+    def __enter__(self) -> "PositionWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    from game.tournament import Entrant, Tournament
+
+    # two entrants play both colours of every pairing
+    selfplay = Tournament(
+        [Entrant("first", args.depth), Entrant("second", args.depth)],
+        args.size,
+        rounds=(args.games + 1) // 2,
+        opening_plies=args.opening_plies,
+    )
+    with PositionWriter(args.directory, args.size, args.chunk_size) as writer:
+        for game in selfplay.run(args.workers):
+            writer.add_game(game)
+    print(
+        f"{writer.positions} positions of {selfplay.games_played} games in "
+        f"{writer.chunks} chunks, {selfplay.games_per_second:,.1f} games/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export self-play positions as .npy training data"
+    )
+    parser.add_argument("directory")
+    parser.add_argument("--size", type=int, choices=settings.ALLOWED_SIZE, default=4)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=settings.DATASET_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.TOURNAMENT_WORKERS)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_main(args, main, args)
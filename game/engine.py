@@ -0,0 +1,125 @@
+"""Reference engine speaking the line-based engine protocol.
+
+The controller and the engine exchange one command per line over the
+engine's stdin and stdout, in the spirit of UCI. Cells are flat 0-based
+row-major indices, and the first move of a game is always the first
+player's.
+
+Controller to engine:
+  `tttp`: start of the session, answered by `id name <name>` then `tttpok`.
+  `isready`: answered by `readyok` once every previous command is processed.
+  `newgame <size> <win_length>`: a new game on an empty board.
+  `position [moves <cell> ...]`: the position after the given moves.
+  `go [movetime <ms>]`: search the position for about `ms` milliseconds,
+    answered by any number of `info ...` lines then `bestmove <cell>`.
+  `quit`: end of the session.
+
+Engines answer commands they cannot handle with `error <reason>` and keep
+going; after a rejected `position`, `go` is an error until the next valid
+`position` or `newgame`. Commands need not wait for replies, so a controller can send
+`position` and `go` in one write.
+"""
+
+import sys
+from typing import List, Optional, TextIO
+
+import config as settings
+from game.models import BLANK_CODE, Board
+from game.search import Searcher, side_to_move
+from game.ttable import NO_MOVE
+
+PROTOCOL = "tttp"
+NAME = "tictactoe-negamax"
+
+
+def set_position(board: Board, args: List[str]) -> Optional[str]:
+    """Plays the moves of a `position` command on `board`, reset first.
+
+    Returns:
+      The reason the command is invalid, if it is, leaving `board` partly
+      played.
+    """
+    board.reset()
+    if args[:1] not in ([], ["moves"]):
+        return f"error invalid position {' '.join(args)}"
+    for cell in args[1:]:
+        if not cell.isdigit() or int(cell) >= len(board.cells):
+            return f"error invalid cell {cell}"
+        if board.cells[int(cell)] != BLANK_CODE:
+            return f"error cell {cell} already taken"
+        if board.moves and board.is_winning_cell(board.moves[-1]):
+            return f"error move {cell} after the end of the game"
+        board.place(int(cell), side_to_move(board))
+    return None
+
+
+def parse_movetime(args: List[str]) -> Optional[float]:
+    """Returns the budget of a `go` command in seconds, `None` if invalid."""
+    if not args:
+        return settings.BOT_TIME_BUDGET
+    if len(args) == 2 and args[0] == "movetime" and args[1].isdigit():
+        return int(args[1]) / 1000
+    return None
+
+
+def run_engine(stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout) -> None:
+    """Answers protocol commands read from `stdin` until `quit` or end of input."""
+    searcher = Searcher()
+    board: Optional[Board] = None
+    # whether `board` holds a valid position, false after a rejected one
+    positioned = False
+
+    def reply(line: str) -> None:
+        stdout.write(line + "\n")
+        stdout.flush()
+
+    for line in stdin:
+        command, *args = line.split() or [""]
+        if command == PROTOCOL:
+            reply(f"id name {NAME}")
+            reply(f"{PROTOCOL}ok")
+        elif command == "isready":
+            reply("readyok")
+        elif command == "newgame":
+            board = None
+            if args not in (
+                [str(size), str(settings.WIN_LENGTH)] for size in settings.ALLOWED_SIZE
+            ):
+                reply(f"error unsupported game {' '.join(args)}")
+                continue
+            board = Board(int(args[0]), verbose=False)
+            positioned = True
+        elif command in ("position", "go") and board is None:
+            reply("error no game")
+        elif command == "position":
+            error = set_position(board, args)
+            positioned = error is None
+            if error is not None:
+                reply(error)
+        elif command == "go":
+            budget = parse_movetime(args)
+            if budget is None:
+                reply(f"error invalid go {' '.join(args)}")
+                continue
+            if not positioned:
+                reply("error no valid position")
+                continue
+            moves = board.moves
+            if not board.empty_cells() or (moves and board.is_winning_cell(moves[-1])):
+                reply("error game over")
+                continue
+            result = searcher.search_timed(board, budget)
+            move = result.move if result.move != NO_MOVE else board.empty_cells()[0]
+            reply(
+                f"info depth {result.depth} score {result.score} "
+                f"nodes {result.nodes} nps {result.nodes_per_second:.0f}"
+            )
+            reply(f"bestmove {move}")
+        elif command == "quit":
+            break
+        elif command:
+            reply(f"error unknown command {command}")
+
+
+if __name__ == "__main__":
+    run_engine()
@@ -30,3 +30,15 @@ class PositionDoesNotExist(GameError):
 
 class GameOver(GameError):
     message: str = settings.END_GAME_TEXT
+
+
+class Forfeit(GameError):
+    message: str = "{name} forfeits: {reason}"
+
+
+class EngineError(GameError):
+    message: str = "Engine {name} failed: {reason}"
+
+
+class EngineTimeout(EngineError):
+    message: str = "Engine {name} did not reply within {timeout:.1f} seconds"
@@ -0,0 +1,174 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import config as settings
+from game.models import MARK_CODES, Board
+from game.search import side_to_move
+
+# sentinel asking the batching thread to stop
+_CLOSE = object()
+
+# scores a list of positions at once, each for its side to move
+BatchFunction = Callable[[Sequence[Board]], Sequence[int]]
+
+
+def window_scores(boards: Sequence[Board]) -> List[int]:
+    """Batch function returning `Board.window_score` for each side to move."""
+    first = MARK_CODES[0]
+    return [
+        board.window_score if side_to_move(board) == first else -board.window_score
+        for board in boards
+    ]
+
+
+class BatchEvaluator:
+    """Scores positions submitted from many threads or coroutines in batches.
+
+    Each submitted position waits in a queue. A background thread takes the
+    first waiting position, gathers more until it holds `max_batch` of them
+    or `max_wait` seconds have passed, and scores the batch with a single
+    call of `evaluate_batch`, such as a vectorized NumPy model. The Python
+    overhead of the evaluation is then paid once per batch, not per position.
+
+    A submitted board is read while the batch is evaluated, so it must not
+    change until its result is ready; `evaluate` blocks until then, which is
+    what a searcher calling it at its leaves needs.
+
+    Attributes:
+        `evaluate_batch`: function scoring a list of positions.
+        `max_batch`: maximum number of positions per batch.
+        `max_wait`: longest time a batch waits to fill up, in seconds.
+        `batches`: number of batches evaluated.
+        `positions`: number of positions evaluated.
+        `batch_sizes`: number of batches of each size.
+        `total_latency`: sum over positions of the time from submission to
+            result, in seconds.
+        `max_latency`: longest time from submission to result, in seconds.
+    """
+
+    evaluate_batch: BatchFunction
+    max_batch: int = settings.EVAL_MAX_BATCH
+    max_wait: float = settings.EVAL_MAX_WAIT
+    batches: int = 0
+    positions: int = 0
+    batch_sizes: Dict[int, int] = {}
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def __init__(
+        self,
+        evaluate_batch: BatchFunction = window_scores,
+        max_batch: int = settings.EVAL_MAX_BATCH,
+        max_wait: float = settings.EVAL_MAX_WAIT,
+    ) -> None:
+        self.evaluate_batch = evaluate_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.positions = 0
+        self.batch_sizes = {}
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        # guards `_closed`, so that nothing is queued after the close sentinel
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.positions / self.batches if self.batches else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.positions if self.positions else 0.0
+
+    def submit(self, board: Board) -> "Future[int]":
+        """Queues `board` for scoring, returning the future of its score.
+
+        Raises `RuntimeError` once the evaluator is closed.
+        """
+        future: "Future[int]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot evaluate positions after close")
+            self._queue.put((board, future, time.perf_counter()))
+        return future
+
+    def evaluate(self, board: Board) -> int:
+        """Returns the score of `board` for the side to move, once its batch ran."""
+        return self.submit(board).result()
+
+    async def evaluate_async(self, board: Board) -> int:
+        """Awaits the score of `board` without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(board))
+
+    def close(self) -> None:
+        """Scores the positions still queued and stops the batching thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def summary(self) -> str:
+        return (
+            f"Batch evaluator: {self.positions} positions in {self.batches} "
+            f"batches (mean size {self.mean_batch_size:.1f}), latency mean "
+            f"{self.mean_latency * 1000:.2f} ms, max {self.max_latency * 1000:.2f} ms"
+        )
+
+    def __enter__(self) -> "BatchEvaluator":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        closing = False
+        while not closing:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            batch: List[Tuple[Board, "Future[int]", float]] = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.perf_counter(), 0)
+                    )
+                except queue.Empty:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+            self._evaluate(batch)
+
+    def _evaluate(self, batch: List[Tuple[Board, "Future[int]", float]]) -> None:
+        try:
+            scores = self.evaluate_batch([board for board, _, _ in batch])
+            if len(scores) != len(batch):
+                raise ValueError(
+                    f"{len(scores)} scores returned for {len(batch)} positions"
+                )
+        except Exception as err:
+            # waiting callers get the error instead of hanging
+            for _, future, _ in batch:
+                future.set_exception(err)
+            return
+        done = time.perf_counter()
+        size = len(batch)
+        self.batches += 1
+        self.positions += size
+        self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+        for _, _, submitted in batch:
+            self.total_latency += done - submitted
+        self.max_latency = max(self.max_latency, done - batch[0][2])
+        for (_, future, _), score in zip(batch, scores):
+            future.set_result(score)
@@ -0,0 +1,232 @@
+import asyncio
+from typing import Any, List, Optional, Sequence
+
+import config as settings
+from game.engine import PROTOCOL
+from game.errors import EngineError, EngineTimeout, Forfeit, GameError
+from game.history import GameRecord
+from game.models import BLANK_CODE, Board, GameState, Player, PlayerEnum
+from game.search import side_to_move
+
+
+class EngineProcess:
+    """Controller side of an engine subprocess, see `game.engine` for the protocol.
+
+    Every method is a coroutine reading the engine's stdout without
+    blocking, so one event loop can drive many engines at once. Commands
+    that need no reply are written together with the next one.
+
+    Attributes:
+        `command`: program and arguments starting the engine.
+        `name`: name announced by the engine, the command until then.
+        `grace`: time allowed on top of the move time for a reply, in seconds.
+        `last_info`: fields of the latest `info` line of the engine.
+    """
+
+    command: List[str] = []
+    name: str = ""
+    grace: float = settings.ENGINE_GRACE
+    last_info: dict = {}
+
+    def __init__(
+        self, command: Sequence[str], grace: float = settings.ENGINE_GRACE
+    ) -> None:
+        self.command = list(command)
+        self.name = " ".join(self.command)
+        self.grace = grace
+        self.last_info = {}
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self) -> None:
+        """Starts the engine and waits for its handshake."""
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        await self._send(PROTOCOL)
+        for line in await self._read_until(f"{PROTOCOL}ok", self.grace):
+            if line.startswith("id name "):
+                self.name = line[len("id name ") :]
+
+    async def new_game(self, size: int, win_length: int = settings.WIN_LENGTH) -> None:
+        await self._send(f"newgame {size} {win_length}", "isready")
+        await self._read_until("readyok", self.grace)
+
+    async def best_move(
+        self, moves: Sequence[int], movetime: float = settings.ENGINE_MOVETIME
+    ) -> int:
+        """Asks the engine for its move after `moves`, within `movetime` seconds.
+
+        Raises `EngineTimeout` if the engine does not answer in time, and
+        `EngineError` if it reports an error or its answer is unreadable.
+        """
+        position = "position"
+        if moves:
+            position += " moves " + " ".join(map(str, moves))
+        await self._send(position, f"go movetime {int(movetime * 1000)}")
+        lines = await self._read_until("bestmove", movetime + self.grace)
+        for line in lines:
+            if line.startswith("info "):
+                fields = line.split()[1:]
+                self.last_info = dict(zip(fields[::2], fields[1::2]))
+        try:
+            return int(lines[-1].split()[1])
+        except (IndexError, ValueError):
+            raise EngineError(
+                message=EngineError.message.format(
+                    name=self.name, reason=f"unreadable reply {lines[-1]!r}"
+                )
+            )
+
+    async def quit(self, timeout: float = settings.ENGINE_GRACE) -> None:
+        """Asks the engine to stop, killing it if it does not within `timeout`."""
+        if self._process is None:
+            return
+        try:
+            await self._send("quit")
+            await asyncio.wait_for(self._process.wait(), timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            self._process.kill()
+            await self._process.wait()
+        self._process = None
+
+    async def _send(self, *lines: str) -> None:
+        self._process.stdin.write("".join(f"{line}\n" for line in lines).encode())
+        await self._process.stdin.drain()
+
+    async def _read_until(self, keyword: str, timeout: float) -> List[str]:
+        """Returns the lines read up to the one starting with `keyword`."""
+        try:
+            return await asyncio.wait_for(self._read_lines(keyword), timeout)
+        except asyncio.TimeoutError:
+            raise EngineTimeout(
+                message=EngineTimeout.message.format(name=self.name, timeout=timeout)
+            )
+
+    async def _read_lines(self, keyword: str) -> List[str]:
+        lines = []
+        while True:
+            raw = await self._process.stdout.readline()
+            if not raw:
+                raise EngineError(
+                    message=EngineError.message.format(
+                        name=self.name, reason="it exited"
+                    )
+                )
+            line = raw.decode().strip()
+            if line.startswith("error "):
+                raise EngineError(
+                    message=EngineError.message.format(
+                        name=self.name, reason=line[len("error ") :]
+                    )
+                )
+            lines.append(line)
+            if line.split(" ", 1)[0] == keyword:
+                return lines
+
+
+class EnginePlayer(Player):
+    """Player relaying the moves of an external engine to the game loop.
+
+    The game loop is synchronous, so each player runs its engine's
+    coroutines on an event loop of its own; use `play_match` to run many
+    engine games concurrently on one loop instead. An engine that times
+    out, fails or plays an illegal move forfeits the game.
+
+    Attributes:
+        `engine`: the engine process.
+        `board`: board of the game being played, set before the game starts.
+        `movetime`: time allowed per move, in seconds.
+    """
+
+    __slots__ = ("engine", "board", "movetime", "_loop")
+
+    engine: EngineProcess
+    board: Optional[Board]
+    movetime: float
+
+    def __init__(
+        self,
+        name: str,
+        mark: str,
+        engine: EngineProcess,
+        board: Optional[Board] = None,
+        movetime: float = settings.ENGINE_MOVETIME,
+    ) -> None:
+        super().__init__(name, mark)
+        self.engine = engine
+        self.board = board
+        self.movetime = movetime
+        self._loop = asyncio.new_event_loop()
+
+    def start(self) -> None:
+        """Starts the engine and a new game on `board`."""
+        self._loop.run_until_complete(self.engine.start())
+        self._loop.run_until_complete(self.engine.new_game(self.board.size))
+
+    def close(self) -> None:
+        self._loop.run_until_complete(self.engine.quit())
+        self._loop.close()
+
+    def ask_for_input(self) -> str:
+        try:
+            move = self._loop.run_until_complete(
+                self.engine.best_move(list(self.board.moves), self.movetime)
+            )
+        except EngineError as err:
+            raise Forfeit(
+                message=Forfeit.message.format(name=self.name, reason=err.message)
+            )
+        size = self.board.size
+        return f"{move // size + 1},{move % size + 1}"
+
+    def retry_input(self, error: GameError, **kwargs: Any) -> str:
+        # engines are deterministic enough that a rejected move would repeat
+        raise Forfeit(
+            message=Forfeit.message.format(
+                name=self.name, reason="it played an illegal move"
+            )
+        )
+
+
+async def play_match(
+    engines: Sequence[EngineProcess],
+    size: int,
+    movetime: float = settings.ENGINE_MOVETIME,
+) -> GameRecord:
+    """Plays one game between started engines, in turn order.
+
+    An engine that times out, fails or plays an illegal move loses the game.
+    Run many matches concurrently with `asyncio.gather`.
+
+    Players are recorded under their engine names, suffixed with their seat
+    number when several engines share a name, such as an engine playing a
+    copy of itself.
+    """
+    marks = PlayerEnum.list_marks()
+    names = [engine.name for engine in engines]
+    names = [
+        f"{name} #{seat + 1}" if names.count(name) > 1 else name
+        for seat, name in enumerate(names)
+    ]
+    players = list(zip(names, marks))
+    for engine in engines:
+        await engine.new_game(size)
+    board = Board(size, verbose=False)
+    while True:
+        turn = board.move_count % len(engines)
+        try:
+            move = await engines[turn].best_move(list(board.moves), movetime)
+        except EngineError:
+            move = -1
+        if not 0 <= move < size * size or board.cells[move] != BLANK_CODE:
+            winner = names[(turn + 1) % len(engines)]
+            return GameRecord(size, players, board.moves, GameState.WIN.value, winner)
+        board.place(move, side_to_move(board))
+        if board.is_winning_cell(move):
+            return GameRecord(
+                size, players, board.moves, GameState.WIN.value, names[turn]
+            )
+        if not board.empty_cells():
+            return GameRecord(size, players, board.moves, GameState.DRAW.value)
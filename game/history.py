@@ -0,0 +1,392 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import config as settings
+from game.models import Board, BoardSnapshot, GameState, Player
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    board_size INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    winner_id INTEGER REFERENCES players (id),
+    played_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS game_players (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    seat INTEGER NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    mark TEXT NOT NULL,
+    PRIMARY KEY (game_id, seat)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ply INTEGER NOT NULL,
+    cell INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ply INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_board_size ON games (board_size);
+CREATE INDEX IF NOT EXISTS games_outcome ON games (outcome);
+CREATE INDEX IF NOT EXISTS games_winner_id ON games (winner_id);
+CREATE INDEX IF NOT EXISTS game_players_player_id ON game_players (player_id);
+"""
+
+# sentinel asking the writer thread to stop
+_CLOSE = object()
+
+
+class GameRecord:
+    """A finished game, as stored in the history.
+
+    Attributes:
+        `board_size`: length and breadth of the game board.
+        `players`: `(name, mark)` of each player, in turn order.
+        `moves`: flat cell indices, in the order they were played.
+        `outcome`: final `GameState` value of the board.
+        `winner`: name of the winner, if any.
+        `played_at`: UNIX timestamp of the end of the game.
+        `snapshots`: positions of the game every few moves, by number of
+            moves played, see `take_snapshots`.
+    """
+
+    board_size: int = 0
+    players: List[Tuple[str, str]] = []
+    moves: List[int] = []
+    outcome: str = GameState.LIVE.value
+    winner: Optional[str] = None
+    played_at: float = 0.0
+    snapshots: Dict[int, BoardSnapshot] = {}
+
+    def __init__(
+        self,
+        board_size: int,
+        players: List[Tuple[str, str]],
+        moves: Sequence[int],
+        outcome: str,
+        winner: Optional[str] = None,
+        played_at: Optional[float] = None,
+        snapshots: Optional[Dict[int, BoardSnapshot]] = None,
+    ) -> None:
+        self.board_size = board_size
+        self.players = players
+        self.moves = list(moves)
+        self.outcome = outcome
+        self.winner = winner
+        self.played_at = time.time() if played_at is None else played_at
+        self.snapshots = snapshots if snapshots is not None else {}
+
+    def take_snapshots(self, interval: int = settings.SNAPSHOT_INTERVAL) -> None:
+        """Replays the game once, keeping its position every `interval` moves."""
+        board = Board(self.board_size, verbose=False)
+        self.snapshots = {}
+        for ply in range(interval, len(self.moves) + 1, interval):
+            self._replay(board, ply)
+            self.snapshots[ply] = board.snapshot()
+
+    def position_at(self, ply: int, board: Optional[Board] = None) -> Board:
+        """Returns the position after the first `ply` moves of the game.
+
+        The position is restored from the nearest snapshot at or before
+        `ply`, so only the moves after it are replayed, onto `board` if given.
+        The board is silent, and its `state` is that of the position.
+        """
+        if not 0 <= ply <= len(self.moves):
+            raise IndexError(f"move {ply} out of range of {len(self.moves)} moves")
+        if board is None:
+            board = Board(self.board_size, verbose=False)
+        start = max((p for p in self.snapshots if p <= ply), default=0)
+        if start:
+            board.restore(self.snapshots[start])
+        else:
+            board.reset()
+        self._replay(board, ply)
+        board.state = GameState.LIVE
+        if ply and board.is_winning_cell(self.moves[ply - 1]):
+            board.state = GameState.WIN
+        elif ply == len(board.cells):
+            board.state = GameState.DRAW
+        return board
+
+    def _replay(self, board: Board, ply: int) -> None:
+        """Plays the moves of the game after those on `board`, up to `ply`."""
+        marks = [ord(mark) for _, mark in self.players]
+        for index in range(board.move_count, ply):
+            board.place(self.moves[index], marks[index % len(marks)])
+
+    @classmethod
+    def from_board(
+        cls, board: Board, players: List[Player], winner: Optional[Player]
+    ) -> "GameRecord":
+        """Builds the record of a game that just ended on `board`.
+
+        `players` may be in any rotation; they are stored in the order their
+        marks were first played.
+        """
+        first_mark = chr(board.cells[board.moves[0]]) if board.moves else None
+        while first_mark is not None and players[0].mark != first_mark:
+            players = Player.rotate_players(players)
+        return cls(
+            board_size=board.size,
+            players=[(player.name, player.mark) for player in players],
+            moves=board.moves,
+            outcome=board.state.value,
+            winner=winner.name if winner is not None else None,
+        )
+
+
+class HistoryStore:
+    """SQLite-backed store of finished games.
+
+    `record` only enqueues the game; a background writer thread owns the
+    write connection and inserts queued games in batches of up to
+    `batch_size`, one transaction per batch, with the database in WAL mode so
+    readers never wait on it.
+
+    Attributes:
+        `path`: path of the SQLite database file.
+        `batch_size`: maximum number of games written per transaction.
+        `failed`: number of games that could not be written.
+        `last_error`: most recent error of the writer thread, such as a
+            database error or an invalid move of a game.
+    """
+
+    path: str = settings.HISTORY_PATH
+    batch_size: int = settings.HISTORY_BATCH_SIZE
+    failed: int = 0
+    last_error: Optional[Exception] = None
+
+    def __init__(
+        self,
+        path: str = settings.HISTORY_PATH,
+        batch_size: int = settings.HISTORY_BATCH_SIZE,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.failed = 0
+        self.last_error = None
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._player_ids: Dict[str, int] = {}
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+        self._reader = self._connect()
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._writer.start()
+
+    def record(self, game: GameRecord) -> None:
+        """Queues `game` for writing, without waiting for the database."""
+        self._queue.put(game)
+
+    def flush(self) -> None:
+        """Blocks until every queued game has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Writes the remaining queued games and stops the writer thread."""
+        self._queue.put(_CLOSE)
+        self._writer.join()
+        self._reader.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def count_games(
+        self, board_size: Optional[int] = None, outcome: Optional[str] = None
+    ) -> int:
+        query = "SELECT COUNT(*) FROM games WHERE 1 = 1"
+        params: List[object] = []
+        if board_size is not None:
+            query += " AND board_size = ?"
+            params.append(board_size)
+        if outcome is not None:
+            query += " AND outcome = ?"
+            params.append(outcome)
+        return self._reader.execute(query, params).fetchone()[0]
+
+    def leaderboard(
+        self, board_size: Optional[int] = None, limit: int = 10
+    ) -> List[Tuple[str, int, int]]:
+        """Returns `(name, wins, games played)` of the players with most wins."""
+        size_filter = "" if board_size is None else "WHERE g.board_size = ?"
+        params: List[object] = [] if board_size is None else [board_size]
+        rows = self._reader.execute(
+            f"""
+            SELECT p.name,
+                   SUM(CASE WHEN g.winner_id = p.id THEN 1 ELSE 0 END) AS wins,
+                   COUNT(*) AS played
+            FROM game_players gp
+            JOIN players p ON p.id = gp.player_id
+            JOIN games g ON g.id = gp.game_id
+            {size_filter}
+            GROUP BY p.id
+            ORDER BY wins DESC, played ASC, p.name ASC
+            LIMIT ?
+            """,
+            params + [limit],
+        )
+        return rows.fetchall()
+
+    def player_history(self, name: str, limit: int = 20) -> List[GameRecord]:
+        """Returns the most recent games of player `name`, newest first."""
+        game_rows = self._reader.execute(
+            """
+            SELECT g.id, g.board_size, g.outcome, w.name, g.played_at
+            FROM players p
+            JOIN game_players gp ON gp.player_id = p.id
+            JOIN games g ON g.id = gp.game_id
+            LEFT JOIN players w ON w.id = g.winner_id
+            WHERE p.name = ?
+            ORDER BY g.played_at DESC, g.id DESC
+            LIMIT ?
+            """,
+            (name, limit),
+        ).fetchall()
+        return [self._load_game(*row) for row in game_rows]
+
+    def _load_game(
+        self,
+        game_id: int,
+        board_size: int,
+        outcome: str,
+        winner: Optional[str],
+        played_at: float,
+    ) -> GameRecord:
+        players = self._reader.execute(
+            """
+            SELECT p.name, gp.mark FROM game_players gp
+            JOIN players p ON p.id = gp.player_id
+            WHERE gp.game_id = ? ORDER BY gp.seat
+            """,
+            (game_id,),
+        ).fetchall()
+        moves = self._reader.execute(
+            "SELECT cell FROM moves WHERE game_id = ? ORDER BY ply", (game_id,)
+        ).fetchall()
+        snapshots = self._reader.execute(
+            "SELECT ply, data FROM snapshots WHERE game_id = ?", (game_id,)
+        ).fetchall()
+        return GameRecord(
+            board_size,
+            [tuple(row) for row in players],
+            [cell for (cell,) in moves],
+            outcome,
+            winner,
+            played_at,
+            {ply: BoardSnapshot.from_bytes(data) for ply, data in snapshots},
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _run_writer(self) -> None:
+        connection = self._connect()
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _CLOSE:
+                closing = True
+            games = [game for game in batch if game is not _CLOSE]
+            try:
+                if games:
+                    self._write(connection, games)
+            except Exception as err:
+                # keep the writer alive, so `record` callers are never blocked
+                self.failed += len(games)
+                self.last_error = err
+                # player ids cached during the rolled back transaction are void
+                self._player_ids.clear()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, games: List[GameRecord]) -> None:
+        connection.execute("BEGIN")
+        try:
+            player_ids = self._get_player_ids(connection, games)
+            game_players = []
+            moves = []
+            snapshots = []
+            for game in games:
+                cursor = connection.execute(
+                    "INSERT INTO games (board_size, outcome, winner_id, played_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        game.board_size,
+                        game.outcome,
+                        player_ids.get(game.winner),
+                        game.played_at,
+                    ),
+                )
+                game_id = cursor.lastrowid
+                game_players.extend(
+                    (game_id, seat, player_ids[name], mark)
+                    for seat, (name, mark) in enumerate(game.players)
+                )
+                moves.extend(
+                    (game_id, ply, cell) for ply, cell in enumerate(game.moves)
+                )
+                if not game.snapshots:
+                    game.take_snapshots()
+                snapshots.extend(
+                    (game_id, ply, snapshot.to_bytes())
+                    for ply, snapshot in game.snapshots.items()
+                )
+            connection.executemany(
+                "INSERT INTO game_players (game_id, seat, player_id, mark) "
+                "VALUES (?, ?, ?, ?)",
+                game_players,
+            )
+            connection.executemany(
+                "INSERT INTO moves (game_id, ply, cell) VALUES (?, ?, ?)", moves
+            )
+            connection.executemany(
+                "INSERT INTO snapshots (game_id, ply, data) VALUES (?, ?, ?)",
+                snapshots,
+            )
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _get_player_ids(
+        self, connection: sqlite3.Connection, games: List[GameRecord]
+    ) -> Dict[str, int]:
+        """Returns the id of every player of `games`, inserting new players."""
+        names = {name for game in games for name, _ in game.players}
+        missing = [name for name in names if name not in self._player_ids]
+        if missing:
+            connection.executemany(
+                "INSERT OR IGNORE INTO players (name) VALUES (?)",
+                [(name,) for name in missing],
+            )
+            for name in missing:
+                (player_id,) = connection.execute(
+                    "SELECT id FROM players WHERE name = ?", (name,)
+                ).fetchone()
+                self._player_ids[name] = player_id
+        return self._player_ids
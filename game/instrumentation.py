@@ -0,0 +1,165 @@
+import functools
+import json
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PhaseHistogram:
+    """Latency histogram of a single game phase.
+
+    Samples are bucketed by powers of two in microseconds, so recording is a
+    handful of integer operations and the memory used does not grow with the
+    number of samples.
+
+    Attributes:
+        `count`: number of recorded samples.
+        `total_ns`: sum of all samples, in nanoseconds.
+        `min_ns`: fastest sample, in nanoseconds.
+        `max_ns`: slowest sample, in nanoseconds.
+        `buckets`: sample count per bucket, bucket `k` holds samples below `2**k` µs.
+    """
+
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+    buckets: List[int] = []
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = []
+
+    def record(self, elapsed_ns: int) -> None:
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        bucket = (elapsed_ns // 1000).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def percentile_us(self, percentile: float) -> int:
+        """Returns the upper bound, in µs, of the bucket holding `percentile`."""
+        if self.count == 0:
+            return 0
+        target = self.count * percentile / 100
+        seen = 0
+        for bucket, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return 2**bucket
+        return 2 ** len(self.buckets)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_us": self.total_ns / 1000,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0,
+            "min_us": self.min_ns / 1000,
+            "max_us": self.max_ns / 1000,
+            "p50_us": self.percentile_us(50),
+            "p95_us": self.percentile_us(95),
+            "p99_us": self.percentile_us(99),
+            "buckets": list(self.buckets),
+        }
+
+
+class Instrumentation:
+    """Collects per-phase latency histograms and event counters.
+
+    Disabled by default; while disabled, instrumented functions only pay for
+    a single attribute lookup before calling through.
+
+    Attributes:
+        `enabled`: whether samples are currently being recorded.
+        `phases`: latency histogram per phase name.
+        `counters`: event count per counter name.
+    """
+
+    enabled: bool = False
+    phases: Dict[str, PhaseHistogram] = {}
+    counters: Dict[str, int] = {}
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.phases = {}
+        self.counters = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self.phases = {}
+        self.counters = {}
+
+    def record(self, phase: str, elapsed_ns: int) -> None:
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = PhaseHistogram()
+        histogram.record(elapsed_ns)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {name: hist.to_dict() for name, hist in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary(self) -> str:
+        """Formats recorded phases and counters as a plain-text table."""
+        lines = [
+            f"{'phase':<16}{'count':>8}{'mean µs':>12}{'p95 µs':>10}{'max µs':>12}"
+        ]
+        for name, hist in sorted(self.phases.items()):
+            stats = hist.to_dict()
+            lines.append(
+                f"{name:<16}{stats['count']:>8}{stats['mean_us']:>12.1f}"
+                f"{stats['p95_us']:>10}{stats['max_us']:>12.1f}"
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<16}{value:>8}")
+        return "\n".join(lines)
+
+    def export(self, path: str) -> None:
+        """Writes recorded phases and counters to `path` as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+metrics = Instrumentation()
+
+
+def timed(phase: str, recorder: Optional[Instrumentation] = None) -> Callable:
+    """Decorator recording the latency of each call under `phase`.
+
+    Calls that raise are recorded as well, since `GameError`s are part of the
+    regular control flow of the game loop.
+    """
+    recorder = recorder or metrics
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(phase, perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,72 @@
+import contextlib
+import io
+import sys
+from enum import Enum
+from typing import Any, Dict, List
+
+import config as settings
+from game.models import Board, GameState, Player
+from game.tables import BoardTables
+
+
+class ListOfListsBoard:
+    """Previous `Board` layout, kept only as the baseline of `memory_report`.
+
+    Instances carry a `__dict__` and store the grid as one list of mark
+    strings per row.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.state = GameState.LIVE
+        self.size = size
+        self.grid = [[settings.BLANK] * size for _ in range(size)]
+        self.current_player = None
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Returns the number of bytes owned by `obj` and its containers.
+
+    Interned strings, small ints, enum members, players and `BoardTables` are
+    shared between boards, so they are not attributed to any single one.
+    """
+    if obj is None or isinstance(obj, (str, Enum, Player, BoardTables)):
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj))
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += deep_sizeof(getattr(obj, slot, None))
+    return size
+
+
+def memory_report(sizes: List[int] = settings.ALLOWED_SIZE) -> List[Dict[str, int]]:
+    """Measures bytes per board for the previous and current layouts."""
+    report = []
+    for size in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            board = Board(size)
+        before = deep_sizeof(ListOfListsBoard(size))
+        after = deep_sizeof(board)
+        report.append({"size": size, "before": before, "after": after})
+    return report
+
+
+def format_memory_report(report: List[Dict[str, int]]) -> str:
+    lines = [f"{'board':<8}{'before':>10}{'after':>10}{'saved':>8}"]
+    for row in report:
+        saved = 1 - row["after"] / row["before"]
+        lines.append(
+            f"{row['size']}x{row['size']:<6}{row['before']:>10}{row['after']:>10}"
+            f"{saved:>8.0%}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_memory_report(memory_report()))
@@ -1,8 +1,16 @@
+import struct
+from array import array
 from enum import Enum
-from typing import List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
 
 import config as settings
 from game.errors import PositionAlreadyTaken, PositionDoesNotExist, GameOver, GameError
+from game.instrumentation import timed
+from game.render import FrameRenderer
+from game.tables import BoardTables
+
+BLANK_CODE = ord(settings.BLANK)
 
 
 class GameState(str, Enum):
@@ -42,9 +50,53 @@ class PlayerEnum(str, Enum):
         return list(map(lambda c: c.name, cls))
 
 
+MARK_CODES = tuple(ord(mark) for mark in PlayerEnum.list_marks())
+# mark byte code of the player moving after each player
+NEXT_CODES = {
+    code: MARK_CODES[(i + 1) % len(MARK_CODES)] for i, code in enumerate(MARK_CODES)
+}
+PLAYER_MARKS = frozenset(
+    PlayerEnum.list_marks() + [ord(mark) for mark in PlayerEnum.list_marks()]
+)
+
+
+@lru_cache(maxsize=None)
+def _forward_diagonal_slices(size: int) -> Tuple[slice, ...]:
+    """Slices of a flat `size` x `size` buffer along forward diagonals.
+
+    The `p`-th diagonal holds cells `(p - q, q)`, i.e. flat indices stepping
+    back by `size - 1` from its bottom-left cell.
+    """
+    slices = []
+    for p in range(2 * size - 1):
+        q_start, q_stop = max(p - size + 1, 0), min(p + 1, size)
+        start = (p - q_start) * size + q_start
+        stop = start - (q_stop - q_start) * (size - 1)
+        slices.append(slice(start, stop if stop >= 0 else None, 1 - size))
+    return tuple(slices)
+
+
+@lru_cache(maxsize=None)
+def _backward_diagonal_slices(size: int) -> Tuple[slice, ...]:
+    """Slices of a flat `size` x `size` buffer along backward diagonals.
+
+    The `p`-th diagonal holds cells `(size - p + q - 1, q)`, i.e. flat indices
+    stepping forward by `size + 1` from its top-left cell.
+    """
+    slices = []
+    for p in range(2 * size - 1):
+        q_start, q_stop = max(p - size + 1, 0), min(p + 1, size)
+        start = (size - p + q_start - 1) * size + q_start
+        stop = start + (q_stop - q_start) * (size + 1)
+        slices.append(slice(start, stop, size + 1))
+    return tuple(slices)
+
+
 class Player:
-    name: str = ""
-    mark: str = ""
+    __slots__ = ("name", "mark")
+
+    name: str
+    mark: str
 
     def __init__(self, name: str, mark: str) -> None:
         self.name = name
@@ -77,39 +129,208 @@ class Player:
         return players[1:] + [players[0]]
 
 
+class BoardSnapshot:
+    """Compact copy of a board position, restored with `Board.restore`.
+
+    Besides the cells, a snapshot keeps the window counters, score, hash and
+    moves of the board, so restoring one is a few buffer copies instead of
+    a replay of every move.
+
+    Attributes:
+        `move_count`: number of marked cells.
+        `position_hash`: Zobrist hash of the cells.
+        `window_score`: `Board.window_score` of the position.
+        `data`: the cells, the window counts of each mark of `MARK_CODES`,
+            then the moves as unsigned 16-bit integers.
+    """
+
+    __slots__ = ("move_count", "position_hash", "window_score", "data")
+
+    # move count, position hash and window score of `to_bytes`
+    HEADER = struct.Struct("<HQi")
+
+    move_count: int
+    position_hash: int
+    window_score: int
+    data: bytes
+
+    def __init__(
+        self, move_count: int, position_hash: int, window_score: int, data: bytes
+    ) -> None:
+        self.move_count = move_count
+        self.position_hash = position_hash
+        self.window_score = window_score
+        self.data = data
+
+    def to_bytes(self) -> bytes:
+        header = self.HEADER.pack(
+            self.move_count, self.position_hash, self.window_score
+        )
+        return header + self.data
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "BoardSnapshot":
+        move_count, position_hash, window_score = cls.HEADER.unpack_from(raw)
+        return cls(move_count, position_hash, window_score, raw[cls.HEADER.size :])
+
+
 class Board:
     """Represents a tic-tac-toe game board.
 
+    The board is stored row-major in a single flat `bytearray`, one byte per
+    cell holding the ASCII code of its mark, so a board costs a fixed handful
+    of bytes per cell instead of a list per row.
+
     Attributes:
         `state`: current state of the game, starts with player 1.
         `size`: length and breadth of the game board.
-        `grid`: nested array representing the current state of the game board.
+        `cells`: flat row-major buffer of cell marks, `size * size` bytes long.
         `current_player`: current player of this turn.
+        `tables`: precomputed lookup tables, shared by all boards of this size.
+        `move_count`: number of marked cells.
+        `position_hash`: Zobrist hash of `cells`.
+        `moves`: flat indices of the cells marked through `set_grid`, in order.
+        `window_counts`: for each mark byte code, the number of its marks in
+            each window of `tables.windows`.
+        `window_score`: heuristic value of the position for the first player,
+            the sum of the `tables.window_weights` of the windows holding only
+            their marks minus those holding only their opponent's.
+        `renderer`: buffered renderer used by `print_grid`, if any.
+        `verbose`: whether setting up the board and moves print the grid.
     """
 
-    state: GameState = GameState.LIVE
-    size: int = 0
-    grid: List[List[str]] = [[]]
-    current_player: Player = None
-
-    def __init__(self, size: int) -> None:
+    __slots__ = (
+        "state",
+        "size",
+        "cells",
+        "current_player",
+        "tables",
+        "move_count",
+        "position_hash",
+        "moves",
+        "window_counts",
+        "window_score",
+        "renderer",
+        "verbose",
+    )
+
+    state: GameState
+    size: int
+    cells: bytearray
+    current_player: Optional[Player]
+    tables: BoardTables
+    move_count: int
+    position_hash: int
+    moves: array
+    window_counts: Dict[int, bytearray]
+    window_score: int
+    renderer: Optional[FrameRenderer]
+    verbose: bool
+
+    def __init__(
+        self,
+        size: int,
+        renderer: Optional[FrameRenderer] = None,
+        verbose: bool = True,
+    ) -> None:
         self._validate_size(size)
+        self.state = GameState.LIVE
         self.size = size
-        print(f"Prepare a {size}x{size} board …")
+        self.current_player = None
+        self.verbose = verbose
+        if verbose:
+            print(f"Prepare a {size}x{size} board …")
         # setting up initial board
-        self.grid = [[settings.BLANK] * size for _ in range(size)]
-        self.print_grid()
+        self.tables = BoardTables.for_size(size)
+        self.cells = bytearray(self.tables.blank_cells)
+        self.move_count = 0
+        self.position_hash = 0
+        self.moves = array("H")
+        self._clear_windows()
+        self.renderer = renderer
+        if verbose:
+            self.print_grid()
+
+    @property
+    def grid(self) -> Tuple[Tuple[str, ...], ...]:
+        """Read-only copy of `cells`, one tuple of marks per row.
+
+        Marking a cell through it, as in `board.grid[i][j] = mark`, raises
+        `TypeError`: assign the whole `grid`, or use `set_grid` or `place`.
+        """
+        text = self.cells.decode("ascii")
+        size = self.size
+        return tuple(tuple(text[i : i + size]) for i in range(0, size * size, size))
+
+    @grid.setter
+    def grid(self, grid: Sequence[Sequence[str]]) -> None:
+        self.size = len(grid)
+        self.cells = bytearray("".join("".join(row) for row in grid), "ascii")
+        self.tables = BoardTables.for_size(self.size)
+        self.move_count = 0
+        self.position_hash = 0
+        self.moves = array("H")
+        self._clear_windows()
+        zobrist = self.tables.zobrist
+        for index, code in enumerate(self.cells):
+            if code in zobrist:
+                self.move_count += 1
+                self.position_hash ^= zobrist[code][index]
+                self._update_windows(index, code, 1)
+
+    def reset(self) -> None:
+        """Clears the board in place for a new game, without printing it.
+
+        `cells` keeps its buffer, so views of it stay valid.
+        """
+        self.cells[:] = self.tables.blank_cells
+        self.state = GameState.LIVE
+        self.current_player = None
+        self.move_count = 0
+        self.position_hash = 0
+        del self.moves[:]
+        for counts in self.window_counts.values():
+            counts[:] = bytes(len(counts))
+        self.window_score = 0
+        if self.renderer is not None:
+            self.renderer.reset()
+
+    def clone(self) -> "Board":
+        """Returns an independent copy of this board, without printing it.
+
+        Only `cells` and the counters are copied; `tables` and `current_player`
+        are shared with the original, and the copy is silent.
+        """
+        board = Board.__new__(Board)
+        board.state = self.state
+        board.size = self.size
+        board.cells = self.cells[:]
+        board.current_player = self.current_player
+        board.tables = self.tables
+        board.move_count = self.move_count
+        board.position_hash = self.position_hash
+        board.moves = array("H", self.moves)
+        board.window_counts = {
+            code: counts[:] for code, counts in self.window_counts.items()
+        }
+        board.window_score = self.window_score
+        board.renderer = None
+        board.verbose = False
+        return board
 
     @classmethod
-    def setup_board(cls):
+    def setup_board(cls, renderer: Optional[FrameRenderer] = None):
         size = input("Enter the board size: ")
-        return cls(int(size))
+        return cls(int(size), renderer=renderer)
 
     def make_move(self, row: int, col: int) -> None:
         self.set_grid(row, col)
-        self.print_grid()
+        if self.verbose:
+            self.print_grid()
         return
 
+    # rendering is timed on its own by `print_grid`
+    @timed("make_move")
     def set_grid(self, row: int, col: int) -> None:
         """Updates `grid` whenever a player moves.
 
@@ -125,12 +346,99 @@ class Board:
         if i >= self.size or j >= self.size:
             raise PositionDoesNotExist
 
-        if self.grid[i][j] != settings.BLANK:
+        index = i * self.size + j
+        if self.cells[index] != BLANK_CODE:
             raise PositionAlreadyTaken
 
-        self.grid[i][j] = self.current_player.mark
+        self.place(index, ord(self.current_player.mark))
         return
 
+    def snapshot(self) -> BoardSnapshot:
+        """Returns a compact copy of the position, see `restore`."""
+        counts = b"".join(self.window_counts[code] for code in MARK_CODES)
+        return BoardSnapshot(
+            self.move_count,
+            self.position_hash,
+            self.window_score,
+            bytes(self.cells) + counts + self.moves.tobytes(),
+        )
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """Sets the position back to `snapshot`, taken on a board of this size.
+
+        `cells` keeps its buffer, so views of it stay valid. Like `place`, it
+        leaves `state` alone.
+        """
+        data = memoryview(snapshot.data)
+        offset = len(self.cells)
+        self.cells[:] = data[:offset]
+        for code in MARK_CODES:
+            counts = self.window_counts[code]
+            counts[:] = data[offset : offset + len(counts)]
+            offset += len(counts)
+        del self.moves[:]
+        self.moves.frombytes(data[offset:])
+        self.move_count = snapshot.move_count
+        self.position_hash = snapshot.position_hash
+        self.window_score = snapshot.window_score
+
+    def place(self, index: int, code: int) -> None:
+        """Marks the cell at flat `index` with mark byte `code`, unchecked."""
+        self.cells[index] = code
+        self.move_count += 1
+        self.position_hash ^= self.tables.zobrist[code][index]
+        self.moves.append(index)
+        self._update_windows(index, code, 1)
+
+    def undo(self) -> int:
+        """Clears the last cell marked by `place` and returns its flat index."""
+        index = self.moves.pop()
+        code = self.cells[index]
+        self.cells[index] = BLANK_CODE
+        self.move_count -= 1
+        self.position_hash ^= self.tables.zobrist[code][index]
+        self._update_windows(index, code, -1)
+        return index
+
+    def empty_cells(self) -> List[int]:
+        """Returns the flat indices of the empty cells, in row-major order."""
+        return [index for index, code in enumerate(self.cells) if code == BLANK_CODE]
+
+    def is_winning_cell(self, index: int) -> bool:
+        """Checks if the mark at flat `index` is part of a winning line."""
+        counts = self.window_counts[self.cells[index]]
+        win_length = self.tables.win_length
+        for w in self.tables.cell_windows[index]:
+            if counts[w] == win_length:
+                return True
+        return False
+
+    def _clear_windows(self) -> None:
+        window_count = len(self.tables.windows)
+        self.window_counts = {code: bytearray(window_count) for code in MARK_CODES}
+        self.window_score = 0
+
+    def _update_windows(self, index: int, code: int, step: int) -> None:
+        """Counts the mark `code` at flat `index` in or out (`step` 1 or -1) of
+        the windows through it, and updates `window_score` to match.
+        """
+        mine = self.window_counts[code]
+        theirs = self.window_counts[NEXT_CODES[code]]
+        weights = self.tables.window_weights
+        score = 0
+        for w in self.tables.cell_windows[index]:
+            # marks of `code` in the window, not counting this one
+            count = mine[w] if step > 0 else mine[w] - 1
+            if not theirs[w]:
+                # the window stays open, and gains or loses a mark
+                score += weights[count + 1] - weights[count]
+            elif not count:
+                # the window of the opponent gets blocked, or unblocked
+                score += weights[theirs[w]]
+            mine[w] = count + 1 if step > 0 else count
+        self.window_score += score * step if code == MARK_CODES[0] else -score * step
+
+    @timed("evaluate_board")
     def evaluate_board(self) -> None:
         """Checks board state to see if there are any winners.
 
@@ -144,37 +452,46 @@ class Board:
             raise GameOver
         return
 
+    @timed("print_grid")
     def print_grid(self) -> Optional[List[List[str]]]:
-        """Prints Grid into terminal."""
-        for row in self.grid:
-            print(" ".join(row))
+        """Prints Grid into terminal.
+
+        Delegates to `renderer` when set, which writes the whole frame at once.
+        """
+        if self.renderer is not None:
+            self.renderer.render(self)
+            return
+        text = self.cells.decode("ascii")
+        size = self.size
+        for i in range(0, size * size, size):
+            print(" ".join(text[i : i + size]))
         # add empty line
         print()
 
     def _can_move(self) -> bool:
         """Checks if `board` has empty spaces."""
-        return any(settings.BLANK in row for row in self.grid)
+        return BLANK_CODE in self.cells
 
     def _has_winner(self) -> bool:
-        """Checks if `board` has `win_length`-in-a-row of any player's mark."""
-        if self._has_win_length_horizontal():
-            return True
-        if self._has_win_length_vertical():
-            return True
-        if self._has_win_length_diagonal():
-            return True
+        """Checks if `board` has `win_length`-in-a-row of any player's mark.
+
+        A line is complete when one player holds every cell of a window, so
+        only the window counters are read, not the cells.
+        """
+        win_length = self.tables.win_length
+        return any(win_length in counts for counts in self.window_counts.values())
 
     def _has_win_length_horizontal(self) -> bool:
         """Checks if `board` has any winning position horizontally."""
-        for row in self.grid:
-            if self._has_consecutive_win_length(row):
+        for i in range(self.size):
+            if self._has_consecutive_win_length(self.row_view(i)):
                 return True
         return False
 
     def _has_win_length_vertical(self) -> bool:
         """Checks if `board` has any winning position vertically."""
-        for col in zip(*self.grid):
-            if self._has_consecutive_win_length(col):
+        for j in range(self.size):
+            if self._has_consecutive_win_length(self.column_view(j)):
                 return True
         return False
 
@@ -190,28 +507,51 @@ class Board:
                 return True
         return False
 
-    def _has_consecutive_win_length(self, target: List[str]) -> bool:
-        """Checks if `target` has `WIN_LENGTH`-in-a-row of the same player mark."""
-        # `count_arr` keeps track of consecutive count of each player's mark
-        marks = PlayerEnum.list_marks()
-        count_arr = [0] * len(marks)
+    @staticmethod
+    def _has_consecutive_win_length(target: Sequence[Union[str, int]]) -> bool:
+        """Checks if `target` has `WIN_LENGTH`-in-a-row of the same player mark.
+
+        `target` may hold marks, or their byte codes as yielded by the views of
+        `cells`.
+        """
+        count = 0
+        previous = None
         for elem in target:
-            if elem == settings.BLANK:
+            if elem not in PLAYER_MARKS:
                 # reset count for all players
-                count_arr = [0] * len(marks)
+                count = 0
+                previous = None
                 continue
-            elif elem in marks:
-                current_player_count = count_arr[marks.index(elem)] + 1
-                # reset count for other players
-                count_arr = [0] * len(marks)
-                count_arr[marks.index(elem)] = current_player_count
-
-            if max(count_arr) >= settings.WIN_LENGTH:
+            count = count + 1 if elem == previous else 1
+            previous = elem
+            if count >= settings.WIN_LENGTH:
                 return True
         return False
 
-    def _get_forward_diagonals(self) -> List[str]:
-        """Transform `board` grid to nested array representing forward diagonals.
+    def row_view(self, i: int) -> memoryview:
+        """Zero-copy view of the `i`-th row (0-indexed) of `cells`."""
+        size = self.size
+        return memoryview(self.cells)[i * size : (i + 1) * size]
+
+    def column_view(self, j: int) -> memoryview:
+        """Zero-copy strided view of the `j`-th column (0-indexed) of `cells`."""
+        return memoryview(self.cells)[j :: self.size]
+
+    def as_array(self) -> "numpy.ndarray":
+        """Zero-copy `size` x `size` NumPy array of cell byte codes.
+
+        Rows, columns and diagonals of the returned array (`a[i]`, `a[:, j]`,
+        `numpy.diagonal(a, k)`) are strided views of `cells` as well. Requires
+        NumPy, which is an optional dependency.
+        """
+        import numpy
+
+        return numpy.frombuffer(self.cells, dtype=numpy.uint8).reshape(
+            self.size, self.size
+        )
+
+    def _get_forward_diagonals(self) -> List[memoryview]:
+        """Zero-copy strided views of `cells` along forward diagonals.
         https://stackoverflow.com/a/31373955/190597
         >>> L = [[ 0,  1,  2],
                 [ 3,  4,  5],
@@ -220,15 +560,11 @@ class Board:
         >>> _get_forward_diagonals(L)
         [[0], [3, 1], [6, 4, 2], [7, 5], [8]]
         """
-        L = self.grid
-        h, w = len(L), len(L[0])
-        return [
-            [L[p - q][q] for q in range(max(p - h + 1, 0), min(p + 1, w))]
-            for p in range(h + w - 1)
-        ]
-
-    def _get_backward_diagonals(self) -> List[str]:
-        """Transform `board` grid to nested array representing backward diagonals.
+        view = memoryview(self.cells)
+        return [view[s] for s in _forward_diagonal_slices(self.size)]
+
+    def _get_backward_diagonals(self) -> List[memoryview]:
+        """Zero-copy strided views of `cells` along backward diagonals.
         >>> L = [[ 0,  1,  2],
                 [ 3,  4,  5],
                 [ 6,  7,  8]]
@@ -236,12 +572,8 @@ class Board:
         >>> _get_backward_diagonals(L)
         [[6], [3, 7], [0, 4, 8], [1, 5], [2]]
         """
-        L = self.grid
-        h, w = len(L), len(L[0])
-        return [
-            [L[h - p + q - 1][q] for q in range(max(p - h + 1, 0), min(p + 1, w))]
-            for p in range(h + w - 1)
-        ]
+        view = memoryview(self.cells)
+        return [view[s] for s in _backward_diagonal_slices(self.size)]
 
     @staticmethod
     def _validate_size(size: int) -> None:
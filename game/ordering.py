@@ -0,0 +1,158 @@
+from typing import Dict, List, Tuple
+
+from game.models import BLANK_CODE, NEXT_CODES, Board
+from game.ttable import NO_MOVE
+
+# where an ordered move came from, in the order sources are tried
+SOURCES = ("pv", "tt", "win", "block", "killer", "history")
+PV, TT, WIN, BLOCK, KILLER, HISTORY = range(len(SOURCES))
+KILLERS_PER_PLY = 2
+
+
+def completing_cells(board: Board) -> Dict[int, List[int]]:
+    """Returns, for each mark byte code, the empty cells that would win for it."""
+    cells = board.cells
+    windows = board.tables.windows
+    threat = board.tables.win_length - 1
+    completing: Dict[int, List[int]] = {}
+    for code, counts in board.window_counts.items():
+        found = completing[code] = []
+        theirs = board.window_counts[NEXT_CODES[code]]
+        for w, count in enumerate(counts):
+            if count == threat and not theirs[w]:
+                for i in windows[w]:
+                    if cells[i] == BLANK_CODE:
+                        if i not in found:
+                            found.append(i)
+                        break
+    return completing
+
+
+class MoveOrderer:
+    """Orders the moves of a search node, most promising first.
+
+    Moves are tried in this order: the principal variation move, the
+    transposition table move, moves completing a line of the side to move,
+    moves blocking a line the opponent would complete next, the killer moves
+    of the ply (quiet moves that caused a beta cutoff in a sibling node), and
+    finally the remaining moves by decreasing history score, which grows with
+    every cutoff a move causes, weighted by the depth it was searched to.
+
+    For each source, the number of moves tried and of beta cutoffs they
+    caused is counted, to measure how well the ordering works.
+
+    Attributes:
+        `threats`: whether to try winning and blocking moves early.
+        `killers`: whether to try killer moves early.
+        `history`: whether to sort the remaining moves by history score.
+        `tried`: number of moves searched, per source.
+        `cutoffs`: number of beta cutoffs, per source.
+    """
+
+    threats: bool = True
+    killers: bool = True
+    history: bool = True
+    tried: List[int] = []
+    cutoffs: List[int] = []
+
+    def __init__(
+        self, threats: bool = True, killers: bool = True, history: bool = True
+    ) -> None:
+        self.threats = threats
+        self.killers = killers
+        self.history = history
+        self.tried = [0] * len(SOURCES)
+        self.cutoffs = [0] * len(SOURCES)
+        self._killers: List[List[int]] = []
+        self._history: Dict[Tuple[int, int], int] = {}
+
+    def order(
+        self,
+        board: Board,
+        moves: List[int],
+        code: int,
+        tt_move: int = NO_MOVE,
+        pv_move: int = NO_MOVE,
+        ply: int = 0,
+    ) -> Tuple[List[int], List[int]]:
+        """Returns `moves` of the side playing `code`, sorted, and their sources."""
+        ordered: List[int] = []
+        sources: List[int] = []
+        for move, source in [(pv_move, PV), (tt_move, TT)]:
+            if move != NO_MOVE and move in moves and move not in ordered:
+                ordered.append(move)
+                sources.append(source)
+        rest = [move for move in moves if move not in ordered]
+
+        if self.threats:
+            completing = completing_cells(board)
+            wins = [move for move in completing[code] if move in rest]
+            blocks = [
+                move
+                for move in completing[NEXT_CODES[code]]
+                if move in rest and move not in wins
+            ]
+            ordered += wins + blocks
+            sources += [WIN] * len(wins) + [BLOCK] * len(blocks)
+            if wins or blocks:
+                forced = wins + blocks
+                rest = [move for move in rest if move not in forced]
+
+        if self.killers and ply < len(self._killers):
+            for move in self._killers[ply]:
+                if move in rest:
+                    rest.remove(move)
+                    ordered.append(move)
+                    sources.append(KILLER)
+
+        if self.history and self._history:
+            history = self._history
+            rest.sort(key=lambda move: -history.get((code, move), 0))
+        ordered += rest
+        sources += [HISTORY] * len(rest)
+        return ordered, sources
+
+    def record_cutoff(
+        self, code: int, move: int, source: int, depth: int, ply: int
+    ) -> None:
+        """Learns from `move` of the side playing `code` causing a beta cutoff."""
+        self.cutoffs[source] += 1
+        if source in (WIN, BLOCK):
+            # forced moves are found again without help
+            return
+        if self.killers:
+            while len(self._killers) <= ply:
+                self._killers.append([])
+            killers = self._killers[ply]
+            if move not in killers:
+                killers.insert(0, move)
+                del killers[KILLERS_PER_PLY:]
+        if self.history:
+            key = (code, move)
+            self._history[key] = self._history.get(key, 0) + depth * depth
+
+    def new_search(self) -> None:
+        """Forgets the killer moves, whose plies are relative to the last root."""
+        self._killers.clear()
+
+    def clear(self) -> None:
+        """Forgets everything learnt and resets the statistics."""
+        self._killers.clear()
+        self._history.clear()
+        self.tried = [0] * len(SOURCES)
+        self.cutoffs = [0] * len(SOURCES)
+
+    def cutoff_rates(self) -> Dict[str, float]:
+        """Returns the share of tried moves causing a beta cutoff, per source."""
+        return {
+            name: self.cutoffs[i] / self.tried[i] if self.tried[i] else 0.0
+            for i, name in enumerate(SOURCES)
+        }
+
+    def summary(self) -> str:
+        rates = self.cutoff_rates()
+        parts = [
+            f"{name} {self.cutoffs[i]}/{self.tried[i]} ({rates[name]:.0%})"
+            for i, name in enumerate(SOURCES)
+        ]
+        return "Beta cutoffs per move source: " + ", ".join(parts)
@@ -0,0 +1,83 @@
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import config as settings
+
+
+class ParsedMoves:
+    """Result of parsing a buffer of `row,col` lines.
+
+    Attributes:
+        `indices`: flat, 0-indexed cell index (`(row - 1) * size + col - 1`) of
+            every valid line, in order.
+        `line_numbers`: 1-indexed source line of each entry of `indices`.
+        `errors`: `(line number, line)` of every line that is not a valid
+            coordinate on the board.
+    """
+
+    indices: array
+    line_numbers: array
+    errors: List[Tuple[int, str]] = []
+
+    def __init__(self) -> None:
+        self.indices = array("H")
+        self.line_numbers = array("L")
+        self.errors = []
+
+
+def parse_row_col(text: str) -> Optional[Tuple[int, int]]:
+    """Parses a single `row,col` input, both values being positive integers.
+
+    Returns None if `text` is not a coordinate.
+    """
+    row, delimiter, col = text.partition(settings.DELIMITER)
+    # a second delimiter ends up in `col`, which then is not decimal
+    if not delimiter or not row.isdecimal() or not col.isdecimal():
+        return None
+    row, col = int(row), int(col)
+    if row == 0 or col == 0:
+        return None
+    return row, col
+
+
+@lru_cache(maxsize=None)
+def _canonical_indices(size: int) -> Dict[str, int]:
+    """Maps every canonical `row,col` text of a `size` x `size` board to its index."""
+    return {
+        f"{i + 1}{settings.DELIMITER}{j + 1}": i * size + j
+        for i in range(size)
+        for j in range(size)
+    }
+
+
+def parse_moves(buffer: str, size: int) -> ParsedMoves:
+    """Parses every `row,col` line of `buffer` into cell indices in one pass.
+
+    Canonical coordinates are resolved with a single dictionary lookup per
+    line; anything else, such as zero-padded values, falls back to
+    `parse_row_col`. Blank lines are skipped; lines that are not a coordinate
+    on a `size` x `size` board are reported in `errors` and parsing carries on.
+    """
+    parsed = ParsedMoves()
+    lines = buffer.splitlines()
+    values = list(map(_canonical_indices(size).get, lines))
+    if None not in values:
+        parsed.indices.extend(values)
+        parsed.line_numbers.extend(range(1, len(values) + 1))
+        return parsed
+
+    add_index = parsed.indices.append
+    add_line_number = parsed.line_numbers.append
+    for line_number, (line, index) in enumerate(zip(lines, values), 1):
+        if index is None:
+            if not line:
+                continue
+            row_col = parse_row_col(line)
+            if row_col is None or row_col[0] > size or row_col[1] > size:
+                parsed.errors.append((line_number, line))
+                continue
+            index = (row_col[0] - 1) * size + row_col[1] - 1
+        add_index(index)
+        add_line_number(line_number)
+    return parsed
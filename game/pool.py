@@ -0,0 +1,73 @@
+import contextlib
+from typing import Dict, Iterator, List
+
+import config as settings
+from game.models import Board
+
+
+class BoardPool:
+    """Hands out reusable silent boards, keyed by size.
+
+    Released boards are reset in place and kept for the next game of the same
+    size, so a long series of games only allocates boards while warming up.
+
+    Attributes:
+        `max_per_size`: idle boards kept per size, extra released boards are dropped.
+        `hits`: acquisitions served by an idle board.
+        `misses`: acquisitions that had to allocate a new board.
+        `dropped`: released boards discarded because the pool was full.
+    """
+
+    max_per_size: int = settings.POOL_MAX_PER_SIZE
+    hits: int = 0
+    misses: int = 0
+    dropped: int = 0
+
+    def __init__(self, max_per_size: int = settings.POOL_MAX_PER_SIZE) -> None:
+        self.max_per_size = max_per_size
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+        self._idle: Dict[int, List[Board]] = {}
+
+    def acquire(self, size: int) -> Board:
+        """Returns an empty `size` x `size` board.
+
+        Raises `GameError` if `size` is not an allowed board size.
+        """
+        idle = self._idle.get(size)
+        if idle:
+            self.hits += 1
+            return idle.pop()
+        board = Board(size, verbose=False)
+        self.misses += 1
+        return board
+
+    def release(self, board: Board) -> None:
+        """Resets `board` and keeps it for a later `acquire`."""
+        idle = self._idle.setdefault(board.size, [])
+        if len(idle) >= self.max_per_size:
+            self.dropped += 1
+            return
+        board.reset()
+        idle.append(board)
+
+    @contextlib.contextmanager
+    def borrow(self, size: int) -> Iterator[Board]:
+        """Context manager acquiring a board and releasing it on exit."""
+        board = self.acquire(size)
+        try:
+            yield board
+        finally:
+            self.release(board)
+
+    def idle_count(self, size: int) -> int:
+        return len(self._idle.get(size, []))
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+        return (
+            f"Board pool: {self.hits} hits, {self.misses} misses "
+            f"({hit_rate:.0%} hit rate), {self.dropped} dropped"
+        )
@@ -0,0 +1,136 @@
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional
+
+import config as settings
+
+
+class StackSampler:
+    """Samples the call stack of a thread at a fixed interval.
+
+    Samples are aggregated into collapsed stacks (`root;caller;callee count`),
+    the input format of flamegraph tools such as `flamegraph.pl` and speedscope.
+
+    Attributes:
+        `interval`: seconds between two samples.
+        `thread_id`: identifier of the sampled thread.
+        `samples`: sample count per collapsed stack.
+    """
+
+    interval: float = settings.PROFILE_SAMPLE_INTERVAL
+    thread_id: int = 0
+    samples: Dict[str, int] = {}
+
+    def __init__(
+        self,
+        interval: float = settings.PROFILE_SAMPLE_INTERVAL,
+        thread_id: Optional[int] = None,
+    ) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = self._collapse(frame)
+            self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    @staticmethod
+    def _collapse(frame: Optional[FrameType]) -> str:
+        """Formats `frame` and its callers as a `;`-separated root-first stack."""
+        labels: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            labels.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+def run_profiled(
+    func: Callable,
+    *args: Any,
+    output: str = settings.PROFILE_OUTPUT,
+    sort: str = settings.PROFILE_SORT,
+    **kwargs: Any,
+) -> Any:
+    """Runs `func` under cProfile and a stack sampler.
+
+    Writes three files next to `output`:
+      `<output>.prof`: raw cProfile stats, loadable with `pstats` or snakeviz.
+      `<output>.txt`: stats report sorted by `sort`.
+      `<output>.folded`: collapsed stacks for flamegraph tools.
+
+    Returns:
+      The return value of `func`.
+    """
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(f"{output}.prof")
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats()
+        with open(f"{output}.txt", "w") as f:
+            f.write(report.getvalue())
+        sampler.write_collapsed(f"{output}.folded")
+        print(
+            f"Profile written to {output}.prof, {output}.txt and {output}.folded",
+            file=sys.stderr,
+        )
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--profile` and `--profile-output` options of `run_main`."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run under cProfile and write a stats report and collapsed stacks",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=settings.PROFILE_OUTPUT,
+        help="path prefix of the profiling output files",
+    )
+
+
+def run_main(options: argparse.Namespace, func: Callable, *args: Any) -> Any:
+    """Runs `func`, under `run_profiled` if the `--profile` option is set.
+
+    Only the calling process is profiled, not the workers it starts.
+    """
+    if options.profile:
+        return run_profiled(func, *args, output=options.profile_output)
+    return func(*args)
@@ -0,0 +1,327 @@
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import config as settings
+from game.models import BLANK_CODE, NEXT_CODES, Board
+from game.ordering import completing_cells
+from game.profiling import add_profile_arguments, run_main
+from game.search import side_to_move
+from game.tables import BoardTables
+from game.ttable import NO_MOVE
+
+# proof and disproof numbers of solved positions
+INFINITE = 1 << 30
+
+PROVEN = "proven"
+DISPROVEN = "disproven"
+UNKNOWN = "unknown"
+
+
+class ProofResult:
+    """Outcome of a proof-number search.
+
+    Attributes:
+        `outcome`: `PROVEN` if the attacker has a forced win, `DISPROVEN` if
+            it has none, `UNKNOWN` if the node budget ran out first.
+        `proof_number`: minimum number of positions left to prove the win.
+        `disproof_number`: minimum number of positions left to disprove it.
+        `move`: winning move of the attacker to move, `NO_MOVE` otherwise.
+        `nodes`: number of positions expanded.
+        `elapsed`: wall-clock duration of the search, in seconds.
+        `table_entries`: positions held by the node table at the end.
+        `memory`: approximate size of the node table, in bytes.
+    """
+
+    __slots__ = (
+        "outcome",
+        "proof_number",
+        "disproof_number",
+        "move",
+        "nodes",
+        "elapsed",
+        "table_entries",
+        "memory",
+    )
+
+    outcome: str
+    proof_number: int
+    disproof_number: int
+    move: int
+    nodes: int
+    elapsed: float
+    table_entries: int
+    memory: int
+
+    def __init__(
+        self,
+        outcome: str,
+        proof_number: int,
+        disproof_number: int,
+        move: int,
+        nodes: int,
+        elapsed: float,
+        table_entries: int,
+        memory: int,
+    ) -> None:
+        self.outcome = outcome
+        self.proof_number = proof_number
+        self.disproof_number = disproof_number
+        self.move = move
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.table_entries = table_entries
+        self.memory = memory
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        numbers = [
+            "inf" if n >= INFINITE else str(n)
+            for n in (self.proof_number, self.disproof_number)
+        ]
+        return (
+            f"{self.outcome} (pn {numbers[0]}, dn {numbers[1]}), {self.nodes} nodes "
+            f"in {self.elapsed:.2f} s ({self.nodes_per_second:,.0f} nodes/s), "
+            f"{self.table_entries} table entries (~{self.memory / 1024:,.0f} KiB)"
+        )
+
+
+class ProofSolver:
+    """Depth-first proof-number (df-pn) search for a forced win.
+
+    Each position holds a proof number and a disproof number: the minimum
+    number of unsolved positions that must be solved to prove, or to
+    disprove, that the attacker wins. The search always expands the most
+    proving position, going depth-first while the numbers stay under
+    thresholds, so it only needs the node table to remember positions.
+
+    Numbers are stored from the point of view of the side to move (phi for
+    its goal, delta for the other side's), keyed by `Board.position_hash`,
+    in a table of at most `max_entries` positions: when it is full, the
+    unsolved positions that took the least work to search are dropped. A
+    table much smaller than the proof tree makes the search redo the same
+    work over and over, so pair small tables with `max_nodes`. The table is
+    kept across `solve` calls with the same attacker and board size; drawn
+    positions count as won or lost depending on the attacker, so the table
+    is cleared whenever either changes.
+
+    Move generation is restricted by threats: a side that can complete a
+    line wins at once, a side facing such a line must block it, and cells
+    where every line is already held by both players are never played, as a
+    mark there cannot change the outcome.
+
+    Attributes:
+        `max_entries`: capacity of the node table, in positions.
+        `nodes`: positions expanded by the last `solve`.
+        `collections`: number of times the full table was pruned.
+    """
+
+    max_entries: int = settings.PN_TABLE_ENTRIES
+    nodes: int = 0
+    collections: int = 0
+
+    def __init__(self, max_entries: int = settings.PN_TABLE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.nodes = 0
+        self.collections = 0
+        # position hash -> (phi, delta, work)
+        self.table: Dict[int, Tuple[int, int, int]] = {}
+        self._attacker = 0
+        # attacker and board tables the entries of `table` were solved for
+        self._context: Optional[Tuple[int, BoardTables]] = None
+        self._max_nodes: Optional[int] = None
+
+    def solve(
+        self,
+        board: Board,
+        attacker: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> ProofResult:
+        """Proves or disproves a forced win of `attacker` from `board`.
+
+        Args:
+          board: position to solve, left unchanged.
+          attacker: mark byte code of the side trying to win, by default the
+            side to move.
+          max_nodes: stop with an `UNKNOWN` outcome after this many expansions.
+        """
+        start = time.perf_counter()
+        code = side_to_move(board)
+        self._attacker = code if attacker is None else attacker
+        context = (self._attacker, board.tables)
+        if context != self._context:
+            self.table.clear()
+            self._context = context
+        self._max_nodes = max_nodes
+        self.nodes = 0
+        self._mid(board, INFINITE - 1, INFINITE - 1)
+        phi, delta, _ = self.table.get(board.position_hash, (1, 1, 0))
+        if code == self._attacker:
+            proof_number, disproof_number = phi, delta
+        else:
+            proof_number, disproof_number = delta, phi
+        outcome = UNKNOWN
+        if proof_number == 0:
+            outcome = PROVEN
+        elif disproof_number == 0:
+            outcome = DISPROVEN
+        move = NO_MOVE
+        if outcome == PROVEN and code == self._attacker:
+            move = self._solved_move(board, code)
+        return ProofResult(
+            outcome,
+            proof_number,
+            disproof_number,
+            move,
+            self.nodes,
+            time.perf_counter() - start,
+            len(self.table),
+            self.memory(),
+        )
+
+    def clear(self) -> None:
+        self.table.clear()
+
+    def memory(self) -> int:
+        """Returns the approximate size of the node table, in bytes."""
+        if not self.table:
+            return sys.getsizeof(self.table)
+        entry = next(iter(self.table.values()))
+        # keys and numbers are mostly ints of a few digits
+        per_entry = sys.getsizeof(entry) + 3 * sys.getsizeof(INFINITE)
+        return sys.getsizeof(self.table) + len(self.table) * per_entry
+
+    def _mid(self, board: Board, th_phi: int, th_delta: int) -> None:
+        """Searches `board` until its phi or delta reaches its threshold."""
+        self.nodes += 1
+        key = board.position_hash
+        code = side_to_move(board)
+        moves, terminal = self._expand(board, code)
+        if terminal is not None:
+            self._store(key, terminal[0], terminal[1], 1)
+            return
+
+        nodes_start = self.nodes
+        zobrist = board.tables.zobrist[code]
+        table = self.table
+        while True:
+            # phi of a position is the smallest delta of its children, delta
+            # the sum of their phis
+            phi = second = INFINITE
+            delta = 0
+            best = NO_MOVE
+            best_phi = 1
+            for move in moves:
+                child_phi, child_delta, _ = table.get(key ^ zobrist[move], (1, 1, 0))
+                delta += child_phi
+                if child_delta < phi:
+                    second = phi
+                    phi = child_delta
+                    best = move
+                    best_phi = child_phi
+                elif child_delta < second:
+                    second = child_delta
+            delta = min(delta, INFINITE)
+            if phi >= th_phi or delta >= th_delta:
+                break
+            if self._max_nodes is not None and self.nodes >= self._max_nodes:
+                break
+            board.place(best, code)
+            self._mid(
+                board,
+                min(th_delta - delta + best_phi, INFINITE - 1),
+                min(th_phi, second + 1),
+            )
+            board.undo()
+        self._store(key, phi, delta, self.nodes - nodes_start + 1)
+
+    def _expand(
+        self, board: Board, code: int
+    ) -> Tuple[List[int], Optional[Tuple[int, int]]]:
+        """Returns the moves worth searching for `code`, or the (phi, delta) of
+        the position if it is solved without searching.
+        """
+        completing = completing_cells(board)
+        if completing[code]:
+            return [], (0, INFINITE)
+        moves = completing[NEXT_CODES[code]]
+        if not moves:
+            moves = self._live_cells(board)
+        if not moves:
+            # a draw, which is what the defender is after
+            if code == self._attacker:
+                return [], (INFINITE, 0)
+            return [], (0, INFINITE)
+        return moves, None
+
+    @staticmethod
+    def _live_cells(board: Board) -> List[int]:
+        """Returns the empty cells on at least one line still open to a player."""
+        cells = board.cells
+        cell_windows = board.tables.cell_windows
+        first, second = board.window_counts.values()
+        live = []
+        for index, code in enumerate(cells):
+            if code != BLANK_CODE:
+                continue
+            for w in cell_windows[index]:
+                if not first[w] or not second[w]:
+                    live.append(index)
+                    break
+        return live
+
+    def _solved_move(self, board: Board, code: int) -> int:
+        """Returns the move of a proven position leading to a proven child."""
+        moves, _ = self._expand(board, code)
+        completing = completing_cells(board)[code]
+        if completing:
+            return completing[0]
+        zobrist = board.tables.zobrist[code]
+        for move in moves:
+            entry = self.table.get(board.position_hash ^ zobrist[move])
+            if entry is not None and entry[1] == 0:
+                return move
+        return NO_MOVE
+
+    def _store(self, key: int, phi: int, delta: int, work: int) -> None:
+        table = self.table
+        if key not in table and len(table) >= self.max_entries:
+            self._collect()
+        table[key] = (phi, delta, work)
+
+    def _collect(self) -> None:
+        """Drops half of the table, the unsolved positions cheapest to redo first."""
+        self.collections += 1
+        ranked = sorted(
+            self.table.items(),
+            key=lambda item: (not item[1][0] or not item[1][1], item[1][2]),
+        )
+        for key, _ in ranked[: len(ranked) // 2]:
+            del self.table[key]
+
+
+def main(args: argparse.Namespace) -> None:
+    solver = ProofSolver(args.table_entries)
+    result = solver.solve(Board(args.size, verbose=False), max_nodes=args.max_nodes)
+    print(f"{args.size}x{args.size}: {result.summary()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Prove or disprove a first player win on an empty board"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        choices=settings.ALLOWED_SIZE,
+        default=max(settings.ALLOWED_SIZE),
+    )
+    parser.add_argument("--max-nodes", type=int)
+    parser.add_argument("--table-entries", type=int, default=settings.PN_TABLE_ENTRIES)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_main(args, main, args)
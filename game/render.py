@@ -0,0 +1,85 @@
+import sys
+from typing import TYPE_CHECKING, List, Optional, TextIO
+
+if TYPE_CHECKING:
+    from game.models import Board
+
+# ANSI escape sequences used by diff-only redraws
+SAVE_CURSOR = "\x1b7"
+RESTORE_CURSOR = "\x1b8"
+CURSOR_UP = "\x1b[{lines}A"
+CURSOR_COLUMN = "\x1b[{column}G"
+
+
+class FrameRenderer:
+    """Renders a board frame with a single write to `stream`.
+
+    Rendered rows are cached and only re-joined when their cells change. With
+    `diff` enabled, every frame after the first only rewrites the cells that
+    changed, moving the cursor back over the previous frame with ANSI escape
+    codes, so nothing else may be written to `stream` between two frames.
+
+    Attributes:
+        `stream`: text stream frames are written to, `sys.stdout` by default.
+        `diff`: whether to redraw only changed cells after the first frame.
+        `writes`: number of writes issued to `stream`.
+    """
+
+    stream: Optional[TextIO] = None
+    diff: bool = False
+    writes: int = 0
+
+    def __init__(self, stream: Optional[TextIO] = None, diff: bool = False) -> None:
+        self.stream = stream
+        self.diff = diff
+        self.writes = 0
+        self._row_cells: List[bytes] = []
+        self._row_text: List[str] = []
+
+    def reset(self) -> None:
+        """Forgets the previous frame, so the next one is drawn in full."""
+        self._row_cells = []
+        self._row_text = []
+
+    def render(self, board: "Board") -> None:
+        cells = board.cells
+        size = board.size
+        if len(self._row_cells) != size:
+            self._row_cells = [b""] * size
+            self._row_text = [""] * size
+            frame = self._full_frame(cells, size)
+        elif self.diff:
+            frame = self._diff_frame(cells, size)
+        else:
+            frame = self._full_frame(cells, size)
+        if frame:
+            (self.stream or sys.stdout).write(frame)
+            self.writes += 1
+
+    def _full_frame(self, cells: bytearray, size: int) -> str:
+        for i in range(size):
+            row = bytes(cells[i * size : (i + 1) * size])
+            if row != self._row_cells[i]:
+                self._row_cells[i] = row
+                self._row_text[i] = " ".join(row.decode("ascii"))
+        # trailing empty line separates consecutive frames
+        return "\n".join(self._row_text) + "\n\n"
+
+    def _diff_frame(self, cells: bytearray, size: int) -> str:
+        parts = []
+        for i in range(size):
+            row = bytes(cells[i * size : (i + 1) * size])
+            previous = self._row_cells[i]
+            if row == previous:
+                continue
+            for j in range(size):
+                if row[j] != previous[j]:
+                    # the cursor rests below the frame's trailing empty line
+                    parts.append(SAVE_CURSOR)
+                    parts.append(CURSOR_UP.format(lines=size + 1 - i))
+                    parts.append(CURSOR_COLUMN.format(column=2 * j + 1))
+                    parts.append(chr(row[j]))
+                    parts.append(RESTORE_CURSOR)
+            self._row_cells[i] = row
+            self._row_text[i] = " ".join(row.decode("ascii"))
+        return "".join(parts)
@@ -0,0 +1,334 @@
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from game.models import BLANK_CODE, MARK_CODES, Board
+from game.ordering import MoveOrderer
+from game.ttable import NO_MOVE, Bound, TranspositionTable
+
+# a win scores `WIN_SCORE` minus the number of marks on the board when it
+# happens, so faster wins score higher and scores only depend on the position
+WIN_SCORE = 1000
+INFINITY = 10_000
+# bound of heuristic scores, so they never read as a win or a loss
+EVAL_LIMIT = WIN_SCORE // 2
+# nodes visited between two checks of the clock of a timed search
+CLOCK_INTERVAL = 1024
+
+
+def side_to_move(board: Board) -> int:
+    """Returns the mark byte code of the player to move on `board`."""
+    return MARK_CODES[board.move_count % len(MARK_CODES)]
+
+
+def table_key(board: Board) -> int:
+    """Returns the transposition table key of `board`.
+
+    The empty board hashes to 0 whatever its size, so the key mixes in the
+    board size and win length for tables shared by several board sizes.
+    """
+    return board.position_hash ^ board.tables.zobrist_base
+
+
+class SearchTimeout(Exception):
+    """Raised inside a timed search when its deadline has passed or it was stopped."""
+
+
+class SearchResult:
+    """Outcome of a search from one position.
+
+    Attributes:
+        `score`: score of the position for the side to move.
+        `move`: flat index of the best move found, `NO_MOVE` if none.
+        `depth`: depth the search completed.
+        `nodes`: number of positions visited.
+        `elapsed`: wall-clock duration of the search, in seconds.
+        `pv`: principal variation, the expected moves starting with `move`.
+    """
+
+    __slots__ = ("score", "move", "depth", "nodes", "elapsed", "pv")
+
+    score: int
+    move: int
+    depth: int
+    nodes: int
+    elapsed: float
+    pv: List[int]
+
+    def __init__(
+        self,
+        score: int,
+        move: int,
+        depth: int,
+        nodes: int,
+        elapsed: float = 0.0,
+        pv: Sequence[int] = (),
+    ) -> None:
+        self.score = score
+        self.move = move
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = list(pv)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def is_win(self) -> bool:
+        return self.score > WIN_SCORE - INFINITY // 100
+
+    @property
+    def is_loss(self) -> bool:
+        return self.score < -(WIN_SCORE - INFINITY // 100)
+
+    def summary(self) -> str:
+        return (
+            f"depth {self.depth}, score {self.score}, {self.nodes} nodes "
+            f"in {self.elapsed * 1000:.0f} ms ({self.nodes_per_second:,.0f} nodes/s)"
+        )
+
+
+class Searcher:
+    """Negamax alpha-beta search over `Board` positions.
+
+    Positions are explored in place with `Board.place` and `Board.undo`, and
+    results are cached in a `TranspositionTable` keyed by position hash, whose
+    best moves are tried first when the position is searched again. The
+    other moves are ordered by a `MoveOrderer`.
+
+    Attributes:
+        `table`: transposition table shared by every search of this searcher.
+        `orderer`: move ordering heuristics, and their cutoff statistics.
+        `evaluator`: static evaluation of leaves for the side to move, such as
+            `game.evaluator.BatchEvaluator.evaluate`, instead of the window
+            score.
+        `nodes`: positions visited since the last `search` started.
+    """
+
+    table: TranspositionTable
+    orderer: MoveOrderer
+    evaluator: Optional[Callable[[Board], int]] = None
+    nodes: int = 0
+
+    def __init__(
+        self,
+        table: Optional[TranspositionTable] = None,
+        orderer: Optional[MoveOrderer] = None,
+        evaluator: Optional[Callable[[Board], int]] = None,
+    ) -> None:
+        self.table = table if table is not None else TranspositionTable()
+        self.orderer = orderer if orderer is not None else MoveOrderer()
+        self.evaluator = evaluator
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._stop: Optional[threading.Event] = None
+        self._pv: List[int] = []
+        self._root_count = 0
+
+    def search(self, board: Board, depth: int) -> SearchResult:
+        """Searches `board` `depth` plies deep for the side to move.
+
+        `board` is left unchanged.
+        """
+        self.nodes = 0
+        self._deadline = None
+        self._stop = None
+        self._pv = []
+        self._root_count = board.move_count
+        self.orderer.new_search()
+        start = time.perf_counter()
+        score = self._negamax(board, depth, -INFINITY, INFINITY)
+        pv = self.principal_variation(board, depth)
+        move = pv[0] if pv else NO_MOVE
+        return SearchResult(
+            score, move, depth, self.nodes, time.perf_counter() - start, pv
+        )
+
+    def search_timed(
+        self,
+        board: Board,
+        budget: float,
+        max_depth: Optional[int] = None,
+        stop: Optional[threading.Event] = None,
+        previous: Optional[SearchResult] = None,
+    ) -> SearchResult:
+        """Searches `board` one ply deeper at a time until `budget` seconds pass.
+
+        Each iteration searches the principal variation of the previous one
+        first, and reuses its transposition entries to order the other moves.
+        The first iteration always completes; after that, an iteration still
+        running when the budget runs out is abandoned, and the result of the
+        deepest completed iteration is returned.
+
+        Args:
+          board: position to search, left unchanged.
+          budget: wall-clock time allowed, in seconds.
+          max_depth: stop after this depth, by default once the board is full.
+          stop: event abandoning the search as soon as it is set, even during
+            the first iteration, whose result then has no move.
+          previous: result of an earlier search of `board`, such as a pondered
+            one. The search resumes one ply deeper, any iteration may be
+            abandoned, and `previous` is returned if none completes.
+        """
+        start = time.perf_counter()
+        root_moves = len(board.moves)
+        if max_depth is None:
+            max_depth = len(board.empty_cells())
+        self.nodes = 0
+        self._deadline = None
+        self._stop = stop
+        self._pv = []
+        self._root_count = board.move_count
+        self.orderer.new_search()
+        result = SearchResult(0, NO_MOVE, 0, 0)
+        if previous is not None:
+            result = previous
+            self._pv = list(previous.pv)
+            self._deadline = start + budget
+            if previous.is_win or previous.is_loss:
+                max_depth = previous.depth
+        for depth in range(result.depth + 1, max(max_depth, 1) + 1):
+            try:
+                score = self._negamax(board, depth, -INFINITY, INFINITY, True)
+            except SearchTimeout:
+                while len(board.moves) > root_moves:
+                    board.undo()
+                break
+            self._pv = self.principal_variation(board, depth)
+            result = SearchResult(
+                score,
+                self._pv[0] if self._pv else NO_MOVE,
+                depth,
+                self.nodes,
+                pv=self._pv,
+            )
+            if result.is_win or result.is_loss:
+                break
+            self._deadline = start + budget
+            if time.perf_counter() >= self._deadline:
+                break
+        self._deadline = None
+        self._stop = None
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def principal_variation(self, board: Board, depth: int) -> List[int]:
+        """Returns the best moves from `board` recorded in the table, in order."""
+        pv: List[int] = []
+        try:
+            while len(pv) < depth:
+                entry = self.table.lookup(table_key(board))
+                if entry is None or entry.move == NO_MOVE:
+                    break
+                if board.cells[entry.move] != BLANK_CODE:
+                    # a hash collision, the move belongs to another position
+                    break
+                board.place(entry.move, side_to_move(board))
+                pv.append(entry.move)
+                if board.is_winning_cell(entry.move):
+                    break
+        finally:
+            for _ in pv:
+                board.undo()
+        return pv
+
+    def _interrupted(self) -> bool:
+        if self._stop is not None and self._stop.is_set():
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def evaluate(self, board: Board) -> int:
+        """Static score of a non-terminal position for the side to move.
+
+        Reads the incrementally maintained `Board.window_score`, so it costs
+        the same on every board size, unless the searcher has an `evaluator`;
+        either way, it is kept well below win scores.
+        """
+        if self.evaluator is not None:
+            return max(-EVAL_LIMIT, min(self.evaluator(board), EVAL_LIMIT))
+        score = max(-EVAL_LIMIT, min(board.window_score, EVAL_LIMIT))
+        return score if side_to_move(board) == MARK_CODES[0] else -score
+
+    def order_moves(
+        self,
+        board: Board,
+        moves: List[int],
+        tt_move: int,
+        pv_move: int = NO_MOVE,
+        ply: int = 0,
+    ) -> Tuple[List[int], List[int]]:
+        """Returns `moves` in the order they should be searched, and their sources.
+
+        See `game.ordering.SOURCES` for the sources.
+        """
+        return self.orderer.order(
+            board, moves, side_to_move(board), tt_move, pv_move, ply
+        )
+
+    def _negamax(
+        self, board: Board, depth: int, alpha: int, beta: int, on_pv: bool = False
+    ) -> int:
+        self.nodes += 1
+        if not self.nodes % CLOCK_INTERVAL and self._interrupted():
+            raise SearchTimeout
+        key = table_key(board)
+        entry = self.table.lookup(key)
+        tt_move = NO_MOVE
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                if entry.bound == Bound.EXACT:
+                    return entry.score
+                if entry.bound == Bound.LOWER:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score
+
+        moves = board.empty_cells()
+        if not moves:
+            return 0
+        if depth == 0:
+            return self.evaluate(board)
+
+        ply = board.move_count - self._root_count
+        pv_move = NO_MOVE
+        if on_pv and ply < len(self._pv):
+            pv_move = self._pv[ply]
+        alpha_start = alpha
+        code = side_to_move(board)
+        best_score = -INFINITY
+        best_move = NO_MOVE
+        ordered, sources = self.order_moves(board, moves, tt_move, pv_move, ply)
+        tried = self.orderer.tried
+        for index, source in zip(ordered, sources):
+            tried[source] += 1
+            board.place(index, code)
+            if board.is_winning_cell(index):
+                score = WIN_SCORE - board.move_count
+            else:
+                score = -self._negamax(
+                    board, depth - 1, -beta, -alpha, index == pv_move
+                )
+            board.undo()
+            if score > best_score:
+                best_score = score
+                best_move = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.orderer.record_cutoff(code, index, source, depth, ply)
+                        break
+
+        if best_score <= alpha_start:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.table.store(key, best_score, depth, bound, best_move)
+        return best_score
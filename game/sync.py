@@ -0,0 +1,161 @@
+import struct
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Optional
+
+import config as settings
+from game.models import Board, GameState
+
+# message kinds, the first byte of every message
+DELTA = ord("D")
+SNAPSHOT = ord("S")
+# kind, sequence number, flat cell index, mark byte, state index
+DELTA_FORMAT = struct.Struct("<BIHBB")
+# kind, sequence number, board size, state index, followed by the cells
+SNAPSHOT_HEADER = struct.Struct("<BIBB")
+STATES = list(GameState)
+
+
+def encode_delta(seq: int, index: int, code: int, state: GameState) -> bytes:
+    return DELTA_FORMAT.pack(DELTA, seq, index, code, STATES.index(state))
+
+
+def encode_snapshot(seq: int, board: Board) -> bytes:
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT, seq, board.size, STATES.index(board.state))
+    return header + bytes(board.cells)
+
+
+class StateBroadcaster:
+    """Streams the moves of one game to any number of clients.
+
+    Every move becomes a delta message of fixed size, numbered by a sequence
+    number, so the bytes sent per move do not depend on the board size.
+    A client gets a full snapshot when it joins, when it asks for one after
+    missing messages, and when it falls more than `max_lag` messages behind,
+    in which case its pending deltas are replaced by the snapshot.
+
+    Messages wait in a queue per client until the transport takes them with
+    `drain`, so a slow client never holds the game or the other clients up.
+
+    Attributes:
+        `board`: board of the game, read when moves are published.
+        `seq`: sequence number of the latest message, 0 before any move.
+        `max_lag`: pending messages a client may have before a snapshot
+            replaces them.
+        `messages_sent`: number of messages queued, all clients together.
+        `bytes_sent`: size of the messages queued, all clients together.
+        `snapshots_sent`: number of snapshots among `messages_sent`.
+    """
+
+    board: Board
+    seq: int = 0
+    max_lag: int = settings.SYNC_MAX_LAG
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    snapshots_sent: int = 0
+
+    def __init__(self, board: Board, max_lag: int = settings.SYNC_MAX_LAG) -> None:
+        self.board = board
+        self.max_lag = max_lag
+        self.seq = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self._published = len(board.moves)
+        self._pending: Dict[Hashable, Deque[bytes]] = {}
+
+    def join(self, client: Hashable) -> None:
+        """Adds `client`, starting it with a snapshot of the board."""
+        self._pending[client] = deque()
+        self.resync(client)
+
+    def leave(self, client: Hashable) -> None:
+        self._pending.pop(client, None)
+
+    def resync(self, client: Hashable) -> None:
+        """Replaces the pending messages of `client` with a snapshot."""
+        pending = self._pending[client]
+        pending.clear()
+        self._queue(pending, encode_snapshot(self.seq, self.board))
+        self.snapshots_sent += 1
+
+    def publish(self) -> None:
+        """Queues a delta for every move played on `board` since the last call.
+
+        Call it after each move, once the board state is up to date.
+        """
+        board = self.board
+        moves = board.moves
+        if len(moves) < self._published:
+            # the board was reset for a new game
+            for client in self._pending:
+                self.resync(client)
+        for ply in range(self._published, len(moves)):
+            index = moves[ply]
+            # only the latest move can have ended the game
+            state = board.state if ply == len(moves) - 1 else GameState.LIVE
+            self.seq += 1
+            message = encode_delta(self.seq, index, board.cells[index], state)
+            for client, pending in self._pending.items():
+                if len(pending) >= self.max_lag:
+                    self.resync(client)
+                else:
+                    self._queue(pending, message)
+        self._published = len(moves)
+
+    def drain(self, client: Hashable) -> List[bytes]:
+        """Returns the messages waiting for `client`, oldest first."""
+        pending = self._pending[client]
+        messages = list(pending)
+        pending.clear()
+        return messages
+
+    def _queue(self, pending: Deque[bytes], message: bytes) -> None:
+        pending.append(message)
+        self.messages_sent += 1
+        self.bytes_sent += len(message)
+
+
+class StateMirror:
+    """Client side copy of a game, kept up to date from broadcast messages.
+
+    Attributes:
+        `size`: board size, known once a snapshot was applied.
+        `cells`: flat row-major cell marks, as in `Board.cells`.
+        `state`: state of the game.
+        `seq`: sequence number of the latest message applied, `None` before
+            the first snapshot.
+    """
+
+    size: int = 0
+    cells: bytearray = bytearray()
+    state: GameState = GameState.LIVE
+    seq: Optional[int] = None
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.cells = bytearray()
+        self.state = GameState.LIVE
+        self.seq = None
+
+    def apply(self, message: bytes) -> bool:
+        """Applies one message, returning `False` if messages were missed.
+
+        Deltas already applied are ignored. After a `False` return, the
+        client should ask the broadcaster to `resync` it; deltas are ignored
+        until the snapshot arrives.
+        """
+        if message[0] == SNAPSHOT:
+            seq, size, state = SNAPSHOT_HEADER.unpack_from(message)[1:]
+            self.size = size
+            self.cells[:] = message[SNAPSHOT_HEADER.size :]
+            self.state = STATES[state]
+            self.seq = seq
+            return True
+        _, seq, index, code, state = DELTA_FORMAT.unpack(message)
+        if self.seq is None or seq > self.seq + 1:
+            return False
+        if seq == self.seq + 1:
+            self.cells[index] = code
+            self.state = STATES[state]
+            self.seq = seq
+        return True
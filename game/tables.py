@@ -0,0 +1,120 @@
+import random
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import config as settings
+
+
+class BoardTables:
+    """Immutable lookup tables shared by every board of the same geometry.
+
+    Attributes:
+        `size`: length and breadth of the game board.
+        `win_length`: number of marks in a row needed to win.
+        `windows`: flat cell indices of every `win_length`-long line.
+        `cell_windows`: for each cell, indices into `windows` of the lines through it.
+        `zobrist`: for each mark byte code, one random 64-bit key per cell.
+        `zobrist_base`: random 64-bit key of the board size and win length,
+            mixed into transposition table keys so that positions of
+            different boards never share an entry.
+        `blank_cells`: cell buffer contents of an empty board.
+        `symmetries`: the 8 rotations and reflections of the board, each mapping
+            a flat cell index to the index of its image.
+        `window_weights`: heuristic value of a window holding only one player's
+            marks, indexed by their count.
+    """
+
+    __slots__ = (
+        "size",
+        "win_length",
+        "windows",
+        "cell_windows",
+        "zobrist",
+        "zobrist_base",
+        "blank_cells",
+        "symmetries",
+        "window_weights",
+    )
+
+    size: int
+    win_length: int
+    windows: Tuple[Tuple[int, ...], ...]
+    cell_windows: Tuple[Tuple[int, ...], ...]
+    zobrist: Dict[int, Tuple[int, ...]]
+    zobrist_base: int
+    blank_cells: bytes
+    symmetries: Tuple[Tuple[int, ...], ...]
+    window_weights: Tuple[int, ...]
+
+    def __init__(self, size: int, win_length: int) -> None:
+        self.size = size
+        self.win_length = win_length
+        self.windows = self._build_windows(size, win_length)
+        cell_windows = [[] for _ in range(size * size)]
+        for w, window in enumerate(self.windows):
+            for index in window:
+                cell_windows[index].append(w)
+        self.cell_windows = tuple(map(tuple, cell_windows))
+        self.blank_cells = (settings.BLANK * (size * size)).encode("ascii")
+        self.symmetries = self._build_symmetries(size)
+        # an open two is worth `EVAL_WEIGHT_BASE` open ones, and so on
+        self.window_weights = (0,) + tuple(
+            settings.EVAL_WEIGHT_BASE ** (count - 1)
+            for count in range(1, win_length + 1)
+        )
+        # imported here as `game.models` builds its boards on these tables
+        from game.models import PlayerEnum
+
+        # seeded so hashes are stable across processes and runs
+        rng = random.Random(f"{size}:{win_length}")
+        self.zobrist = {
+            ord(mark): tuple(rng.getrandbits(64) for _ in range(size * size))
+            for mark in PlayerEnum.list_marks()
+        }
+        self.zobrist_base = rng.getrandbits(64)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_size(
+        cls, size: int, win_length: int = settings.WIN_LENGTH
+    ) -> "BoardTables":
+        """Returns the tables of a `size` x `size` board, built once per process."""
+        return cls(size, win_length)
+
+    @staticmethod
+    def _build_symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+        last = size - 1
+        images = [
+            lambda i, j: (i, j),
+            lambda i, j: (j, last - i),
+            lambda i, j: (last - i, last - j),
+            lambda i, j: (last - j, i),
+            lambda i, j: (i, last - j),
+            lambda i, j: (last - i, j),
+            lambda i, j: (j, i),
+            lambda i, j: (last - j, last - i),
+        ]
+        symmetries = []
+        for image in images:
+            cells = (image(index // size, index % size) for index in range(size * size))
+            symmetries.append(tuple(i * size + j for i, j in cells))
+        return tuple(symmetries)
+
+    @staticmethod
+    def _build_windows(size: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+        windows = []
+        # horizontal, vertical, backward diagonal and forward diagonal steps
+        for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            for i in range(size):
+                for j in range(size):
+                    end_i = i + di * (win_length - 1)
+                    end_j = j + dj * (win_length - 1)
+                    if not (0 <= end_i < size and 0 <= end_j < size):
+                        continue
+                    windows.append(
+                        tuple(
+                            (i + di * k) * size + (j + dj * k)
+                            for k in range(win_length)
+                        )
+                    )
+        return tuple(windows)
@@ -0,0 +1,422 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import config as settings
+from game.bots import BotPlayer
+from game.history import GameRecord, HistoryStore
+from game.models import Board, GameState, PlayerEnum
+from game.profiling import add_profile_arguments, run_main
+from game.search import Searcher, side_to_move
+from game.ttable import TranspositionTable
+
+# table file prefix of a pool worker process, set up by `_init_worker`, and
+# the transposition tables it opened, by entrant name
+_table_path: Optional[str] = None
+_tables: Dict[str, TranspositionTable] = {}
+
+ROUND_ROBIN = "round-robin"
+GAUNTLET = "gauntlet"
+
+
+class Entrant:
+    """Bot configuration taking part in a tournament.
+
+    Attributes:
+        `name`: unique name of the entrant, used in ratings and records.
+        `depth`: search depth, in plies, when there is no time budget.
+        `time_budget`: time allowed per move, in seconds, if any.
+    """
+
+    __slots__ = ("name", "depth", "time_budget")
+
+    name: str
+    depth: int
+    time_budget: Optional[float]
+
+    def __init__(
+        self,
+        name: str,
+        depth: int = settings.BOT_DEPTH,
+        time_budget: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.depth = depth
+        self.time_budget = time_budget
+
+    def make_player(
+        self, mark: str, board: Board, table: Optional[TranspositionTable] = None
+    ) -> BotPlayer:
+        """Returns the bot of this entrant, searching with `table` if given."""
+        return BotPlayer(
+            self.name,
+            mark,
+            board,
+            searcher=Searcher(table) if table is not None else None,
+            depth=self.depth,
+            time_budget=self.time_budget,
+        )
+
+
+class Pairing:
+    """One scheduled game of a tournament.
+
+    Attributes:
+        `number`: position of the game in the schedule, stable across runs.
+        `first`: index of the entrant moving first.
+        `second`: index of the entrant moving second.
+        `seed`: seed of the random opening, shared by both colours of a pair.
+    """
+
+    __slots__ = ("number", "first", "second", "seed")
+
+    number: int
+    first: int
+    second: int
+    seed: int
+
+    def __init__(self, number: int, first: int, second: int, seed: int) -> None:
+        self.number = number
+        self.first = first
+        self.second = second
+        self.seed = seed
+
+
+def schedule(
+    entrant_count: int, mode: str = ROUND_ROBIN, rounds: int = 1
+) -> List[Pairing]:
+    """Returns the games of a tournament, each pair playing both colours.
+
+    A round-robin pairs every entrant with every other one; a gauntlet pairs
+    the first entrant with each of the others. Every round repeats the pairs
+    with a new random opening.
+    """
+    if mode == GAUNTLET:
+        pairs = [(0, other) for other in range(1, entrant_count)]
+    elif mode == ROUND_ROBIN:
+        pairs = [
+            (a, b) for a in range(entrant_count) for b in range(a + 1, entrant_count)
+        ]
+    else:
+        raise ValueError(f"unknown tournament mode {mode!r}")
+    pairings: List[Pairing] = []
+    for round_number in range(rounds):
+        for a, b in pairs:
+            seed = len(pairings)
+            for first, second in [(a, b), (b, a)]:
+                pairings.append(Pairing(len(pairings), first, second, seed))
+    return pairings
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Returns the score expected from a player against `opponent`, in [0, 1]."""
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+
+def entrant_table_path(table_path: str, name: str) -> str:
+    """Returns the table file of entrant `name`, e.g. `ttable-depth2.bin`."""
+    root, extension = os.path.splitext(table_path)
+    return f"{root}-{name}{extension}"
+
+
+def play_game(
+    entrants: Sequence[Entrant],
+    pairing: Pairing,
+    size: int,
+    opening_plies: int = settings.TOURNAMENT_OPENING_PLIES,
+    tables: Optional[Dict[str, TranspositionTable]] = None,
+) -> GameRecord:
+    """Plays the game of `pairing` between two bots, without printing.
+
+    The first `opening_plies` moves are random, drawn from `pairing.seed`,
+    so that deterministic bots do not replay the same game every round.
+    Each bot searches with its table in `tables`, by entrant name, if there
+    is one, and with a fresh table otherwise.
+    """
+    tables = tables or {}
+    board = Board(size, verbose=False)
+    seated = [entrants[pairing.first], entrants[pairing.second]]
+    marks = PlayerEnum.list_marks()
+    players = [
+        entrant.make_player(mark, board, tables.get(entrant.name))
+        for entrant, mark in zip(seated, marks)
+    ]
+    rng = random.Random(pairing.seed)
+    while True:
+        if board.move_count < opening_plies:
+            move = rng.choice(board.empty_cells())
+        else:
+            move = players[board.move_count % len(players)].choose_move()
+        mover = players[board.move_count % len(players)]
+        board.place(move, side_to_move(board))
+        if board.is_winning_cell(move):
+            outcome, winner = GameState.WIN.value, mover.name
+            break
+        if not board.empty_cells():
+            outcome, winner = GameState.DRAW.value, None
+            break
+    return GameRecord(
+        size,
+        [(player.name, player.mark) for player in players],
+        board.moves,
+        outcome,
+        winner,
+    )
+
+
+def _play_pairing(
+    entrants: Sequence[Entrant], pairing: Pairing, size: int, opening_plies: int
+) -> Tuple[int, GameRecord]:
+    if _table_path is not None:
+        for entrant in (entrants[pairing.first], entrants[pairing.second]):
+            if entrant.name not in _tables:
+                # entries are verified against their key, so every worker can
+                # map the same file and write to it without locking
+                path = entrant_table_path(_table_path, entrant.name)
+                _tables[entrant.name] = TranspositionTable(path)
+    game = play_game(entrants, pairing, size, opening_plies, _tables)
+    return pairing.number, game
+
+
+def _init_worker(table_path: Optional[str]) -> None:
+    global _table_path
+    _table_path = table_path
+
+
+class Tournament:
+    """Plays a schedule of bot games in a pool of worker processes.
+
+    Ratings are updated with the Elo formula as each game finishes, in the
+    order games finish. Progress is saved to `checkpoint_path` every
+    `checkpoint_every` games and at the end of `run`, so running the same
+    tournament again only plays the games still missing. A checkpoint only
+    resumes a tournament with the same entrants, depths and time budgets,
+    schedule, board size and openings.
+
+    With a `table_path`, each entrant searches with a transposition table of
+    its own, kept in a file named after it (see `entrant_table_path`) and
+    shared by every worker and later runs. Tables are never shared between
+    entrants: an entry searched deeper is trusted at any shallower depth, so
+    a shallow entrant would play at the strength of the deepest one. Keep
+    each entrant's name for a single configuration, as its table file is
+    reused whenever the name comes back.
+
+    Attributes:
+        `entrants`: bot configurations taking part.
+        `pairings`: every game of the tournament, see `schedule`.
+        `mode`: `ROUND_ROBIN` or `GAUNTLET`, see `schedule`.
+        `size`: board size of every game.
+        `ratings`: current Elo rating of each entrant, by name.
+        `scores`: wins, draws and losses of each entrant, by name.
+        `table_path`: prefix of the transposition table files of the
+            entrants, if any.
+        `done`: numbers of the pairings already played.
+        `games_played`: games played by the latest `run`.
+        `elapsed`: wall-clock duration of the latest `run`, in seconds.
+    """
+
+    entrants: List[Entrant] = []
+    pairings: List[Pairing] = []
+    mode: str = ROUND_ROBIN
+    size: int = 3
+    ratings: Dict[str, float] = {}
+    scores: Dict[str, List[int]] = {}
+    table_path: Optional[str] = None
+    done: set = set()
+    games_played: int = 0
+    elapsed: float = 0.0
+
+    def __init__(
+        self,
+        entrants: Sequence[Entrant],
+        size: int,
+        mode: str = ROUND_ROBIN,
+        rounds: int = 1,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = settings.TOURNAMENT_CHECKPOINT_EVERY,
+        k_factor: float = settings.ELO_K_FACTOR,
+        opening_plies: int = settings.TOURNAMENT_OPENING_PLIES,
+        table_path: Optional[str] = None,
+    ) -> None:
+        self.entrants = list(entrants)
+        self.pairings = schedule(len(self.entrants), mode, rounds)
+        self.mode = mode
+        self.size = size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.k_factor = k_factor
+        self.opening_plies = opening_plies
+        self.table_path = table_path
+        self.ratings = {e.name: float(settings.ELO_INITIAL) for e in self.entrants}
+        self.scores = {e.name: [0, 0, 0] for e in self.entrants}
+        self.done = set()
+        self.games_played = 0
+        self.elapsed = 0.0
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self._load()
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games_played / self.elapsed if self.elapsed else 0.0
+
+    def run(
+        self,
+        workers: Optional[int] = settings.TOURNAMENT_WORKERS,
+        history: Optional[HistoryStore] = None,
+    ) -> Iterator[GameRecord]:
+        """Plays the games not played yet, yielding each one as it finishes.
+
+        Args:
+          workers: number of worker processes, by default one per CPU.
+          history: store every finished game is recorded in, if any.
+        """
+        start = time.perf_counter()
+        self.games_played = 0
+        pending = [p for p in self.pairings if p.number not in self.done]
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.table_path,),
+        )
+        futures: list = []
+        try:
+            futures = [
+                pool.submit(
+                    _play_pairing,
+                    self.entrants,
+                    pairing,
+                    self.size,
+                    self.opening_plies,
+                )
+                for pairing in pending
+            ]
+            for future in as_completed(futures):
+                number, record = future.result()
+                self.record(number, record)
+                if history is not None:
+                    history.record(record)
+                self.games_played += 1
+                self.elapsed = time.perf_counter() - start
+                if self.games_played % self.checkpoint_every == 0:
+                    self.save()
+                yield record
+        finally:
+            # games not started yet are dropped if the caller stops early
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+            self.elapsed = time.perf_counter() - start
+            self.save()
+
+    def record(self, number: int, game: GameRecord) -> None:
+        """Updates ratings and scores with the result of pairing `number`."""
+        (first, _), (second, _) = game.players
+        if game.winner is None:
+            score = 0.5
+        else:
+            score = 1.0 if game.winner == first else 0.0
+        delta = self.k_factor * (
+            score - expected_score(self.ratings[first], self.ratings[second])
+        )
+        self.ratings[first] += delta
+        self.ratings[second] -= delta
+        # wins, draws, losses
+        column = {1.0: 0, 0.5: 1, 0.0: 2}
+        self.scores[first][column[score]] += 1
+        self.scores[second][column[1.0 - score]] += 1
+        self.done.add(number)
+
+    def save(self) -> None:
+        """Writes the progress to `checkpoint_path`, replacing it atomically."""
+        if self.checkpoint_path is None:
+            return
+        state = self._settings()
+        state.update(
+            {
+                "ratings": self.ratings,
+                "scores": self.scores,
+                "done": sorted(self.done),
+            }
+        )
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as checkpoint:
+            json.dump(state, checkpoint)
+        os.replace(temporary, self.checkpoint_path)
+
+    def _load(self) -> None:
+        with open(self.checkpoint_path) as checkpoint:
+            state = json.load(checkpoint)
+        if any(state.get(key) != value for key, value in self._settings().items()):
+            raise ValueError(
+                f"{self.checkpoint_path} belongs to a different tournament"
+            )
+        self.ratings = state["ratings"]
+        self.scores = state["scores"]
+        self.done = set(state["done"])
+
+    def _settings(self) -> Dict[str, object]:
+        """Returns what a checkpoint must match to resume this tournament.
+
+        Values are the ones read back from JSON, lists rather than tuples.
+        """
+        return {
+            "entrants": [[e.name, e.depth, e.time_budget] for e in self.entrants],
+            "pairings": len(self.pairings),
+            "size": self.size,
+            "mode": self.mode,
+            "opening_plies": self.opening_plies,
+        }
+
+    def standings(self) -> str:
+        """Returns the table of entrants, best rated first."""
+        lines = [f"{'entrant':<16} {'elo':>6} {'win':>5} {'draw':>5} {'loss':>5}"]
+        for name in sorted(self.ratings, key=self.ratings.get, reverse=True):
+            wins, draws, losses = self.scores[name]
+            lines.append(
+                f"{name:<16} {self.ratings[name]:>6.0f} "
+                f"{wins:>5} {draws:>5} {losses:>5}"
+            )
+        lines.append(
+            f"{len(self.done)}/{len(self.pairings)} games, {self.games_played} "
+            f"this run at {self.games_per_second:,.1f} games/s"
+        )
+        return "\n".join(lines)
+
+
+def main(args: argparse.Namespace) -> None:
+    tournament = Tournament(
+        [Entrant(f"depth{depth}", depth) for depth in args.depths],
+        args.size,
+        args.mode,
+        args.rounds,
+        args.checkpoint,
+        table_path=args.table,
+    )
+    for _ in tournament.run(args.workers):
+        pass
+    print(tournament.standings())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rate bots of different search depths against each other"
+    )
+    parser.add_argument("--size", type=int, choices=settings.ALLOWED_SIZE, default=4)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", choices=[ROUND_ROBIN, GAUNTLET], default=ROUND_ROBIN)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=settings.TOURNAMENT_WORKERS)
+    parser.add_argument("--checkpoint", default=settings.TOURNAMENT_CHECKPOINT_PATH)
+    parser.add_argument(
+        "--table",
+        metavar="PATH",
+        help="prefix of the transposition table file of each entrant, e.g. "
+        f"{settings.TT_PATH} for ttable-<entrant>.bin",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_main(args, main, args)
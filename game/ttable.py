@@ -0,0 +1,227 @@
+import mmap
+import os
+import struct
+from typing import Optional
+
+import config as settings
+
+MAGIC = b"TTT1"
+HEADER = struct.Struct("<4sI")
+SLOT = struct.Struct("<QQ")
+BUCKET_SIZE = 4
+NO_MOVE = 0xFFFF
+
+
+class Bound:
+    """Meaning of the score of a `TTEntry`."""
+
+    EXACT = 1
+    LOWER = 2
+    UPPER = 3
+
+
+class TTEntry:
+    """A search result cached for one position.
+
+    Attributes:
+        `score`: score of the position for the side to move.
+        `depth`: remaining search depth the score was computed with.
+        `bound`: one of the `Bound` values.
+        `move`: flat index of the best move found, `NO_MOVE` if none.
+    """
+
+    __slots__ = ("score", "depth", "bound", "move")
+
+    score: int
+    depth: int
+    bound: int
+    move: int
+
+    def __init__(self, score: int, depth: int, bound: int, move: int = NO_MOVE):
+        self.score = score
+        self.depth = depth
+        self.bound = bound
+        self.move = move
+
+    def pack(self) -> int:
+        return (
+            (self.score + 0x8000)
+            | (self.depth << 16)
+            | (self.bound << 24)
+            | (self.move << 32)
+        )
+
+    @classmethod
+    def unpack(cls, data: int) -> "TTEntry":
+        return cls(
+            (data & 0xFFFF) - 0x8000,
+            (data >> 16) & 0xFF,
+            (data >> 24) & 0xFF,
+            (data >> 32) & 0xFFFF,
+        )
+
+
+class TranspositionTable:
+    """Fixed-size position cache keyed by `game.search.table_key`.
+
+    Entries live in a memory-mapped file, in buckets of `BUCKET_SIZE` slots of
+    16 bytes. Each slot stores the packed entry and the key XOR-ed with it, so
+    an entry torn by a concurrent writer fails verification and reads as a
+    miss instead of a wrong result. Any number of processes can therefore map
+    the same file, read-only or not, without locking.
+
+    Without `path`, the table lives in anonymous memory and is lost on close.
+    A table may be layered over a `parent` table, typically a shared
+    read-only one, which answers the lookups it misses.
+
+    Attributes:
+        `path`: path of the backing file, if any.
+        `slots`: number of slots, a power of two.
+        `readonly`: whether `store` is disabled.
+        `parent`: table looked up on misses, if any.
+        `probes`: number of lookups.
+        `hits`: number of lookups that found their position.
+        `stores`: number of entries written.
+    """
+
+    path: Optional[str] = None
+    slots: int = settings.TT_SLOTS
+    readonly: bool = False
+    parent: Optional["TranspositionTable"] = None
+    probes: int = 0
+    hits: int = 0
+    stores: int = 0
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        slots: int = settings.TT_SLOTS,
+        readonly: bool = False,
+        warm_start: bool = True,
+        parent: Optional["TranspositionTable"] = None,
+    ) -> None:
+        """Opens or creates a table.
+
+        Args:
+          path: backing file, shared by every process opening it.
+          slots: number of slots of a new table, rounded up to a power of two.
+            Existing files keep their own size.
+          readonly: map the file read-only, it must exist.
+          warm_start: keep the entries of an existing file, or clear them.
+          parent: table looked up on misses, it is never written to.
+        """
+        self.path = path
+        self.readonly = readonly
+        self.parent = parent
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        slots = max(BUCKET_SIZE, 1 << (max(slots, 1) - 1).bit_length())
+        length = HEADER.size + slots * SLOT.size
+        if path is None:
+            self._file = None
+            self._map = mmap.mmap(-1, length)
+            HEADER.pack_into(self._map, 0, MAGIC, slots)
+        else:
+            if readonly:
+                self._file = open(path, "rb")
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                if not os.path.exists(path):
+                    self._create(path, slots, length)
+                self._file = open(path, "r+b")
+                self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, slots = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != HEADER.size + slots * SLOT.size:
+            self.close()
+            raise ValueError(f"{path} is not a transposition table")
+        self.slots = slots
+        self._mask = slots - BUCKET_SIZE
+        if not warm_start and not readonly:
+            self.clear()
+
+    @staticmethod
+    def _create(path: str, slots: int, length: int) -> None:
+        """Creates the file of an empty table, unless another process just did.
+
+        The table is written to a temporary file first and then linked into
+        place, which fails instead of replacing a file created in the
+        meantime, so every process ends up mapping the same complete file.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as new_file:
+                new_file.truncate(length)
+                new_file.write(HEADER.pack(MAGIC, slots))
+            try:
+                os.link(temporary, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.remove(temporary)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def lookup(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        offset = HEADER.size + (key & self._mask) * SLOT.size
+        for _ in range(BUCKET_SIZE):
+            check, data = SLOT.unpack_from(self._map, offset)
+            if data and check ^ data == key:
+                self.hits += 1
+                return TTEntry.unpack(data)
+            offset += SLOT.size
+        if self.parent is not None:
+            return self.parent.lookup(key)
+        return None
+
+    def store(
+        self, key: int, score: int, depth: int, bound: int, move: int = NO_MOVE
+    ) -> None:
+        """Caches a search result, replacing the shallowest entry of the bucket."""
+        if self.readonly:
+            return
+        data = TTEntry(score, depth, bound, move).pack()
+        offset = HEADER.size + (key & self._mask) * SLOT.size
+        target = offset
+        shallowest = None
+        for _ in range(BUCKET_SIZE):
+            check, stored = SLOT.unpack_from(self._map, offset)
+            if not stored or check ^ stored == key:
+                target = offset
+                break
+            depth_stored = (stored >> 16) & 0xFF
+            if shallowest is None or depth_stored < shallowest:
+                shallowest = depth_stored
+                target = offset
+            offset += SLOT.size
+        SLOT.pack_into(self._map, target, key ^ data, data)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self._map[HEADER.size :] = bytes(len(self._map) - HEADER.size)
+
+    def flush(self) -> None:
+        if not self.readonly:
+            self._map.flush()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self.flush()
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def summary(self) -> str:
+        return (
+            f"Transposition table: {self.probes} probes, {self.hits} hits "
+            f"({self.hit_rate:.0%} hit rate), {self.stores} stores"
+        )
+
+    def __enter__(self) -> "TranspositionTable":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
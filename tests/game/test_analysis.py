@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from game import analysis
+from game.analysis import analyze
+from game.models import MARK_CODES, Board
+from game.search import WIN_SCORE
+from game.ttable import Bound, TranspositionTable
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+class TestAnalyze(BaseTestCase):
+    def test_every_move_scored(self):
+        board = Board(3, verbose=False)
+        for index, code in [(0, X), (3, O), (1, X), (4, O)]:
+            board.place(index, code)
+        results = list(analyze(board, depth=4, workers=2))
+        self.assertEqual(sorted(r.move for r in results), board.empty_cells())
+        by_move = {r.move: r for r in results}
+        self.assertEqual(by_move[2].score, WIN_SCORE - 5)
+        self.assertEqual(by_move[2].pv, [2])
+        # anything else lets O complete the middle row
+        for move in [6, 7, 8]:
+            self.assertLess(by_move[move].score, 0)
+            self.assertEqual(by_move[move].pv[:2], [move, 5])
+        self.assertEqual(list(board.moves), [0, 3, 1, 4])
+
+    def test_position_set_through_grid(self):
+        board = Board(3, verbose=False)
+        board.grid = [["X", "X", "_"], ["O", "O", "_"], ["_", "_", "_"]]
+        by_move = {r.move: r for r in analyze(board, depth=3, workers=1)}
+        self.assertEqual(sorted(by_move), [2, 5, 6, 7, 8])
+        self.assertEqual((by_move[2].score, by_move[2].pv), (WIN_SCORE - 5, [2]))
+        for move in [5, 6, 7, 8]:
+            self.assertLess(by_move[move].score, by_move[2].score)
+            self.assertTrue(set(by_move[move].pv).isdisjoint([0, 1, 3, 4]))
+
+    def test_stop_early(self):
+        results = analyze(Board(4, verbose=False), depth=3, workers=1)
+        first = next(results)
+        results.close()
+        self.assertIn(first.move, range(16))
+
+    def test_shared_table(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ttable.bin")
+            with TranspositionTable(path, slots=64) as table:
+                table.store(42, 7, 3, Bound.EXACT)
+            analysis._init_worker(path)
+            table = analysis._searcher.table
+            self.assertTrue(table.parent.readonly)
+            self.assertEqual(table.lookup(42).score, 7)
+            table.parent.close()
+            table.close()
+            analysis._init_worker(os.path.join(tmp, "missing.bin"))
+            self.assertIsNone(analysis._searcher.table.parent)
@@ -0,0 +1,84 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from game.arena import BoardArena
+from game.models import MARK_CODES, Board
+from game.search import side_to_move
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+# arena of a pool worker process
+_arena = None
+
+
+def _attach(name: str) -> None:
+    global _arena
+    _arena = BoardArena.attach(name)
+
+
+def _play_out(slot: int, seed: int) -> int:
+    """Finishes the game of `slot` with random moves, returning its length."""
+    board = _arena.load(slot)
+    rng = random.Random(seed)
+    while board.empty_cells():
+        move = rng.choice(board.empty_cells())
+        board.place(move, side_to_move(board))
+        _arena.place(slot, move, board.cells[move])
+        if board.is_winning_cell(move):
+            break
+    return _arena.move_count(slot)
+
+
+class TestBoardArena(BaseTestCase):
+    def test_store_and_load(self):
+        board = Board(4, verbose=False)
+        for index, code in [(5, X), (0, O), (15, X)]:
+            board.place(index, code)
+        with BoardArena(4, 3) as arena:
+            self.assertEqual(arena.slot_size, 2 + 32)
+            arena.store(1, board)
+            self.assertEqual(arena.move_count(0), 0)
+            self.assertEqual(bytes(arena.cells(0)), b"_" * 16)
+            self.assertEqual(bytes(arena.cells(1)), bytes(board.cells))
+            loaded = arena.load(1, Board(4, verbose=False))
+            self.assertEqual(list(loaded.moves), [5, 0, 15])
+            self.assertEqual(loaded.position_hash, board.position_hash)
+            self.assertEqual(loaded.window_score, board.window_score)
+            arena.place(1, 10, O)
+            board.place(10, O)
+            self.assertEqual(list(arena.load(1).moves), list(board.moves))
+            arena.clear(1)
+            self.assertEqual(arena.load(1).move_count, 0)
+            with self.assertRaises(IndexError):
+                arena.store(3, board)
+        with self.assertRaises(ValueError):
+            BoardArena(17, 1)
+
+    def test_load_marks_without_moves(self):
+        board = Board(3, verbose=False)
+        board.grid = [["X", "X", "_"], ["O", "O", "_"], ["_", "_", "_"]]
+        with BoardArena(3, 1) as arena:
+            arena.store(0, board)
+            loaded = arena.load(0)
+        self.assertEqual(bytes(loaded.cells), bytes(board.cells))
+        self.assertEqual(loaded.move_count, 4)
+        self.assertEqual(loaded.position_hash, board.position_hash)
+        self.assertEqual(loaded.window_score, board.window_score)
+
+    def test_shared_with_workers(self):
+        with BoardArena(5, 8) as arena:
+            board = Board(5, verbose=False)
+            board.place(12, X)
+            for slot in range(8):
+                arena.store(slot, board)
+            pool = ProcessPoolExecutor(2, initializer=_attach, initargs=(arena.name,))
+            with pool:
+                lengths = list(pool.map(_play_out, range(8), range(8)))
+            for slot, length in enumerate(lengths):
+                played = arena.load(slot)
+                self.assertEqual(played.move_count, length)
+                self.assertEqual(played.moves[0], 12)
+                self.assertTrue(
+                    played.is_winning_cell(played.moves[-1]) or not played.empty_cells()
+                )
@@ -0,0 +1,27 @@
+import io
+
+from game.batch import ScriptedPlayer, read_games
+from game.errors import PositionDoesNotExist
+from tests.test_base import BaseTestCase
+
+
+class TestBatch(BaseTestCase):
+    def test_read_games(self):
+        script = io.StringIO("# comment\n3\nA\nB\n1,1\n 2,2 \n\n\n4\nC\nD\n\n5\nE\n")
+        games = list(read_games(script))
+        self.assertEqual([g.number for g in games], [1, 2, 3])
+        self.assertEqual(games[0].size, "3")
+        self.assertEqual(games[0].names, ["A", "B"])
+        self.assertEqual(games[0].moves, ["1,1", "2,2"])
+        self.assertEqual(games[1].moves, [])
+        self.assertEqual(games[2].names, ["E"])
+
+    def test_scripted_player_shares_moves(self):
+        moves = iter(["1,1", "x", "2,2"])
+        first = ScriptedPlayer("A", "X", moves)
+        second = ScriptedPlayer("B", "O", moves)
+        self.assertEqual(first.ask_for_input(), "1,1")
+        self.assertEqual(second.ask_for_input(), "x")
+        self.assertEqual(second.retry_input(error=PositionDoesNotExist()), "2,2")
+        with self.assertRaises(StopIteration):
+            first.ask_for_input()
@@ -0,0 +1,21 @@
+from game.bench import bench_clone, bench_ordering, bench_parse, format_results
+from tests.test_base import BaseTestCase
+
+
+class TestBench(BaseTestCase):
+    def test_bench_clone(self):
+        results = bench_clone(sizes=[3], number=100)
+        self.assertEqual(results[0]["size"], 3)
+        self.assertGreater(results[0]["clone"], 0)
+        self.assertGreater(results[0]["deepcopy"], 0)
+        self.assertIn("3x3", format_results("Board cloning", results))
+
+    def test_bench_parse(self):
+        results = bench_parse(sizes=[3], number=1)
+        self.assertGreater(results[0]["parse_moves"], 0)
+        self.assertGreater(results[0]["per_line"], 0)
+
+    def test_bench_ordering(self):
+        results = bench_ordering(sizes=[4], depth=5)
+        self.assertLess(results[0]["ordered"], results[0]["plain"])
+        self.assertIn("plain ", format_results("Nodes", results, unit=" "))
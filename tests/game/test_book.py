@@ -0,0 +1,92 @@
+import os
+import tempfile
+from unittest import mock
+
+import config as settings
+from game.book import OpeningBook, build_book, canonical_key, early_positions
+from game.book import load_book
+from game.models import MARK_CODES, Board
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+class TestCanonicalKey(BaseTestCase):
+    def test_symmetric_positions(self):
+        keys = set()
+        for corner in [0, 2, 6, 8]:
+            board = Board(3, verbose=False)
+            board.place(corner, X)
+            key, symmetry = canonical_key(board)
+            keys.add(key)
+            self.assertEqual(board.cells[corner], X)
+            self.assertIn(symmetry[corner], [0, 2, 6, 8])
+        self.assertEqual(len(keys), 1)
+
+        board = Board(3, verbose=False)
+        board.place(4, X)
+        self.assertNotIn(canonical_key(board)[0], keys)
+
+    def test_early_positions(self):
+        # empty board, 3 distinct first moves and 12 distinct replies
+        self.assertEqual(len(early_positions(3, 1)), 1)
+        self.assertEqual(len(early_positions(3, 2)), 4)
+        self.assertEqual(len(early_positions(3, 3)), 16)
+
+
+class TestOpeningBook(BaseTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "book3.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_probe(self):
+        entries = {7: (4, 0), 3: (0, -12), 2**63: (8, 990)}
+        OpeningBook.write(self.path, 3, settings.WIN_LENGTH, entries)
+        book = OpeningBook(self.path)
+        self.assertEqual((book.size, book.count), (3, 3))
+        for key, entry in entries.items():
+            self.assertEqual(book.probe(key), entry)
+        self.assertIsNone(book.probe(5))
+        book.close()
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a book at all")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+    def test_lookup_maps_symmetry(self):
+        board = Board(3, verbose=False)
+        board.place(0, X)
+        board.place(1, O)
+        key, symmetry = canonical_key(board)
+        OpeningBook.write(self.path, 3, settings.WIN_LENGTH, {key: (symmetry[8], 0)})
+        book = OpeningBook(self.path)
+        self.assertEqual(book.lookup(board), 8)
+
+        # left-right mirror image of `board`
+        mirrored = Board(3, verbose=False)
+        mirrored.place(2, X)
+        mirrored.place(1, O)
+        self.assertEqual(book.lookup(mirrored), 6)
+        self.assertIsNone(book.lookup(Board(3, verbose=False)))
+        self.assertIsNone(book.lookup(Board(4, verbose=False)))
+        self.assertEqual((book.hits, book.misses), (2, 1))
+        book.close()
+
+    def test_build_book(self):
+        entries = build_book(3, plies=2, depth=9)
+        self.assertEqual(len(entries), 4)
+        self.assertTrue(all(score == 0 for _, score in entries.values()))
+
+    def test_load_book(self):
+        book_path = os.path.join(self.tmp.name, "book{size}.bin")
+        with mock.patch.object(settings, "BOOK_PATH", book_path):
+            self.assertIsNone(load_book(3))
+            OpeningBook.write(self.path, 3, settings.WIN_LENGTH, {})
+            book = load_book(3)
+        self.assertEqual(book.count, 0)
+        book.close()
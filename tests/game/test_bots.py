@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import config as settings
+from game.book import OpeningBook, canonical_key
+from game.bots import BotPlayer, Ponderer
+from game.errors import PositionAlreadyTaken
+from game.models import MARK_CODES, Board
+from game.search import Searcher, side_to_move
+from game.ttable import NO_MOVE
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+class TestBotPlayer(BaseTestCase):
+    def test_ask_for_input(self):
+        board = Board(3, verbose=False)
+        for index, code in [(0, X), (3, O), (1, X), (4, O)]:
+            board.place(index, code)
+        bot = BotPlayer("Bot", "X", board, depth=2)
+        self.assertEqual(bot.ask_for_input(), "1,3")
+        self.assertEqual(bot.retry_input(PositionAlreadyTaken()), "1,3")
+
+    def test_book_before_search(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book3.bin")
+            board = Board(3, verbose=False)
+            key, symmetry = canonical_key(board)
+            OpeningBook.write(path, 3, settings.WIN_LENGTH, {key: (symmetry[8], 0)})
+            book = OpeningBook(path)
+            bot = BotPlayer("Bot", "X", board, book=book)
+            self.assertEqual(bot.choose_move(), 8)
+            self.assertEqual(bot.searcher.nodes, 0)
+
+            board.place(8, X)
+            self.assertIn(bot.choose_move(), board.empty_cells())
+            self.assertGreater(bot.searcher.nodes, 0)
+            self.assertEqual((book.hits, book.misses), (1, 1))
+            book.close()
+
+
+class TestPondering(BaseTestCase):
+    def play_reply(self, bot: BotPlayer, predicted: bool) -> None:
+        board = bot.board
+        move = bot.choose_move()
+        reply = bot.last_result.pv[1]
+        if not predicted:
+            reply = next(i for i in board.empty_cells() if i not in (move, reply))
+        self.assertTrue(bot.ponderer.running)
+        board.place(move, side_to_move(board))
+        board.place(reply, side_to_move(board))
+        time.sleep(0.02)
+
+    def test_ponder_hit(self):
+        bot = BotPlayer("Bot", "X", Board(4, verbose=False), time_budget=0.02)
+        bot.ponderer = Ponderer(bot.searcher)
+        self.play_reply(bot, predicted=True)
+        move = bot.choose_move()
+        self.assertEqual(bot.last_source, "ponder")
+        self.assertEqual(move, bot.last_result.move)
+        self.assertEqual((bot.ponderer.hits, bot.ponderer.misses), (1, 0))
+        bot.stop_pondering()
+        self.assertFalse(bot.ponderer.running)
+
+    def test_ponder_hit_is_deepened(self):
+        board = Board(4, verbose=False)
+        pondered = Searcher().search(board, 1)
+        bot = BotPlayer("Bot", "X", board, depth=3)
+        self.assertEqual(bot._search(board, pondered).depth, 3)
+        deep = Searcher().search(board, 4)
+        self.assertIs(bot._search(board, deep), deep)
+        bot.time_budget = 0.05
+        bot.searched_depth = 3
+        result = bot._search(board, pondered)
+        self.assertGreater(result.depth, 1)
+        self.assertEqual(bot.searched_depth, result.depth)
+
+    def test_ponder_hit_answers_at_once(self):
+        board = Board(4, verbose=False)
+        deep = Searcher().search(board, 4)
+        bot = BotPlayer("Bot", "X", board, time_budget=10.0)
+        bot.searched_depth = 4
+        start = time.perf_counter()
+        self.assertIs(bot._search(board, deep, start), deep)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        # nothing of the budget is left to deepen a shallower result
+        shallow = Searcher().search(board, 1)
+        with mock.patch("game.search.CLOCK_INTERVAL", 1):
+            self.assertIs(bot._search(board, shallow, start - 10.0), shallow)
+
+    def test_ponder_miss(self):
+        bot = BotPlayer("Bot", "X", Board(4, verbose=False), time_budget=0.02)
+        bot.ponderer = Ponderer(bot.searcher)
+        self.play_reply(bot, predicted=False)
+        move = bot.choose_move()
+        self.assertEqual(bot.last_source, "search")
+        self.assertIn(move, bot.board.empty_cells())
+        self.assertEqual((bot.ponderer.hits, bot.ponderer.misses), (0, 1))
+        bot.stop_pondering()
+
+    def test_ponder_after_win(self):
+        board = Board(3, verbose=False)
+        for index, code in [(0, X), (3, O), (1, X), (4, O)]:
+            board.place(index, code)
+        bot = BotPlayer("Bot", "X", board, depth=2, ponder=True)
+        self.assertEqual(bot.choose_move(), 2)
+        self.assertFalse(bot.ponderer.running)
+
+    def test_stop_first_iteration(self):
+        stop = threading.Event()
+        stop.set()
+        with mock.patch("game.search.CLOCK_INTERVAL", 1):
+            result = Searcher().search_timed(Board(5, verbose=False), 10.0, stop=stop)
+        self.assertEqual((result.move, result.depth), (NO_MOVE, 0))
@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from game.dataset import NPY_HEADER_SIZE, PositionWriter, read_npy_header
+from game.history import GameRecord
+from game.models import GameState
+from tests.test_base import BaseTestCase
+
+PLAYERS = [("alice", "X"), ("bob", "O")]
+# X completes the top row on its third move
+WIN = GameRecord(3, PLAYERS, [0, 3, 1, 4, 2], GameState.WIN.value, "alice")
+DRAW = GameRecord(3, PLAYERS, [0, 4, 8, 1, 7, 6, 2, 5, 3], GameState.DRAW.value)
+
+
+def read_array(directory: str, name: str, chunk: int = 0):
+    path = os.path.join(directory, f"{name}-{chunk:05d}.npy")
+    dtype, shape, offset = read_npy_header(path)
+    with open(path, "rb") as npy:
+        npy.seek(offset)
+        return dtype, shape, npy.read()
+
+
+class TestPositionWriter(BaseTestCase):
+    def test_samples(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with PositionWriter(tmp, 3, chunk_size=100) as writer:
+                writer.add_game(WIN)
+            self.assertEqual((writer.positions, writer.chunks), (5, 1))
+
+            dtype, shape, planes = read_array(tmp, "planes")
+            self.assertEqual((dtype, shape), ("|u1", (5, 3, 3, 3)))
+            # the position before the last move: X on 0 and 1, O on 3 and 4
+            last = planes[4 * 27 :]
+            self.assertEqual(last[:9], bytes([1, 1, 0, 0, 0, 0, 0, 0, 0]))
+            self.assertEqual(last[9:18], bytes([0, 0, 0, 1, 1, 0, 0, 0, 0]))
+            self.assertEqual(last[18:], bytes([1] * 9))
+            self.assertEqual(planes[27 + 18 : 2 * 27], bytes(9))
+
+            _, shape, masks = read_array(tmp, "masks")
+            self.assertEqual(shape, (5, 9))
+            self.assertEqual(masks[:9], bytes([1] * 9))
+            self.assertEqual(masks[36:], bytes([0, 0, 1, 0, 0, 1, 1, 1, 1]))
+
+            dtype, shape, moves = read_array(tmp, "moves")
+            self.assertEqual((dtype, shape), ("<i2", (5,)))
+            self.assertEqual(moves, b"\0\0\3\0\1\0\4\0\2\0")
+            dtype, _, outcomes = read_array(tmp, "outcomes")
+            self.assertEqual(dtype, "|i1")
+            self.assertEqual(list(outcomes), [1, 255, 1, 255, 1])
+
+    def test_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with PositionWriter(tmp, 3, chunk_size=4) as writer:
+                writer.add_game(DRAW)
+                writer.add_game(WIN)
+            self.assertEqual((writer.positions, writer.chunks), (14, 4))
+            _, shape, outcomes = read_array(tmp, "outcomes", 3)
+            self.assertEqual((shape, outcomes), ((2,), bytes([255, 1])))
+            path = os.path.join(tmp, "planes-00003.npy")
+            self.assertEqual(os.path.getsize(path), NPY_HEADER_SIZE + 2 * 27)
+            with self.assertRaises(ValueError):
+                writer.add_game(GameRecord(4, PLAYERS, [], GameState.DRAW.value))
+
+    @unittest.skipIf(
+        importlib.util.find_spec("numpy") is None, "NumPy is not installed"
+    )
+    def test_numpy_load(self):
+        import numpy
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with PositionWriter(tmp, 3, chunk_size=100) as writer:
+                writer.add_game(DRAW)
+            planes = numpy.load(os.path.join(tmp, "planes-00000.npy"), mmap_mode="r")
+            self.assertEqual(planes.shape, (9, 3, 3, 3))
+            self.assertEqual(planes[1, 0, 0, 0], 1)
+            masks = numpy.load(os.path.join(tmp, "masks-00000.npy"))
+            self.assertEqual(masks.sum(axis=1).tolist(), list(range(9, 0, -1)))
+            outcomes = numpy.load(os.path.join(tmp, "outcomes-00000.npy"))
+            self.assertEqual(outcomes.tolist(), [0] * 9)
@@ -0,0 +1,56 @@
+import io
+from typing import List
+
+from game.engine import run_engine
+from tests.test_base import BaseTestCase
+
+
+def run(*commands: str) -> List[str]:
+    """Returns the replies of the engine to `commands`."""
+    stdout = io.StringIO()
+    run_engine(io.StringIO("".join(f"{command}\n" for command in commands)), stdout)
+    return stdout.getvalue().splitlines()
+
+
+class TestRunEngine(BaseTestCase):
+    def test_go(self):
+        replies = run("newgame 3 3", "position moves 0 3 1 4", "go movetime 50")
+        self.assertTrue(replies[0].startswith("info depth "))
+        self.assertEqual(replies[1], "bestmove 2")
+
+    def test_invalid_commands(self):
+        replies = run(
+            "newgame x",
+            "go",
+            "newgame 3 3",
+            "position moves 99",
+            "go movetime 50",
+            "position moves 0 0",
+            "position moves 0 3 1 4 2 5",
+            "position moves x",
+            "position 0",
+            "go movetime abc",
+            "go movetime",
+            "position moves 0 1 2 4 3 5 7 6 8",
+            "go movetime 50",
+            "jump",
+            "isready",
+        )
+        self.assertEqual(
+            replies,
+            [
+                "error unsupported game x",
+                "error no game",
+                "error invalid cell 99",
+                "error no valid position",
+                "error cell 0 already taken",
+                "error move 5 after the end of the game",
+                "error invalid cell x",
+                "error invalid position 0",
+                "error invalid go movetime abc",
+                "error invalid go movetime",
+                "error game over",
+                "error unknown command jump",
+                "readyok",
+            ],
+        )
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from game.evaluator import BatchEvaluator, window_scores
+from game.models import MARK_CODES, Board
+from game.search import Searcher
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+def position(*moves: int) -> Board:
+    board = Board(4, verbose=False)
+    for ply, move in enumerate(moves):
+        board.place(move, MARK_CODES[ply % 2])
+    return board
+
+
+class TestBatchEvaluator(BaseTestCase):
+    def test_window_scores(self):
+        board = position(5)
+        self.assertEqual(window_scores([board]), [-board.window_score])
+        board.place(0, O)
+        self.assertEqual(window_scores([board]), [board.window_score])
+
+    def test_async_batches(self):
+        boards = [position(move) for move in range(8)]
+
+        async def run(evaluator):
+            return await asyncio.gather(*(evaluator.evaluate_async(b) for b in boards))
+
+        calls = []
+
+        def record_batch(batch):
+            calls.append(len(batch))
+            return window_scores(batch)
+
+        with BatchEvaluator(record_batch, max_batch=5, max_wait=0.1) as evaluator:
+            scores = asyncio.run(run(evaluator))
+        self.assertEqual(scores, window_scores(boards))
+        self.assertEqual(calls, [5, 3])
+        self.assertEqual(evaluator.batch_sizes, {5: 1, 3: 1})
+        self.assertEqual(evaluator.mean_batch_size, 4)
+        self.assertGreater(evaluator.max_latency, 0)
+        self.assertLessEqual(evaluator.mean_latency, evaluator.max_latency)
+        self.assertIn("8 positions in 2 batches", evaluator.summary())
+
+    def test_errors_reach_callers(self):
+        def broken(batch):
+            raise RuntimeError("model not loaded")
+
+        with BatchEvaluator(broken) as evaluator:
+            with self.assertRaises(RuntimeError):
+                evaluator.evaluate(position())
+        self.assertEqual(evaluator.positions, 0)
+
+    def test_short_batch_result(self):
+        with BatchEvaluator(lambda batch: [], max_batch=2, max_wait=0.1) as evaluator:
+            futures = [evaluator.submit(position(move)) for move in range(2)]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result(timeout=5)
+
+    def test_evaluate_after_close(self):
+        evaluator = BatchEvaluator()
+        evaluator.close()
+        evaluator.close()
+        with self.assertRaises(RuntimeError):
+            evaluator.evaluate(position())
+
+    def test_threaded_search(self):
+        board = position(5, 0)
+        expected = Searcher().search(board, 3)
+        results = [None] * 4
+        with BatchEvaluator(max_wait=0.002) as evaluator:
+
+            def search(index):
+                searcher = Searcher(evaluator=evaluator.evaluate)
+                results[index] = searcher.search(board.clone(), 3)
+
+            threads = [threading.Thread(target=search, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for result in results:
+            self.assertEqual((result.score, result.pv), (expected.score, expected.pv))
+        self.assertGreater(evaluator.mean_batch_size, 1)
+        self.assertLessEqual(max(evaluator.batch_sizes), 4)
@@ -0,0 +1,148 @@
+import asyncio
+import sys
+from unittest import mock
+
+from app import run_game_loop
+from game.errors import EngineError, EngineTimeout
+from game.external import EngineProcess, EnginePlayer, play_match
+from game.models import Board, GameState
+from tests.test_base import BaseTestCase
+
+ENGINE = [sys.executable, "-m", "game.engine"]
+# answers every position with a move to the first cell
+ILLEGAL_ENGINE = [
+    sys.executable,
+    "-c",
+    "import sys\n"
+    "for line in sys.stdin:\n"
+    "    if line.startswith('tttp'): print('id name illegal\\ntttpok', flush=True)\n"
+    "    if line.startswith('isready'): print('readyok', flush=True)\n"
+    "    if line.startswith('go'): print('bestmove 0', flush=True)\n"
+    "    if line.startswith('quit'): break\n",
+]
+# answers the handshake, then never moves
+SILENT_ENGINE = [
+    sys.executable,
+    "-c",
+    "import sys\n"
+    "for line in sys.stdin:\n"
+    "    if line.startswith('tttp'): print('id name silent\\ntttpok', flush=True)\n"
+    "    if line.startswith('isready'): print('readyok', flush=True)\n"
+    "    if line.startswith('quit'): break\n",
+]
+
+
+class TestEngineProcess(BaseTestCase):
+    def test_handshake_and_move(self):
+        async def run():
+            engine = EngineProcess(ENGINE)
+            await engine.start()
+            await engine.new_game(3)
+            move = await engine.best_move([0, 3, 1, 4], movetime=0.05)
+            await engine.quit()
+            return engine, move
+
+        engine, move = asyncio.run(run())
+        self.assertEqual(engine.name, "tictactoe-negamax")
+        self.assertEqual(move, 2)
+        self.assertEqual(engine.last_info["depth"], "1")
+
+    def test_errors(self):
+        async def run():
+            engine = EngineProcess(ENGINE)
+            await engine.start()
+            try:
+                with self.assertRaises(EngineError) as cm:
+                    await engine.new_game(9)
+                self.assertIn("unsupported game 9", cm.exception.message)
+            finally:
+                await engine.quit()
+
+        asyncio.run(run())
+
+    def test_timeout(self):
+        async def run():
+            engine = EngineProcess(SILENT_ENGINE, grace=0.1)
+            await engine.start()
+            await engine.new_game(3)
+            with self.assertRaises(EngineTimeout) as cm:
+                await engine.best_move([], movetime=0.05)
+            await engine.quit()
+            return cm.exception
+
+        error = asyncio.run(run())
+        self.assertIn("silent did not reply within 0.2", error.message)
+
+
+class TestPlayMatch(BaseTestCase):
+    def test_concurrent_matches(self):
+        async def run():
+            engines = [EngineProcess(ENGINE) for _ in range(4)]
+            await asyncio.gather(*(engine.start() for engine in engines))
+            try:
+                return await asyncio.gather(
+                    play_match(engines[:2], 3, movetime=0.05),
+                    play_match(engines[2:], 4, movetime=0.05),
+                )
+            finally:
+                await asyncio.gather(*(engine.quit() for engine in engines))
+
+        draw, win = asyncio.run(run())
+        self.assertEqual((draw.outcome, draw.winner), (GameState.DRAW.value, None))
+        self.assertEqual(len(draw.moves), 9)
+        self.assertEqual(win.outcome, GameState.WIN.value)
+        self.assertEqual(len(win.moves) % 2, 1)
+        # an engine playing a copy of itself is told apart by its seat
+        self.assertEqual(
+            win.players, [("tictactoe-negamax #1", "X"), ("tictactoe-negamax #2", "O")]
+        )
+        self.assertEqual(win.winner, "tictactoe-negamax #1")
+
+    def test_timeout_forfeits(self):
+        async def run():
+            engines = [EngineProcess(SILENT_ENGINE, grace=0.1), EngineProcess(ENGINE)]
+            await asyncio.gather(*(engine.start() for engine in engines))
+            try:
+                return await play_match(engines, 3, movetime=0.05)
+            finally:
+                await asyncio.gather(*(engine.quit() for engine in engines))
+
+        record = asyncio.run(run())
+        self.assertEqual((record.winner, record.moves), ("tictactoe-negamax", []))
+
+
+class TestEnginePlayer(BaseTestCase):
+    def test_game_loop(self):
+        board = Board(3, verbose=False)
+        players = [
+            EnginePlayer(mark, mark, EngineProcess(ENGINE), board, movetime=0.05)
+            for mark in ["X", "O"]
+        ]
+        for player in players:
+            player.start()
+        try:
+            winner = run_game_loop(board, players)
+        finally:
+            for player in players:
+                player.close()
+        self.assertIsNone(winner)
+        self.assertEqual(board.state, GameState.DRAW)
+
+    @mock.patch("app.print")
+    def test_forfeits(self, mock_print: mock.MagicMock):
+        for command, grace in [(ILLEGAL_ENGINE, 0.1), (SILENT_ENGINE, 0.1)]:
+            board = Board(3, verbose=False)
+            players = [
+                EnginePlayer("engine", "X", EngineProcess(ENGINE), board, 0.05),
+                EnginePlayer("faulty", "O", EngineProcess(command, grace), board, 0.05),
+            ]
+            for player in players:
+                player.start()
+            try:
+                winner = run_game_loop(board, players)
+            finally:
+                for player in players:
+                    player.close()
+            self.assertIs(winner, players[0])
+            self.assertEqual(board.state, GameState.WIN)
+            self.assertTrue(mock_print.call_args[0][0].startswith("faulty forfeits"))
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from game.history import GameRecord, HistoryStore
+from game.models import Board, GameState
+from tests.test_base import BaseTestCase
+
+
+class TestHistoryStore(BaseTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "history.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_and_query(self):
+        with HistoryStore(self.path, batch_size=2) as store:
+            store.record(GameRecord(3, [("A", "X"), ("B", "O")], [0, 4, 1], "win", "A"))
+            store.record(GameRecord(3, [("B", "X"), ("A", "O")], [4, 0, 8], "win", "B"))
+            store.record(GameRecord(4, [("A", "X"), ("C", "O")], [0], "draw"))
+            store.flush()
+            self.assertEqual(store.count_games(), 3)
+            self.assertEqual(store.count_games(board_size=3), 2)
+            self.assertEqual(store.count_games(outcome=GameState.DRAW.value), 1)
+            # ties on wins are broken by fewest games played
+            self.assertEqual(
+                store.leaderboard(), [("B", 1, 2), ("A", 1, 3), ("C", 0, 1)]
+            )
+            self.assertEqual(
+                store.leaderboard(board_size=4), [("A", 0, 1), ("C", 0, 1)]
+            )
+
+            history = store.player_history("B")
+            self.assertEqual(len(history), 2)
+            self.assertEqual(history[0].players, [("B", "X"), ("A", "O")])
+            self.assertEqual(history[0].moves, [4, 0, 8])
+            self.assertEqual(history[0].winner, "B")
+            self.assertEqual(store.failed, 0)
+
+        with HistoryStore(self.path) as reopened:
+            self.assertEqual(reopened.count_games(), 3)
+            journal_mode = reopened._reader.execute("PRAGMA journal_mode").fetchone()
+            self.assertEqual(journal_mode, ("wal",))
+
+    def test_record_does_not_wait_for_writer(self):
+        with HistoryStore(self.path) as store:
+            written = threading.Event()
+            write = store._write
+
+            def slow_write(connection, games):
+                written.wait(5)
+                write(connection, games)
+
+            with mock.patch.object(store, "_write", side_effect=slow_write):
+                store.record(GameRecord(3, [("A", "X"), ("B", "O")], [], "draw"))
+                self.assertEqual(store.count_games(), 0)
+                written.set()
+                store.flush()
+            self.assertEqual(store.count_games(), 1)
+
+    def test_invalid_game_is_counted_as_failed(self):
+        with HistoryStore(self.path) as store:
+            moves = [0] * 15 + [99]
+            store.record(GameRecord(3, [("A", "X"), ("B", "O")], moves, "draw"))
+            store.flush()
+            self.assertEqual(store.failed, 1)
+            self.assertIsInstance(store.last_error, IndexError)
+            store.record(GameRecord(3, [("A", "X"), ("B", "O")], [0, 4, 1], "win", "A"))
+            store.flush()
+            self.assertEqual(store.count_games(), 1)
+
+    @mock.patch("game.models.print")
+    def test_from_board(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        first, second = self.mock_players
+        board.current_player = first
+        board.set_grid(2, 2)
+        board.current_player = second
+        board.set_grid(1, 1)
+        record = GameRecord.from_board(board, [second, first], None)
+        self.assertEqual(record.players, [(first.name, "X"), (second.name, "O")])
+        self.assertEqual(record.moves, [4, 0])
+        self.assertEqual(record.outcome, GameState.LIVE.value)
+        self.assertIsNone(record.winner)
+
+
+class TestGameRecordSnapshots(BaseTestCase):
+    # a 5x5 game that X wins on its last move, the 19th
+    MOVES = [7, 12, 14, 4, 8, 1, 3, 9, 15, 13, 16, 21, 0, 19, 20, 22, 18, 24, 11]
+
+    def record(self) -> GameRecord:
+        return GameRecord(5, [("A", "X"), ("B", "O")], self.MOVES, "win", "A")
+
+    def replayed(self, ply: int) -> Board:
+        board = Board(5, verbose=False)
+        for index, move in enumerate(self.MOVES[:ply]):
+            board.place(move, ord("XO"[index % 2]))
+        return board
+
+    def test_position_at(self):
+        record = self.record()
+        record.take_snapshots(interval=4)
+        self.assertEqual(sorted(record.snapshots), [4, 8, 12, 16])
+        board = Board(5, verbose=False)
+        for ply in range(len(self.MOVES) + 1):
+            position = record.position_at(ply, board)
+            expected = self.replayed(ply)
+            self.assertIs(position, board)
+            self.assertEqual(bytes(position.cells), bytes(expected.cells))
+            self.assertEqual(list(position.moves), list(expected.moves))
+            self.assertEqual(position.position_hash, expected.position_hash)
+            self.assertEqual(position.window_counts, expected.window_counts)
+            self.assertEqual(position.window_score, expected.window_score)
+        self.assertEqual(record.position_at(19).state, GameState.WIN)
+        self.assertEqual(record.position_at(18).state, GameState.LIVE)
+        with self.assertRaises(IndexError):
+            record.position_at(20)
+        # seeking still works without snapshots, by replaying from the start
+        self.assertEqual(self.record().position_at(9).moves, self.replayed(9).moves)
+
+    def test_snapshots_are_stored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with HistoryStore(os.path.join(tmp, "history.sqlite3")) as store:
+                store.record(self.record())
+                store.flush()
+                (loaded,) = store.player_history("A")
+        self.assertEqual(list(loaded.snapshots), [16])
+        self.assertEqual(
+            loaded.snapshots[16].to_bytes(),
+            self.replayed(16).snapshot().to_bytes(),
+        )
+        self.assertEqual(loaded.position_at(19).state, GameState.WIN)
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from app import run_game_loop
+from game.instrumentation import Instrumentation, PhaseHistogram, metrics, timed
+from game.models import Board
+from tests.test_base import BaseTestCase
+
+
+class TestPhaseHistogram(BaseTestCase):
+    def test_record(self):
+        histogram = PhaseHistogram()
+        for elapsed_ns in [500, 1_500, 3_000, 900_000]:
+            histogram.record(elapsed_ns)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.min_ns, 500)
+        self.assertEqual(histogram.max_ns, 900_000)
+        self.assertEqual(sum(histogram.buckets), 4)
+        self.assertEqual(histogram.percentile_us(50), 2)
+        self.assertEqual(histogram.percentile_us(100), 1024)
+
+    def test_empty(self):
+        histogram = PhaseHistogram()
+        self.assertEqual(histogram.percentile_us(95), 0)
+        self.assertEqual(histogram.to_dict()["mean_us"], 0)
+
+
+class TestInstrumentation(BaseTestCase):
+    def test_timed_disabled(self):
+        recorder = Instrumentation()
+        func = timed("phase", recorder)(lambda x: x * 2)
+        self.assertEqual(func(2), 4)
+        self.assertEqual(recorder.phases, {})
+        recorder.increment("counter")
+        self.assertEqual(recorder.counters, {})
+
+    def test_timed_enabled(self):
+        recorder = Instrumentation()
+        recorder.enable()
+
+        @timed("phase", recorder)
+        def fail():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            fail()
+        recorder.increment("counter", 2)
+        self.assertEqual(recorder.phases["phase"].count, 1)
+        self.assertEqual(recorder.counters, {"counter": 2})
+        self.assertIn("phase", recorder.summary())
+
+    def test_export(self):
+        recorder = Instrumentation()
+        recorder.enable()
+        recorder.record("phase", 2_000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            recorder.export(path)
+            with open(path) as f:
+                exported = json.load(f)
+        self.assertEqual(exported["phases"]["phase"]["count"], 1)
+
+    @mock.patch("game.models.print")
+    @mock.patch("builtins.input")
+    def test_game_loop_phases(
+        self, mock_input: mock.MagicMock, mock_print: mock.MagicMock
+    ):
+        mock_input.side_effect = ["1,1", "2,2", "9,9", "1,2", "3,3", "1,3"]
+        board = Board(3)
+        metrics.reset()
+        metrics.enable()
+        try:
+            run_game_loop(board, list(self.mock_players))
+        finally:
+            metrics.disable()
+        phases = metrics.phases
+        self.assertEqual(phases["game_loop"].count, 1)
+        self.assertEqual(phases["parse_input"].count, 6)
+        self.assertEqual(phases["make_move"].count, 6)
+        self.assertEqual(phases["evaluate_board"].count, 5)
+        self.assertEqual(phases["print_grid"].count, 5)
+        self.assertEqual(metrics.counters, {"moves": 5, "retries": 1})
+        metrics.reset()
+
+    @mock.patch("game.models.print")
+    def test_make_move_excludes_rendering(self, mock_print: mock.MagicMock):
+        # a slow terminal
+        mock_print.side_effect = lambda *args: time.sleep(0.02)
+        board = Board(3)
+        board.current_player = self.mock_players[0]
+        metrics.reset()
+        metrics.enable()
+        try:
+            board.make_move(1, 1)
+        finally:
+            metrics.disable()
+        phases = metrics.phases
+        self.assertGreaterEqual(phases["print_grid"].total_ns, 50_000_000)
+        self.assertLess(phases["make_move"].total_ns, 50_000_000)
+        metrics.reset()
@@ -0,0 +1,23 @@
+import config as settings
+from game.memory import (
+    ListOfListsBoard,
+    deep_sizeof,
+    format_memory_report,
+    memory_report,
+)
+from tests.test_base import BaseTestCase
+
+
+class TestMemory(BaseTestCase):
+    def test_memory_report(self):
+        report = memory_report()
+        self.assertEqual([row["size"] for row in report], settings.ALLOWED_SIZE)
+        for row in report:
+            self.assertLess(row["after"], row["before"])
+        self.assertIn("5x5", format_memory_report(report))
+
+    def test_deep_sizeof_counts_rows(self):
+        small = deep_sizeof(ListOfListsBoard(3))
+        large = deep_sizeof(ListOfListsBoard(5))
+        self.assertGreater(large, small)
+        self.assertEqual(deep_sizeof(self.mock_players[0]), 0)
@@ -1,10 +1,13 @@
+import importlib.util
+import unittest
 from unittest import mock
 from typing import List
 
 import config as settings
 from tests.test_base import BaseTestCase
-from game.models import Player, PlayerEnum, Board, GameState
+from game.models import Player, PlayerEnum, Board, BoardSnapshot, GameState
 from game.errors import PositionDoesNotExist, PositionAlreadyTaken, GameOver, GameError
+from game.tables import BoardTables
 
 
 class TestBoard(BaseTestCase):
@@ -22,7 +25,7 @@ class TestBoard(BaseTestCase):
                 self.assertEqual(board.size, expected_size)
                 self.assertEqual(
                     board.grid,
-                    [[settings.BLANK] * expected_size for _ in range(expected_size)],
+                    ((settings.BLANK,) * expected_size,) * expected_size,
                 )
                 self.assertEqual(len(mock_print.mock_calls), expected_total_print)
                 self.assertIn(
@@ -61,7 +64,7 @@ class TestBoard(BaseTestCase):
     ):
         board = Board(3)
         board.current_player = self.mock_players[0]
-        board.grid[0][0] = PlayerEnum.list_marks()[1]
+        board.cells[0] = ord(PlayerEnum.list_marks()[1])
         expected_err_msg = PositionAlreadyTaken.message
         with self.assertRaises(PositionAlreadyTaken) as cm:
             board.set_grid(1, 1)
@@ -196,6 +199,21 @@ class TestBoard(BaseTestCase):
         self.assertFalse(board._has_consecutive_win_length(alternating))
         self.assertFalse(board._has_consecutive_win_length(consecutive_blanks))
 
+    @mock.patch("game.models.print")
+    def test__has_winner_reads_window_counts(self, mock_print: mock.MagicMock):
+        board = Board(4)
+        # fmt: off
+        board.grid = [["_","_","_","O"],
+                      ["_","_","O","_"],
+                      ["X","O","X","X"],
+                      ["_","_","_","_"]]
+        # fmt: on
+        with mock.patch.object(Board, "row_view") as mock_row_view:
+            self.assertTrue(board._has_winner())
+        mock_row_view.assert_not_called()
+        board.grid = [["X", "X", "_"], ["O", "O", "_"], ["_", "_", "_"]]
+        self.assertFalse(board._has_winner())
+
     @mock.patch("game.models.print")
     def test__has_win_length_horizontal(self, mock_print: mock.MagicMock):
         board = Board(3)
@@ -336,25 +354,29 @@ class TestBoard(BaseTestCase):
     def test__get_forward_diagonals(self, mock_print: mock.MagicMock):
         board = Board(3)
         # fmt: off
-        board.grid = [[ 0,  1,  2],
-                      [ 3,  4,  5],
-                      [ 6,  7,  8]]
+        board.grid = [["a", "b", "c"],
+                      ["d", "e", "f"],
+                      ["g", "h", "i"]]
         # fmt: on
-        expected_result = [[0], [3, 1], [6, 4, 2], [7, 5], [8]]
+        expected_result = [["a"], ["d", "b"], ["g", "e", "c"], ["h", "f"], ["i"]]
         forward_diagonals = board._get_forward_diagonals()
-        self.assertEqual(forward_diagonals, expected_result)
+        self.assertEqual(
+            [list(d.tobytes().decode()) for d in forward_diagonals], expected_result
+        )
 
     @mock.patch("game.models.print")
     def test__get_forward_diagonals(self, mock_print: mock.MagicMock):
         board = Board(3)
         # fmt: off
-        board.grid = [[ 0,  1,  2],
-                      [ 3,  4,  5],
-                      [ 6,  7,  8]]
+        board.grid = [["a", "b", "c"],
+                      ["d", "e", "f"],
+                      ["g", "h", "i"]]
         # fmt: on
-        expected_result = [[6], [3, 7], [0, 4, 8], [1, 5], [2]]
+        expected_result = [["g"], ["d", "h"], ["a", "e", "i"], ["b", "f"], ["c"]]
         backward_diagonals = board._get_backward_diagonals()
-        self.assertEqual(backward_diagonals, expected_result)
+        self.assertEqual(
+            [list(d.tobytes().decode()) for d in backward_diagonals], expected_result
+        )
 
     def test__validate_size(self):
         for test_size in self.size_test_cases:
@@ -421,3 +443,188 @@ class TestPlayer(BaseTestCase):
         expected_players = [self.mock_players[1], self.mock_players[0]]
         rotated_players = Player.rotate_players(players)
         self.assertEqual(rotated_players, expected_players)
+
+
+class TestLayout(BaseTestCase):
+    @mock.patch("game.models.print")
+    def test_board_is_slotted(self, mock_print: mock.MagicMock):
+        board = Board(4)
+        self.assertFalse(hasattr(board, "__dict__"))
+        self.assertFalse(hasattr(self.mock_players[0], "__dict__"))
+        self.assertIsInstance(board.cells, bytearray)
+        self.assertEqual(len(board.cells), 16)
+        self.assertEqual(board.state, GameState.LIVE)
+        self.assertIsNone(board.current_player)
+
+    @mock.patch("game.models.print")
+    def test_grid_round_trip(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        # fmt: off
+        grid = [["X","_","_"],
+                ["_","O","_"],
+                ["_","_","X"]]
+        # fmt: on
+        board.grid = grid
+        self.assertEqual(board.grid, tuple(map(tuple, grid)))
+        self.assertEqual(bytes(board.cells), b"X___O___X")
+        with self.assertRaises(TypeError):
+            board.grid[0][1] = "O"
+
+    @mock.patch("game.models.print")
+    def test_views_share_cells(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        board.grid = [["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]]
+        row = board.row_view(1)
+        column = board.column_view(2)
+        self.assertEqual(row.tobytes(), b"def")
+        self.assertEqual(column.tobytes(), b"cfi")
+        board.cells[5] = ord("X")
+        self.assertEqual(row.tobytes(), b"deX")
+        self.assertEqual(column.tobytes(), b"cXi")
+        self.assertEqual(board._get_forward_diagonals()[2].tobytes(), b"gec")
+
+    @mock.patch("game.models.print")
+    def test_diagonal_views_all_sizes(self, mock_print: mock.MagicMock):
+        for size in settings.ALLOWED_SIZE:
+            board = Board(size)
+            L = [[chr(97 + i * size + j) for j in range(size)] for i in range(size)]
+            board.grid = L
+            h = w = size
+            expected_forward = [
+                [L[p - q][q] for q in range(max(p - h + 1, 0), min(p + 1, w))]
+                for p in range(h + w - 1)
+            ]
+            expected_backward = [
+                [L[h - p + q - 1][q] for q in range(max(p - h + 1, 0), min(p + 1, w))]
+                for p in range(h + w - 1)
+            ]
+            forward = [
+                list(d.tobytes().decode()) for d in board._get_forward_diagonals()
+            ]
+            backward = [
+                list(d.tobytes().decode()) for d in board._get_backward_diagonals()
+            ]
+            self.assertEqual(forward, expected_forward)
+            self.assertEqual(backward, expected_backward)
+
+    @unittest.skipIf(
+        importlib.util.find_spec("numpy") is None, "NumPy is not installed"
+    )
+    @mock.patch("game.models.print")
+    def test_as_array(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        array = board.as_array()
+        board.cells[4] = ord("X")
+        self.assertEqual(array[1, 1], ord("X"))
+        self.assertEqual(array[:, 1].tobytes(), b"_X_")
+
+
+class TestClone(BaseTestCase):
+    @mock.patch("game.models.print")
+    def test_clone_is_independent(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        board.current_player = self.mock_players[0]
+        board.set_grid(1, 1)
+        print_count = len(mock_print.mock_calls)
+        clone = board.clone()
+        self.assertEqual(len(mock_print.mock_calls), print_count)
+        self.assertIs(clone.tables, board.tables)
+        self.assertIs(clone.current_player, board.current_player)
+        self.assertEqual(clone.grid, board.grid)
+        self.assertEqual(clone.move_count, 1)
+
+        clone.current_player = self.mock_players[1]
+        clone.set_grid(2, 2)
+        self.assertEqual(board.grid[1][1], settings.BLANK)
+        self.assertEqual(board.move_count, 1)
+        self.assertEqual(clone.move_count, 2)
+        self.assertNotEqual(clone.position_hash, board.position_hash)
+
+    @mock.patch("game.models.print")
+    def test_position_hash(self, mock_print: mock.MagicMock):
+        first = Board(3)
+        first.current_player = self.mock_players[0]
+        first.set_grid(1, 1)
+        first.set_grid(3, 3)
+        second = Board(3)
+        second.current_player = self.mock_players[0]
+        second.set_grid(3, 3)
+        second.set_grid(1, 1)
+        self.assertEqual(first.position_hash, second.position_hash)
+
+        rebuilt = Board(3)
+        rebuilt.grid = first.grid
+        self.assertEqual(rebuilt.position_hash, first.position_hash)
+        self.assertEqual(rebuilt.move_count, 2)
+
+
+class TestSnapshot(BaseTestCase):
+    def test_restore(self):
+        board = Board(4, verbose=False)
+        for index, code in [(5, ord("X")), (6, ord("O")), (10, ord("X"))]:
+            board.place(index, code)
+        snapshot = BoardSnapshot.from_bytes(board.snapshot().to_bytes())
+        expected = board.clone()
+        cells = board.cells
+        board.undo()
+        board.place(0, ord("X"))
+        board.place(15, ord("O"))
+        board.restore(snapshot)
+        self.assertIs(board.cells, cells)
+        self.assertEqual(board.cells, expected.cells)
+        self.assertEqual(list(board.moves), [5, 6, 10])
+        self.assertEqual(board.move_count, 3)
+        self.assertEqual(board.position_hash, expected.position_hash)
+        self.assertEqual(board.window_counts, expected.window_counts)
+        self.assertEqual(board.window_score, expected.window_score)
+        self.assertEqual(board.undo(), 10)
+
+
+class TestWindowCounts(BaseTestCase):
+    def assert_counts_match_grid(self, board: Board):
+        rebuilt = Board(board.size, verbose=False)
+        rebuilt.grid = board.grid
+        self.assertEqual(board.window_counts, rebuilt.window_counts)
+        self.assertEqual(board.window_score, rebuilt.window_score)
+
+    def test_place_undo(self):
+        x, o = (ord(mark) for mark in PlayerEnum.list_marks())
+        board = Board(5, verbose=False)
+        for index, code in [(12, x), (6, o), (13, x), (14, o), (0, x), (18, o)]:
+            board.place(index, code)
+            self.assert_counts_match_grid(board)
+        while board.moves:
+            board.undo()
+            self.assert_counts_match_grid(board)
+        self.assertEqual(board.window_score, 0)
+        self.assertFalse(any(any(counts) for counts in board.window_counts.values()))
+
+    def test_window_score(self):
+        x, o = (ord(mark) for mark in PlayerEnum.list_marks())
+        weights = BoardTables.for_size(3).window_weights
+        board = Board(3, verbose=False)
+        # the center opens 4 lines, a corner 3
+        board.place(4, x)
+        self.assertEqual(board.window_score, 4 * weights[1])
+        board.place(0, o)
+        # o blocks the diagonal through the center and opens 2 lines
+        self.assertEqual(board.window_score, 3 * weights[1] - 2 * weights[1])
+        board.place(8, x)
+        self.assertTrue(board.window_score > 0)
+        self.assertFalse(board.is_winning_cell(8))
+
+    @mock.patch("game.models.print")
+    def test_set_grid_reset_clone(self, mock_print: mock.MagicMock):
+        board = Board(4)
+        board.current_player = self.mock_players[0]
+        board.set_grid(2, 2)
+        board.current_player = self.mock_players[1]
+        board.set_grid(1, 1)
+        self.assert_counts_match_grid(board)
+        clone = board.clone()
+        clone.place(15, ord("X"))
+        self.assertNotEqual(clone.window_counts, board.window_counts)
+        self.assert_counts_match_grid(clone)
+        board.reset()
+        self.assertEqual(board.window_score, 0)
+        self.assertEqual(board.window_counts, Board(4, verbose=False).window_counts)
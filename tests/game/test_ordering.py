@@ -0,0 +1,95 @@
+from game.models import MARK_CODES, Board
+from game.ordering import BLOCK, HISTORY, KILLER, PV, SOURCES, TT, WIN, MoveOrderer
+from game.search import Searcher
+from game.ttable import NO_MOVE, TranspositionTable
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+def make_board(size: int, marks: dict) -> Board:
+    board = Board(size, verbose=False)
+    for index, code in marks.items():
+        board.place(index, code)
+    return board
+
+
+class TestMoveOrderer(BaseTestCase):
+    def test_threats_first(self):
+        # X to move: X completes the top row at 2, O the middle row at 5
+        board = make_board(3, {0: X, 3: O, 1: X, 4: O})
+        ordered, sources = MoveOrderer().order(board, board.empty_cells(), X)
+        self.assertEqual(ordered[:2], [2, 5])
+        self.assertEqual(sources, [WIN, BLOCK, HISTORY, HISTORY, HISTORY])
+        self.assertEqual(sorted(ordered), board.empty_cells())
+
+    def test_pv_and_tt_first(self):
+        board = make_board(3, {0: X, 3: O, 1: X, 4: O})
+        ordered, sources = MoveOrderer().order(
+            board, board.empty_cells(), X, tt_move=8, pv_move=7
+        )
+        self.assertEqual(ordered[:4], [7, 8, 2, 5])
+        self.assertEqual(sources[:4], [PV, TT, WIN, BLOCK])
+
+        ordered, sources = MoveOrderer().order(
+            board, board.empty_cells(), X, tt_move=7, pv_move=7
+        )
+        self.assertEqual(ordered.count(7), 1)
+        self.assertEqual(sources[:2], [PV, WIN])
+
+    def test_no_threats(self):
+        board = make_board(4, {0: X, 5: O})
+        moves = board.empty_cells()
+        orderer = MoveOrderer(threats=False, killers=False, history=False)
+        ordered, sources = orderer.order(board, list(moves), X, NO_MOVE, NO_MOVE)
+        self.assertEqual(ordered, moves)
+        self.assertEqual(set(sources), {HISTORY})
+
+    def test_killers_and_history(self):
+        board = Board(4, verbose=False)
+        orderer = MoveOrderer(threats=False)
+        orderer.record_cutoff(X, 9, HISTORY, 3, 1)
+        orderer.record_cutoff(X, 6, HISTORY, 1, 1)
+        orderer.record_cutoff(X, 3, HISTORY, 2, 1)
+        orderer.record_cutoff(X, 15, HISTORY, 2, 4)
+        # killers of ply 1, most recent first, then by history
+        ordered, sources = orderer.order(board, board.empty_cells(), X, ply=1)
+        self.assertEqual(ordered[:4], [3, 6, 9, 15])
+        self.assertEqual(sources[:3], [KILLER, KILLER, HISTORY])
+        # history is per side
+        ordered, _ = orderer.order(board, board.empty_cells(), O, ply=2)
+        self.assertEqual(ordered, board.empty_cells())
+
+        orderer.new_search()
+        ordered, _ = orderer.order(board, board.empty_cells(), X, ply=1)
+        self.assertEqual(ordered[:2], [9, 3])
+        orderer.clear()
+        self.assertEqual(orderer.order(board, [1, 0], X)[0], [1, 0])
+
+    def test_forced_cutoffs_not_learnt(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(X, 2, WIN, 5, 0)
+        self.assertEqual(orderer.cutoffs[WIN], 1)
+        board = Board(3, verbose=False)
+        self.assertEqual(orderer.order(board, [1, 2], X)[0], [1, 2])
+
+
+class TestOrderingStats(BaseTestCase):
+    def test_cutoff_rates(self):
+        with TranspositionTable(slots=1 << 12) as table:
+            searcher = Searcher(table)
+            nodes = searcher.search(Board(4, verbose=False), 5).nodes
+            plain = Searcher(
+                TranspositionTable(slots=1 << 12),
+                MoveOrderer(threats=False, killers=False, history=False),
+            )
+            self.assertLess(nodes, plain.search(Board(4, verbose=False), 5).nodes)
+            plain.table.close()
+        orderer = searcher.orderer
+        # winning moves are tried without visiting a node
+        self.assertGreater(sum(orderer.tried), nodes - 1)
+        rates = orderer.cutoff_rates()
+        self.assertEqual(list(rates), list(SOURCES))
+        self.assertTrue(all(0 <= rate <= 1 for rate in rates.values()))
+        self.assertGreater(orderer.cutoffs[WIN], 0)
+        self.assertIn("win ", orderer.summary())
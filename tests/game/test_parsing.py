@@ -0,0 +1,54 @@
+import config as settings
+from app import get_row_col_from_input
+from game.errors import PositionDoesNotExist
+from game.parsing import parse_moves, parse_row_col
+from tests.test_base import BaseTestCase
+
+
+def legacy_get_row_col_from_input(player_input: str):
+    """Previous implementation of `get_row_col_from_input`"""
+    if settings.DELIMITER not in player_input:
+        raise PositionDoesNotExist
+
+    values = player_input.split(settings.DELIMITER)
+    if len(values) != 2:
+        raise PositionDoesNotExist
+
+    row, col = map(lambda x: int(x) if (x.isdigit() and int(x) > 0) else None, values)
+    if (type(row) is not int) or (type(col) is not int):
+        raise PositionDoesNotExist
+    return row, col
+
+
+class TestParsing(BaseTestCase):
+    inputs = [
+        "1,2", "3,3", "10,1", "01,2", "0,1", "1,0", "1", "1,v", ",", "1,2,3",
+        " 1,2", "1, 2", "-1,2", "", "a,b", "1,,2", "9999,1",
+    ]  # fmt: skip
+
+    def test_parse_row_col_matches_legacy(self):
+        for player_input in self.inputs:
+            try:
+                expected = legacy_get_row_col_from_input(player_input)
+            except PositionDoesNotExist:
+                expected = None
+            self.assertEqual(parse_row_col(player_input), expected, player_input)
+
+    def test_get_row_col_from_input_wrapper(self):
+        self.assertEqual(get_row_col_from_input("2,3"), (2, 3))
+        with self.assertRaises(PositionDoesNotExist) as cm:
+            get_row_col_from_input("2;3")
+        self.assertEqual(cm.exception.message, PositionDoesNotExist.message)
+
+    def test_parse_moves_canonical(self):
+        parsed = parse_moves("1,1\n2,2\n3,3\n1,3", 3)
+        self.assertEqual(list(parsed.indices), [0, 4, 8, 2])
+        self.assertEqual(list(parsed.line_numbers), [1, 2, 3, 4])
+        self.assertEqual(parsed.errors, [])
+
+    def test_parse_moves_errors(self):
+        buffer = "1,1\n\n02,2\n4,1\nx\n3,3\r\n1,2,3\n"
+        parsed = parse_moves(buffer, 3)
+        self.assertEqual(list(parsed.indices), [0, 4, 8])
+        self.assertEqual(list(parsed.line_numbers), [1, 3, 6])
+        self.assertEqual(parsed.errors, [(4, "4,1"), (5, "x"), (7, "1,2,3")])
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import config as settings
+from game.errors import GameError
+from game.models import Board, GameState
+from game.pool import BoardPool
+from tests.test_base import BaseTestCase
+
+
+class TestBoardReset(BaseTestCase):
+    @mock.patch("game.models.print")
+    def test_reset(self, mock_print: mock.MagicMock):
+        board = Board(3)
+        board.current_player = self.mock_players[0]
+        cells = board.cells
+        row = board.row_view(0)
+        board.set_grid(1, 1)
+        board.state = GameState.WIN
+        print_count = len(mock_print.mock_calls)
+        board.reset()
+        self.assertIs(board.cells, cells)
+        self.assertEqual(row.tobytes(), settings.BLANK.encode() * 3)
+        self.assertEqual(board.grid, ((settings.BLANK,) * 3,) * 3)
+        self.assertEqual(board.state, GameState.LIVE)
+        self.assertIsNone(board.current_player)
+        self.assertEqual((board.move_count, board.position_hash), (0, 0))
+        self.assertEqual(len(mock_print.mock_calls), print_count)
+
+
+class TestBoardPool(BaseTestCase):
+    @mock.patch("game.models.print")
+    def test_acquire_release(self, mock_print: mock.MagicMock):
+        pool = BoardPool(max_per_size=1)
+        first = pool.acquire(3)
+        second = pool.acquire(3)
+        self.assertEqual((pool.hits, pool.misses), (0, 2))
+        first.current_player = self.mock_players[0]
+        first.set_grid(2, 2)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.dropped, 1)
+        self.assertEqual(pool.idle_count(3), 1)
+
+        reused = pool.acquire(3)
+        self.assertIs(reused, first)
+        self.assertEqual(reused.move_count, 0)
+        self.assertEqual(pool.hits, 1)
+        self.assertEqual(pool.acquire(4).size, 4)
+        self.assertIn("1 hits, 3 misses", pool.summary())
+        mock_print.assert_not_called()
+
+    def test_borrow(self):
+        pool = BoardPool()
+        with pool.borrow(5) as board:
+            self.assertEqual(board.size, 5)
+        self.assertEqual(pool.idle_count(5), 1)
+        with pool.borrow(5) as again:
+            self.assertIs(again, board)
+        with self.assertRaises(GameError):
+            pool.acquire(6)
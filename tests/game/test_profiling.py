@@ -0,0 +1,64 @@
+import argparse
+import os
+import tempfile
+import time
+from unittest import mock
+
+from app import parse_args
+from game.profiling import StackSampler, add_profile_arguments, run_main, run_profiled
+from tests.test_base import BaseTestCase
+
+
+def busy_loop(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    iterations = 0
+    while time.perf_counter() < deadline:
+        iterations += 1
+    return iterations
+
+
+class TestProfiling(BaseTestCase):
+    @mock.patch("game.profiling.print")
+    def test_run_profiled(self, mock_print: mock.MagicMock):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "profile")
+            result = run_profiled(busy_loop, 0.05, output=output)
+            self.assertGreater(result, 0)
+            for suffix in [".prof", ".txt", ".folded"]:
+                self.assertTrue(os.path.exists(output + suffix))
+            with open(output + ".txt") as f:
+                self.assertIn("busy_loop", f.read())
+            with open(output + ".folded") as f:
+                lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(any("busy_loop" in line for line in lines))
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        mock_print.assert_called_once()
+
+    def test_stack_sampler_collapse(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_loop(0.02)
+        sampler.stop()
+        self.assertTrue(sampler.samples)
+        for stack in sampler.samples:
+            self.assertIn("test_stack_sampler_collapse", stack)
+
+    def test_parse_args(self):
+        args = parse_args(["--profile", "--profile-output", "out"])
+        self.assertTrue(args.profile)
+        self.assertEqual(args.profile_output, "out")
+        self.assertFalse(parse_args([]).profile)
+
+    @mock.patch("game.profiling.print")
+    def test_run_main(self, mock_print: mock.MagicMock):
+        parser = argparse.ArgumentParser()
+        add_profile_arguments(parser)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "profile")
+            self.assertEqual(run_main(parser.parse_args([]), abs, -2), 2)
+            self.assertFalse(os.path.exists(output + ".prof"))
+            options = parser.parse_args(["--profile", "--profile-output", output])
+            self.assertEqual(run_main(options, abs, -3), 3)
+            self.assertTrue(os.path.exists(output + ".prof"))
@@ -0,0 +1,72 @@
+from game.models import MARK_CODES, Board
+from game.proof import DISPROVEN, INFINITE, PROVEN, UNKNOWN, ProofSolver
+from game.ttable import NO_MOVE
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+def make_board(size: int, marks: dict) -> Board:
+    board = Board(size, verbose=False)
+    for index, code in marks.items():
+        board.place(index, code)
+    return board
+
+
+class TestProofSolver(BaseTestCase):
+    def test_empty_3x3_is_a_draw(self):
+        board = Board(3, verbose=False)
+        result = ProofSolver().solve(board)
+        self.assertEqual(result.outcome, DISPROVEN)
+        self.assertEqual((result.proof_number, result.disproof_number), (INFINITE, 0))
+        self.assertEqual(result.move, NO_MOVE)
+        self.assertEqual((board.move_count, board.position_hash), (0, 0))
+
+    def test_empty_4x4_is_a_win(self):
+        result = ProofSolver().solve(Board(4, verbose=False))
+        self.assertEqual(result.outcome, PROVEN)
+        self.assertEqual(result.proof_number, 0)
+        self.assertNotEqual(result.move, NO_MOVE)
+        self.assertGreater(result.nodes_per_second, 0)
+        self.assertGreater(result.memory, 0)
+        self.assertIn("proven (pn 0, dn inf)", result.summary())
+
+        # the proven move keeps the win
+        board = Board(4, verbose=False)
+        board.place(result.move, X)
+        self.assertEqual(ProofSolver().solve(board, attacker=X).outcome, PROVEN)
+
+    def test_reused_solver(self):
+        solver = ProofSolver()
+        self.assertEqual(solver.solve(Board(3, verbose=False)).outcome, DISPROVEN)
+        # draws proven for X must not count as wins for O
+        result = solver.solve(Board(3, verbose=False), attacker=O)
+        self.assertEqual(result.outcome, DISPROVEN)
+        self.assertGreater(result.nodes, 1)
+        # the empty boards of every size share a position hash
+        self.assertEqual(solver.solve(Board(4, verbose=False)).outcome, PROVEN)
+        self.assertEqual(solver.solve(Board(3, verbose=False)).outcome, DISPROVEN)
+
+    def test_immediate_win_and_forced_block(self):
+        board = make_board(3, {0: X, 3: O, 1: X, 4: O})
+        result = ProofSolver().solve(board)
+        self.assertEqual((result.outcome, result.move, result.nodes), (PROVEN, 2, 1))
+
+        # X center, O edge: X wins
+        board = make_board(3, {4: X, 1: O})
+        self.assertEqual(ProofSolver().solve(board).outcome, PROVEN)
+        # but O cannot
+        self.assertEqual(ProofSolver().solve(board, attacker=O).outcome, DISPROVEN)
+
+    def test_max_nodes(self):
+        result = ProofSolver().solve(Board(5, verbose=False), max_nodes=50)
+        self.assertEqual(result.outcome, UNKNOWN)
+        self.assertTrue(0 < result.proof_number < INFINITE)
+        self.assertLessEqual(result.nodes, 50)
+
+    def test_bounded_table(self):
+        solver = ProofSolver(max_entries=1000)
+        result = solver.solve(Board(4, verbose=False))
+        self.assertEqual(result.outcome, PROVEN)
+        self.assertGreater(solver.collections, 0)
+        self.assertLessEqual(result.table_entries, 1000)
@@ -0,0 +1,55 @@
+import io
+from unittest import mock
+
+from game.models import Board
+from game.render import FrameRenderer
+from tests.test_base import BaseTestCase
+
+
+class TestFrameRenderer(BaseTestCase):
+    @mock.patch("game.models.print")
+    def test_render_single_write(self, mock_print: mock.MagicMock):
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream=stream)
+        board = Board(3, renderer=renderer)
+        board.current_player = self.mock_players[0]
+        board.make_move(2, 2)
+        self.assertEqual(renderer.writes, 2)
+        self.assertEqual(
+            stream.getvalue(), "_ _ _\n_ _ _\n_ _ _\n\n_ _ _\n_ X _\n_ _ _\n\n"
+        )
+        # only the board setup text goes through `print`
+        self.assertEqual(len(mock_print.mock_calls), 1)
+
+    def test_row_cache(self):
+        renderer = FrameRenderer(stream=io.StringIO())
+        with mock.patch("game.models.print"):
+            board = Board(3)
+        board.current_player = self.mock_players[0]
+        renderer.render(board)
+        cached = list(renderer._row_text)
+        board.set_grid(3, 1)
+        renderer.render(board)
+        self.assertIs(renderer._row_text[0], cached[0])
+        self.assertIs(renderer._row_text[1], cached[1])
+        self.assertEqual(renderer._row_text[2], "X _ _")
+
+    def test_diff_redraw(self):
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream=stream, diff=True)
+        with mock.patch("game.models.print"):
+            board = Board(3)
+        board.current_player = self.mock_players[0]
+        renderer.render(board)
+        full_frame = stream.getvalue()
+        board.set_grid(1, 3)
+        renderer.render(board)
+        redraw = stream.getvalue()[len(full_frame) :]
+        self.assertEqual(redraw, "\x1b7\x1b[4A\x1b[5GX\x1b8")
+        # nothing changed, nothing written
+        renderer.render(board)
+        self.assertEqual(renderer.writes, 2)
+
+        renderer.reset()
+        renderer.render(board)
+        self.assertTrue(stream.getvalue().endswith("_ _ X\n_ _ _\n_ _ _\n\n"))
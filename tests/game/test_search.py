@@ -0,0 +1,119 @@
+from unittest import mock
+
+from game.models import MARK_CODES, Board
+from game.search import EVAL_LIMIT, WIN_SCORE, Searcher, side_to_move
+from game.ttable import NO_MOVE, TranspositionTable
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+def play(board: Board, *indices: int) -> Board:
+    for index in indices:
+        board.place(index, side_to_move(board))
+    return board
+
+
+class TestBoardMoves(BaseTestCase):
+    def test_place_undo(self):
+        board = Board(3, verbose=False)
+        play(board, 4, 0)
+        self.assertEqual((board.cells[4], board.cells[0]), (X, O))
+        position_hash = board.position_hash
+        board.place(8, X)
+        self.assertEqual(board.undo(), 8)
+        self.assertEqual(board.position_hash, position_hash)
+        self.assertEqual((board.move_count, list(board.moves)), (2, [4, 0]))
+        self.assertEqual(board.empty_cells(), [1, 2, 3, 5, 6, 7, 8])
+
+    def test_is_winning_cell(self):
+        board = play(Board(3, verbose=False), 0, 3, 1, 4)
+        self.assertFalse(board.is_winning_cell(1))
+        board.place(2, X)
+        self.assertTrue(board.is_winning_cell(2))
+        self.assertFalse(board.is_winning_cell(4))
+
+
+class TestSearcher(BaseTestCase):
+    def setUp(self):
+        self.searcher = Searcher(TranspositionTable(slots=1 << 12))
+
+    def tearDown(self):
+        self.searcher.table.close()
+
+    def test_takes_win(self):
+        board = play(Board(3, verbose=False), 0, 3, 1, 4)
+        result = self.searcher.search(board, 3)
+        self.assertEqual(result.move, 2)
+        self.assertTrue(result.is_win)
+        self.assertEqual(result.score, WIN_SCORE - 5)
+        self.assertEqual(list(board.moves), [0, 3, 1, 4])
+
+    def test_blocks_win(self):
+        board = play(Board(3, verbose=False), 0, 4, 1)
+        result = self.searcher.search(board, 4)
+        self.assertEqual(result.move, 2)
+        self.assertFalse(result.is_loss)
+
+    def test_empty_board_draw(self):
+        result = self.searcher.search(Board(3, verbose=False), 9)
+        self.assertEqual(result.score, 0)
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(self.searcher.table.hits, 0)
+
+    def test_table_shared_across_sizes(self):
+        self.searcher.search(Board(3, verbose=False), 9)
+        result = self.searcher.search(Board(5, verbose=False), 4)
+        fresh = Searcher(TranspositionTable(slots=1 << 12))
+        expected = fresh.search(Board(5, verbose=False), 4)
+        fresh.table.close()
+        self.assertEqual((result.score, result.move), (expected.score, expected.move))
+        self.assertGreater(result.nodes, 1)
+
+    def test_search_timed(self):
+        board = Board(4, verbose=False)
+        result = self.searcher.search_timed(board, 0.05)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertEqual(result.move, result.pv[0])
+        self.assertGreater(result.nodes_per_second, 0)
+        self.assertEqual((board.move_count, board.position_hash), (0, 0))
+
+    def test_search_timed_stops_on_deadline(self):
+        board = Board(5, verbose=False)
+        clock = iter(range(1000))
+        with mock.patch("game.search.CLOCK_INTERVAL", 1), mock.patch(
+            "game.search.time.perf_counter", side_effect=lambda: next(clock) / 1000
+        ):
+            # the clock runs out 2 nodes into the second iteration
+            result = self.searcher.search_timed(board, 0.0035)
+        self.assertEqual(result.depth, 1)
+        self.assertNotEqual(result.move, NO_MOVE)
+        self.assertEqual(list(board.moves), [])
+
+    def test_search_timed_max_depth(self):
+        board = play(Board(3, verbose=False), 0, 4, 1)
+        result = self.searcher.search_timed(board, 10.0, max_depth=2)
+        self.assertEqual((result.move, result.depth), (2, 2))
+
+    def test_search_timed_resumes(self):
+        board = Board(4, verbose=False)
+        previous = self.searcher.search(board, 2)
+        result = self.searcher.search_timed(board, 10.0, max_depth=3, previous=previous)
+        self.assertEqual(result.depth, 3)
+        self.assertEqual(result.move, result.pv[0])
+        shallow = self.searcher.search(board, 2)
+        with mock.patch("game.search.CLOCK_INTERVAL", 1):
+            # no deeper iteration completes, even the first one
+            result = self.searcher.search_timed(board, 0.0, previous=shallow)
+        self.assertIs(result, shallow)
+        self.assertEqual(list(board.moves), [])
+
+    def test_evaluate(self):
+        board = play(Board(4, verbose=False), 5)
+        # o to move, x holds the center-ish cell
+        self.assertLess(self.searcher.evaluate(board), 0)
+        board.place(0, O)
+        board.place(6, X)
+        self.assertEqual(self.searcher.evaluate(board), -board.window_score)
+        with mock.patch.object(board, "window_score", 10 * WIN_SCORE):
+            self.assertEqual(self.searcher.evaluate(board), -EVAL_LIMIT)
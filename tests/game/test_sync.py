@@ -0,0 +1,91 @@
+from app import run_game_loop
+from game.batch import ScriptedPlayer
+from game.models import MARK_CODES, Board, GameState
+from game.sync import DELTA_FORMAT, StateBroadcaster, StateMirror
+from tests.test_base import BaseTestCase
+
+X, O = MARK_CODES
+
+
+class TestStateSync(BaseTestCase):
+    def test_deltas_follow_moves(self):
+        for size in [3, 5]:
+            board = Board(size, verbose=False)
+            broadcaster = StateBroadcaster(board)
+            broadcaster.join("spectator")
+            mirror = StateMirror()
+            (snapshot,) = broadcaster.drain("spectator")
+            self.assertEqual(len(snapshot), 7 + size * size)
+            self.assertTrue(mirror.apply(snapshot))
+            self.assertEqual((mirror.size, mirror.seq), (size, 0))
+
+            for move, code in [(0, X), (4, O), (1, X)]:
+                board.place(move, code)
+                broadcaster.publish()
+                (delta,) = broadcaster.drain("spectator")
+                # constant size whatever the board size
+                self.assertEqual(len(delta), DELTA_FORMAT.size)
+                self.assertTrue(mirror.apply(delta))
+            self.assertEqual(mirror.cells, board.cells)
+            self.assertEqual((mirror.seq, mirror.state), (3, GameState.LIVE))
+            # replayed messages are ignored
+            self.assertTrue(mirror.apply(delta))
+            self.assertEqual(mirror.seq, 3)
+
+    def test_gap_and_resync(self):
+        board = Board(3, verbose=False)
+        broadcaster = StateBroadcaster(board)
+        broadcaster.join(1)
+        mirror = StateMirror()
+        self.assertFalse(mirror.apply(b"D\2\0\0\0\4\0X\0"))
+        mirror.apply(broadcaster.drain(1)[0])
+        for move, code in [(0, X), (4, O), (8, X)]:
+            board.place(move, code)
+            broadcaster.publish()
+        first, _, third = broadcaster.drain(1)
+        self.assertTrue(mirror.apply(first))
+        self.assertFalse(mirror.apply(third))
+        self.assertEqual(mirror.seq, 1)
+        broadcaster.resync(1)
+        for message in broadcaster.drain(1):
+            self.assertTrue(mirror.apply(message))
+        self.assertEqual((mirror.cells, mirror.seq), (board.cells, 3))
+
+    def test_lagging_client_gets_snapshot(self):
+        board = Board(4, verbose=False)
+        broadcaster = StateBroadcaster(board, max_lag=4)
+        broadcaster.join("slow")
+        broadcaster.join("fast")
+        fast = StateMirror()
+        for ply, move in enumerate(range(10)):
+            board.place(move, MARK_CODES[ply % 2])
+            broadcaster.publish()
+            for message in broadcaster.drain("fast"):
+                fast.apply(message)
+        slow = StateMirror()
+        pending = broadcaster.drain("slow")
+        self.assertLessEqual(len(pending), 4)
+        for message in pending:
+            self.assertTrue(slow.apply(message))
+        for mirror in [slow, fast]:
+            self.assertEqual((mirror.cells, mirror.seq), (board.cells, 10))
+        self.assertEqual(broadcaster.snapshots_sent, 2 + 2)
+        broadcaster.leave("slow")
+        board.reset()
+        broadcaster.publish()
+        fast.apply(broadcaster.drain("fast")[0])
+        self.assertEqual((fast.cells, fast.seq), (board.cells, 10))
+
+    def test_game_loop(self):
+        board = Board(3, verbose=False)
+        broadcaster = StateBroadcaster(board)
+        broadcaster.join("spectator")
+        moves = iter(["1,1", "2,2", "1,2", "3,3", "1,3"])
+        players = [ScriptedPlayer("A", "X", moves), ScriptedPlayer("B", "O", moves)]
+        winner = run_game_loop(board, players, broadcaster)
+        mirror = StateMirror()
+        for message in broadcaster.drain("spectator"):
+            self.assertTrue(mirror.apply(message))
+        self.assertEqual(winner.name, "A")
+        self.assertEqual((mirror.seq, mirror.state), (5, GameState.WIN))
+        self.assertEqual(mirror.cells, board.cells)
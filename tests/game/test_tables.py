@@ -0,0 +1,31 @@
+from game.tables import BoardTables
+from tests.test_base import BaseTestCase
+
+
+class TestBoardTables(BaseTestCase):
+    def test_windows(self):
+        tables = BoardTables.for_size(3, 3)
+        # 3 rows, 3 columns and 2 diagonals
+        self.assertEqual(len(tables.windows), 8)
+        self.assertIn((0, 4, 8), tables.windows)
+        self.assertIn((2, 4, 6), tables.windows)
+        # the center cell lies on its row, column and both diagonals
+        self.assertEqual(len(tables.cell_windows[4]), 4)
+
+        tables = BoardTables.for_size(5, 3)
+        # 15 per direction horizontally and vertically, 9 per diagonal direction
+        self.assertEqual(len(tables.windows), 48)
+        for index, windows in enumerate(tables.cell_windows):
+            for w in windows:
+                self.assertIn(index, tables.windows[w])
+
+    def test_for_size_is_shared(self):
+        self.assertIs(BoardTables.for_size(4, 3), BoardTables.for_size(4, 3))
+        self.assertIsNot(BoardTables.for_size(4, 3), BoardTables.for_size(4, 4))
+
+    def test_zobrist_is_stable(self):
+        first = BoardTables.for_size(3, 3).zobrist
+        second = BoardTables(3, 3).zobrist
+        self.assertEqual(first, second)
+        keys = [key for table in first.values() for key in table]
+        self.assertEqual(len(set(keys)), len(keys))
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+
+from game.history import GameRecord
+from game.models import GameState
+from game.tournament import (
+    GAUNTLET,
+    Entrant,
+    Pairing,
+    Tournament,
+    entrant_table_path,
+    expected_score,
+    play_game,
+    schedule,
+)
+from game.ttable import HEADER, SLOT, TranspositionTable
+from tests.test_base import BaseTestCase
+
+
+class TestSchedule(BaseTestCase):
+    def test_round_robin(self):
+        pairings = schedule(3, rounds=2)
+        self.assertEqual(len(pairings), 12)
+        self.assertEqual([p.number for p in pairings], list(range(12)))
+        colours = [(p.first, p.second) for p in pairings[:6]]
+        self.assertEqual(colours, [(0, 1), (1, 0), (0, 2), (2, 0), (1, 2), (2, 1)])
+        # both colours of a pair share the opening, rounds do not
+        self.assertEqual(pairings[0].seed, pairings[1].seed)
+        self.assertNotEqual(pairings[0].seed, pairings[6].seed)
+
+    def test_gauntlet(self):
+        pairings = schedule(4, GAUNTLET)
+        self.assertEqual(
+            [(p.first, p.second) for p in pairings],
+            [(0, 1), (1, 0), (0, 2), (2, 0), (0, 3), (3, 0)],
+        )
+        with self.assertRaises(ValueError):
+            schedule(4, "swiss")
+
+
+class TestElo(BaseTestCase):
+    def test_expected_score(self):
+        self.assertEqual(expected_score(1500, 1500), 0.5)
+        self.assertAlmostEqual(expected_score(1900, 1500), 10 / 11)
+
+    def test_record(self):
+        tournament = Tournament([Entrant("a"), Entrant("b")], 3, k_factor=16)
+        players = [("a", "X"), ("b", "O")]
+        tournament.record(0, GameRecord(3, players, [], GameState.WIN.value, "a"))
+        self.assertEqual(tournament.ratings, {"a": 1508, "b": 1492})
+        tournament.record(1, GameRecord(3, players, [], GameState.DRAW.value))
+        self.assertLess(tournament.ratings["a"], 1508)
+        self.assertEqual(sum(tournament.ratings.values()), 3000)
+        self.assertEqual(tournament.scores, {"a": [1, 1, 0], "b": [0, 1, 1]})
+        self.assertEqual(tournament.done, {0, 1})
+
+
+class TestTournament(BaseTestCase):
+    def test_play_game(self):
+        entrants = [Entrant("weak", 1), Entrant("strong", 4)]
+        game = play_game(entrants, Pairing(0, 1, 0, seed=3), 3, opening_plies=2)
+        self.assertEqual(game.players, [("strong", "X"), ("weak", "O")])
+        self.assertNotEqual(game.outcome, GameState.LIVE.value)
+        again = play_game(entrants, Pairing(1, 1, 0, seed=3), 3, opening_plies=2)
+        self.assertEqual(again.moves[:2], game.moves[:2])
+
+    def test_persistent_tables(self):
+        entrants = [Entrant("depth2", 2), Entrant("depth3", 3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ttable.bin")
+            tournament = Tournament(entrants, 3, table_path=path)
+            self.assertEqual(len(list(tournament.run(workers=2))), 2)
+            # one table per entrant, none shared
+            self.assertEqual(
+                sorted(os.listdir(tmp)), ["ttable-depth2.bin", "ttable-depth3.bin"]
+            )
+            for entrant in entrants:
+                table_path = entrant_table_path(path, entrant.name)
+                with TranspositionTable(table_path, readonly=True) as table:
+                    filled = sum(
+                        any(table._map[offset : offset + SLOT.size])
+                        for offset in range(HEADER.size, len(table._map), SLOT.size)
+                    )
+                self.assertGreater(filled, 0)
+
+    def test_checkpoint_and_resume(self):
+        entrants = [Entrant(f"depth{depth}", depth) for depth in [1, 2, 4]]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tournament.json")
+            tournament = Tournament(entrants, 3, rounds=2, checkpoint_path=path)
+            games = tournament.run(workers=2)
+            for _ in range(5):
+                next(games)
+            games.close()
+            with open(path) as checkpoint:
+                self.assertEqual(len(json.load(checkpoint)["done"]), 5)
+
+            resumed = Tournament(entrants, 3, rounds=2, checkpoint_path=path)
+            self.assertEqual(resumed.ratings, tournament.ratings)
+            records = list(resumed.run(workers=2))
+            self.assertEqual(len(records), 7)
+            self.assertEqual(len(resumed.done), 12)
+            self.assertEqual(sum(sum(s) for s in resumed.scores.values()), 24)
+            self.assertGreater(resumed.games_per_second, 0)
+            self.assertIn("12/12 games, 7 this run", resumed.standings())
+            finished = Tournament(entrants, 3, rounds=2, checkpoint_path=path)
+            self.assertEqual(list(finished.run(workers=1)), [])
+
+            with self.assertRaises(ValueError):
+                Tournament(entrants[:2], 3, checkpoint_path=path)
+            different = [
+                dict(entrants=entrants, size=4),
+                dict(entrants=entrants, size=3, mode=GAUNTLET, rounds=3),
+                dict(entrants=entrants, size=3, opening_plies=4),
+                dict(entrants=entrants[:2] + [Entrant("depth4", 3)], size=3),
+                dict(entrants=entrants[:2] + [Entrant("depth4", 4, 0.1)], size=3),
+            ]
+            for arguments in different:
+                arguments.setdefault("rounds", 2)
+                with self.assertRaises(ValueError):
+                    Tournament(**arguments, checkpoint_path=path)
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import tempfile
+
+from game.ttable import NO_MOVE, SLOT, Bound, HEADER, TTEntry, TranspositionTable
+from tests.test_base import BaseTestCase
+
+
+def read_entry(path: str, key: int) -> int:
+    with TranspositionTable(path, readonly=True) as table:
+        entry = table.lookup(key)
+        return entry.score if entry is not None else None
+
+
+class TestTranspositionTable(BaseTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ttable.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entry_pack(self):
+        for entry in [TTEntry(-1000, 9, Bound.LOWER, 24), TTEntry(0, 0, Bound.EXACT)]:
+            unpacked = TTEntry.unpack(entry.pack())
+            self.assertEqual(
+                (unpacked.score, unpacked.depth, unpacked.bound, unpacked.move),
+                (entry.score, entry.depth, entry.bound, entry.move),
+            )
+        self.assertEqual(TTEntry(0, 0, Bound.EXACT).move, NO_MOVE)
+
+    def test_store_lookup_in_memory(self):
+        with TranspositionTable(slots=16) as table:
+            self.assertIsNone(table.lookup(0))
+            table.store(0, 5, 3, Bound.EXACT, 4)
+            table.store(12345, -7, 2, Bound.UPPER)
+            entry = table.lookup(0)
+            self.assertEqual((entry.score, entry.depth, entry.move), (5, 3, 4))
+            self.assertEqual(table.lookup(12345).bound, Bound.UPPER)
+            self.assertIsNone(table.lookup(99))
+            self.assertEqual((table.probes, table.hits, table.stores), (4, 2, 2))
+            self.assertEqual(table.hit_rate, 0.5)
+            self.assertIn("50% hit rate", table.summary())
+
+    def test_bucket_replaces_shallowest(self):
+        with TranspositionTable(slots=4) as table:
+            for key, depth in [(0, 5), (4, 1), (8, 7), (12, 3)]:
+                table.store(key, key, depth, Bound.EXACT)
+            table.store(16, 16, 2, Bound.EXACT)
+            self.assertIsNone(table.lookup(4))
+            for key in [0, 8, 12, 16]:
+                self.assertEqual(table.lookup(key).score, key)
+            # updating an existing position overwrites it in place
+            table.store(0, 1, 9, Bound.EXACT)
+            self.assertEqual(table.lookup(0).score, 1)
+            self.assertEqual(table.lookup(8).score, 8)
+
+    def test_torn_entry_is_a_miss(self):
+        with TranspositionTable(slots=4) as table:
+            table.store(42, 3, 1, Bound.EXACT)
+            offset = HEADER.size + (42 & (table.slots - 4)) * SLOT.size
+            check, data = SLOT.unpack_from(table._map, offset)
+            SLOT.pack_into(table._map, offset, check, data ^ (1 << 20))
+            self.assertIsNone(table.lookup(42))
+
+    def test_persistence_and_warm_start(self):
+        with TranspositionTable(self.path, slots=1000) as table:
+            self.assertEqual(table.slots, 1024)
+            table.store(777, 11, 4, Bound.EXACT)
+        with TranspositionTable(self.path, slots=16) as table:
+            self.assertEqual(table.slots, 1024)
+            self.assertEqual(table.lookup(777).score, 11)
+        with TranspositionTable(self.path, warm_start=False) as table:
+            self.assertIsNone(table.lookup(777))
+
+    def test_create_keeps_existing_file(self):
+        with TranspositionTable(self.path, slots=64) as table:
+            table.store(5, 9, 2, Bound.EXACT)
+        # a second creator finding the file in place must not replace it
+        TranspositionTable._create(self.path, 16, HEADER.size + 16 * SLOT.size)
+        self.assertEqual(os.listdir(self.tmp.name), ["ttable.bin"])
+        with TranspositionTable(self.path) as table:
+            self.assertEqual((table.slots, table.lookup(5).score), (64, 9))
+
+    def test_concurrent_readers(self):
+        with TranspositionTable(self.path, slots=64) as table:
+            table.store(2024, 21, 4, Bound.EXACT)
+            table.flush()
+            with multiprocessing.get_context("spawn").Pool(2) as pool:
+                scores = pool.starmap(read_entry, [(self.path, 2024), (self.path, 1)])
+        self.assertEqual(scores, [21, None])
+        with TranspositionTable(self.path, readonly=True) as table:
+            table.store(1, 1, 1, Bound.EXACT)
+            self.assertIsNone(table.lookup(1))
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a table")
+        with self.assertRaises(ValueError):
+            TranspositionTable(self.path)
+
+    def test_parent(self):
+        with TranspositionTable(slots=16) as parent:
+            parent.store(7, 3, 1, Bound.EXACT)
+            with TranspositionTable(slots=16, parent=parent) as table:
+                self.assertEqual(table.lookup(7).score, 3)
+                table.store(7, 5, 2, Bound.EXACT)
+                self.assertEqual(table.lookup(7).score, 5)
+                self.assertEqual(parent.lookup(7).score, 3)
+                self.assertIsNone(table.lookup(8))
@@ -1,10 +1,16 @@
+import io
+import os
+import tempfile
 from unittest import mock
 from typing import List
 
 import config as settings
-from app import main, assign_players, get_row_col_from_input
+from app import main, assign_players, get_row_col_from_input, parse_args, run_batch
+from game.bots import BotPlayer
 from game.models import Player
+from game.pool import BoardPool
 from game.errors import PositionDoesNotExist, PositionAlreadyTaken
+from game.ttable import HEADER, TranspositionTable
 from tests.test_base import BaseTestCase
 
 
@@ -966,3 +972,104 @@ class TestGameFlow(BaseTestCase):
             mock_print_main.mock_calls[-1], mock.call(expected_final_message)
         )
         self.assertEqual(len(mock_print_models.mock_calls), expected_print_count_models)
+
+
+class TestBatchMode(BaseTestCase):
+    @mock.patch("game.models.print")
+    @mock.patch("builtins.input")
+    def test_run_batch(self, mock_input: mock.MagicMock, mock_print: mock.MagicMock):
+        script = io.StringIO(
+            "3\nAlice\nBob\n1,1\n2,2\n1,2\n3,3\n1,3\n\n"
+            "3\nAlice\nBob\n1,1\n2,2\n2,2\n9\n1,2\n1,3\n3,1\n2,1\n2,3\n3,2\n3,3\n\n"
+            "4\nCarol\nDan\n1,1\n\n"
+            "7\nA\nB\n\n"
+            "3\nA\n"
+        )
+        output = io.StringIO()
+        pool = BoardPool()
+        count = run_batch(script, output, pool)
+        self.assertEqual(count, 5)
+        self.assertEqual((pool.hits, pool.misses), (2, 2))
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                "Game 1: Alice wins the game !!!!",
+                "Game 2: No one wins the game !!!!",
+                "Game 3: Unfinished, ran out of moves",
+                "Game 4: Board size invalid!",
+                "Game 5: Missing player names",
+            ],
+        )
+        mock_input.assert_not_called()
+        mock_print.assert_not_called()
+
+    def test_parse_args_batch(self):
+        self.assertEqual(parse_args(["--batch", "-"]).batch, "-")
+        self.assertIsNone(parse_args([]).batch)
+
+    @mock.patch("game.models.print")
+    def test_run_batch_history(self, mock_print: mock.MagicMock):
+        script = io.StringIO("3\nAlice\nBob\n1,1\n2,2\n1,2\n3,3\n1,3\n\n3\nA\nB\n")
+        history = mock.MagicMock()
+        run_batch(script, io.StringIO(), history=history)
+        history.record.assert_called_once()
+        record = history.record.call_args.args[0]
+        self.assertEqual(record.winner, "Alice")
+        self.assertEqual(record.moves, [0, 4, 1, 8, 2])
+
+
+class TestBots(BaseTestCase):
+    @mock.patch("app.print")
+    @mock.patch("builtins.input")
+    def test_assign_players_bot(
+        self, mock_input: mock.MagicMock, mock_print: mock.MagicMock
+    ):
+        mock_input.side_effect = ["A"]
+        players = assign_players([], bots=["second"], time_budget=0.5)
+        self.assertEqual([player.name for player in players], ["A", "Bot 2"])
+        self.assertIsInstance(players[1], BotPlayer)
+        self.assertEqual((players[1].mark, players[1].time_budget), ("O", 0.5))
+
+    @mock.patch("game.bots.print")
+    @mock.patch("game.models.print")
+    @mock.patch("app.print")
+    @mock.patch("builtins.input")
+    def test_bots_draw(
+        self,
+        mock_input: mock.MagicMock,
+        mock_print: mock.MagicMock,
+        mock_print_models: mock.MagicMock,
+        mock_print_bots: mock.MagicMock,
+    ):
+        mock_input.side_effect = [3]
+        main(bots=["first", "second"], time_budget=0.05)
+        self.assertEqual(len(mock_input.mock_calls), 1)
+        self.assertEqual(len(mock_print_bots.mock_calls), 9)
+        mock_print.assert_called_with(settings.END_GAME_TEXT.format(winner="No one"))
+
+    @mock.patch("game.bots.print")
+    @mock.patch("game.models.print")
+    @mock.patch("app.print")
+    @mock.patch("builtins.input")
+    def test_bots_table(
+        self,
+        mock_input: mock.MagicMock,
+        mock_print: mock.MagicMock,
+        mock_print_models: mock.MagicMock,
+        mock_print_bots: mock.MagicMock,
+    ):
+        mock_input.side_effect = [3]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ttable.bin")
+            main(bots=["first", "second"], time_budget=0.05, table_path=path)
+            with TranspositionTable(path, readonly=True) as table:
+                stored = table._map[HEADER.size :]
+            self.assertTrue(any(stored))
+        self.assertEqual(parse_args(["--table", path]).table, path)
+
+    def test_parse_args_bot(self):
+        args = parse_args(["--bot", "first", "--time-budget", "0.2"])
+        self.assertEqual((args.bot, args.time_budget), (["first"], 0.2))
+        self.assertEqual(parse_args([]).bot, [])
+        self.assertFalse(args.ponder)
+        self.assertTrue(parse_args(["--bot", "second", "--ponder"]).ponder)